@@ -1,14 +1,16 @@
 import heapq
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
 from models.delivery import DeliveryPoint
 from models.drone import Drone
 from models.noflyzone import NoFlyZone
+from models.registry import EntityRegistry
 from astar.heuristic import heuristic
 
 def a_star(start_id: str, goal_id: str, graph: Dict[str, List[Tuple[str, float]]], 
            drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], 
-           current_time: float) -> List[str]:
+           current_time: float, registry: Optional[EntityRegistry] = None) -> List[str]:
     
+    registry = EntityRegistry.ensure(registry, drones, deliveries)
     open_set = []
     heapq.heappush(open_set, (0, start_id))
     came_from = {}
@@ -27,8 +29,7 @@ def a_star(start_id: str, goal_id: str, graph: Dict[str, List[Tuple[str, float]]
         for neighbor, cost in graph.get(current, []):
             # No-fly zone kontrolü: eğer teslimat noktası no-fly zone içindeyse atla
             if neighbor.startswith("DP"):
-                delivery_id = int(neighbor[2:])
-                delivery = next((d for d in deliveries if d.id == delivery_id), None)
+                delivery = registry.delivery_of_node(neighbor)
                 if delivery:
                     for zone in no_fly_zones:
                         start_time, end_time = zone.active_time
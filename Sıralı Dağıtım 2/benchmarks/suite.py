@@ -0,0 +1,100 @@
+import argparse
+import random
+from typing import Dict, List, Tuple
+from models.drone import Drone
+from models.delivery import DeliveryPoint
+from models.noflyzone import NoFlyZone
+from graph.graph_builder import build_graph
+from astar.astar import a_star
+from csp.csp import backtracking_search
+from ga.genetic_algorithm import genetic_algorithm
+from benchmarks.harness import run_suite, write_results, load_results, compare_results
+
+BENCHMARK_SEED = 42
+
+# (drone, teslimat, NFZ) sayıları. CSP her drone'a en fazla bir teslimat verdiğinden teslimat sayısı drone
+# sayısını aşarsa tam atama yoktur; "small" bu çözümsüz durumu (eşleştirme sınırıyla aramasız reddedilir), diğerleri ölçeklenmeyi ölçer.
+BENCHMARK_SIZES: Dict[str, Tuple[int, int, int]] = {
+    "small": (5, 20, 3),
+    "medium": (20, 20, 10),
+    "large": (60, 60, 30),
+}
+AREA_SIZE = 100.0
+CSP_TIME = 0   # NFZ'ler henüz aktif değil, tüm pencereler açık: CSP yalnızca kapasite/ağırlık kısıtlarıyla çalışır
+ASTAR_TIME = 45 # Kademeli NFZ'lerin bir kısmı aktif
+ASTAR_QUERIES = 50
+GA_GENERATIONS = 50
+
+def make_scenario(size: str, seed: int = BENCHMARK_SEED) -> Tuple[List[Drone], List[DeliveryPoint], List[NoFlyZone]]:
+    # Sabit seed'li rastgele senaryo (veri modelleri örnek veriyle aynı)
+    num_drones, num_deliveries, num_nfzs = BENCHMARK_SIZES[size]
+    rng = random.Random(seed)
+    point = lambda: (round(rng.uniform(0, AREA_SIZE), 1), round(rng.uniform(0, AREA_SIZE), 1))
+    drones = [Drone(i + 1, round(rng.uniform(2.0, 6.0), 1), rng.randint(8000, 20000), round(rng.uniform(5.0, 12.0), 1), point())
+              for i in range(num_drones)]
+    deliveries = [DeliveryPoint(i + 1, point(), round(rng.uniform(0.5, 2.0), 1), rng.randint(1, 5), (0, rng.randint(20, 120)))
+                  for i in range(num_deliveries)]
+    no_fly_zones = []
+    for i in range(num_nfzs):
+        x, y = point()
+        w, h = rng.uniform(5, 15), rng.uniform(5, 15)
+        start = 10 + 5 * i
+        no_fly_zones.append(NoFlyZone(i + 1, [(x, y), (x + w, y), (x + w, y + h), (x, y + h)], (start, start + 60)))
+    return drones, deliveries, no_fly_zones
+
+def bench_build_graph(size: str):
+    drones, deliveries, _ = make_scenario(size)
+    return (lambda: build_graph(drones, deliveries)), len(deliveries)
+
+def bench_a_star(size: str):
+    drones, deliveries, no_fly_zones = make_scenario(size)
+    graph = build_graph(drones, deliveries)
+    rng = random.Random(BENCHMARK_SEED)
+    queries = [(f"D{rng.choice(drones).id}", f"DP{rng.choice(deliveries).id}") for _ in range(ASTAR_QUERIES)]
+    def run():
+        for start, goal in queries:
+            a_star(start, goal, graph, drones, deliveries, no_fly_zones, ASTAR_TIME)
+    return run, len(queries)
+
+def bench_backtracking_search(size: str):
+    drones, deliveries, no_fly_zones = make_scenario(size)
+    run = lambda: backtracking_search(drones, deliveries, no_fly_zones, CSP_TIME)
+    # Planlanan teslimat sayısı dönen atamanın boyutudur; çözümsüz örnekte (ör. "small") 0
+    return run, lambda solution: len(solution) if solution else 0
+
+def bench_genetic_algorithm(size: str):
+    drones, deliveries, no_fly_zones = make_scenario(size)
+    def run():
+        random.seed(BENCHMARK_SEED)
+        return genetic_algorithm(drones, deliveries, no_fly_zones, CSP_TIME, generations=GA_GENERATIONS)
+    return run, len(deliveries)
+
+BENCHMARKS = {
+    "build_graph": bench_build_graph,
+    "a_star": bench_a_star,
+    "backtracking_search": bench_backtracking_search,
+    "genetic_algorithm": bench_genetic_algorithm,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Graf, A*, CSP ve GA ölçeklenme benchmark'ları")
+    parser.add_argument("--sizes", nargs="+", choices=list(BENCHMARK_SIZES), default=list(BENCHMARK_SIZES))
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=None)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak önceki sonuç dosyası (JSON)")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Gerileme sayılacak süre oranı")
+    args = parser.parse_args()
+
+    benchmarks = {
+        name: {size: (lambda fn=fn, size=size: fn(size)) for size in BENCHMARK_SIZES}
+        for name, fn in BENCHMARKS.items()
+    }
+    report = run_suite(benchmarks, args.sizes, args.repeats, args.only)
+    write_results(args.output, report)
+    print(f"Sonuçlar yazıldı: {args.output}")
+    if args.compare:
+        compare_results(load_results(args.compare), report, args.threshold)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+import queue
+import random
+import time
+import multiprocessing as mp
+from typing import List, Dict, Optional
+from models.drone import Drone
+from models.delivery import DeliveryPoint
+from models.noflyzone import NoFlyZone
+from models.registry import EntityRegistry
+from ga.genetic_algorithm import generate_random_population, evolve_population, cached_fitness, FitnessCache
+
+TOPOLOGY_RING = "ring"
+TOPOLOGY_FULL = "full"
+
+def migration_targets(island_id: int, num_islands: int, topology: str = TOPOLOGY_RING) -> List[int]:
+    # Göç eden elitlerin gönderileceği adalar
+    if num_islands < 2:
+        return []
+    if topology == TOPOLOGY_RING:
+        return [(island_id + 1) % num_islands]
+    if topology == TOPOLOGY_FULL:
+        return [i for i in range(num_islands) if i != island_id]
+    raise ValueError(f"Bilinmeyen topoloji: {topology}")
+
+def _island_worker(island_id: int, inboxes: list, result_queue, drones: List[Drone], deliveries: List[DeliveryPoint],
+                   no_fly_zones: List[NoFlyZone], current_time: float, population_size: int, generations: int,
+                   migration_interval: int, num_migrants: int, topology: str, time_limit: Optional[float], seed: Optional[int]):
+    # Her ada kendi popülasyonunu evrimleştirir; göç asenkrondur, gelen göçmenler en kötü bireylerin yerine geçer.
+    random.seed(None if seed is None else seed + island_id)
+    targets = migration_targets(island_id, len(inboxes), topology)
+    for target in targets:
+        inboxes[target].cancel_join_thread() # Alıcı ada bitmişse okunmayan göçmenler çıkışı bekletmesin
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    fitness_cache = FitnessCache()
+    registry = EntityRegistry(drones, deliveries)
+    score = lambda ind: cached_fitness(ind, drones, deliveries, no_fly_zones, current_time, fitness_cache, registry)
+    population = generate_random_population(drones, deliveries, population_size)
+    generation = 0
+    for generation in range(1, generations + 1):
+        population = evolve_population(population, drones, deliveries, no_fly_zones, current_time, population_size, fitness_cache, registry)
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if targets and generation % migration_interval == 0:
+            population.sort(key=score, reverse=True)
+            for target in targets:
+                inboxes[target].put(population[:num_migrants])
+            while True:
+                try:
+                    migrants = inboxes[island_id].get_nowait()
+                except queue.Empty:
+                    break
+                population[len(population) - len(migrants):] = migrants
+
+    best = max(population, key=score)
+    result_queue.put((island_id, best, score(best), generation))
+
+def island_genetic_algorithm(drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], current_time: float,
+                             num_islands: Optional[int] = None, population_size=50, generations=100, migration_interval=10,
+                             num_migrants=2, topology: str = TOPOLOGY_RING, time_limit: Optional[float] = None,
+                             seed: Optional[int] = None) -> Dict[int, int]:
+    """
+    Ada modeli GA: `num_islands` alt popülasyon ayrı süreçlerde evrimleşir ve her `migration_interval`
+    nesilde en iyi `num_migrants` birey topolojiye göre (ring: sonraki ada, full: tüm adalar) göç eder.
+    `time_limit` (saniye) verilirse adalar bu süre dolunca durur. En iyi atama (delivery_id -> drone_id) döner.
+    """
+    if num_islands is None:
+        num_islands = os.cpu_count() or 1
+    migration_targets(0, num_islands, topology) # Topoloji adını süreçler başlamadan doğrula
+
+    inboxes = [mp.Queue() for _ in range(num_islands)]
+    result_queue = mp.Queue()
+    processes = [
+        mp.Process(target=_island_worker, args=(
+            i, inboxes, result_queue, drones, deliveries, no_fly_zones, current_time, population_size, generations,
+            migration_interval, num_migrants, topology, time_limit, seed
+        ))
+        for i in range(num_islands)
+    ]
+    for p in processes:
+        p.start()
+    results = []
+    while len(results) < num_islands:
+        try:
+            results.append(result_queue.get(timeout=1.0))
+        except queue.Empty:
+            if not any(p.is_alive() for p in processes):
+                break
+    for p in processes:
+        p.join()
+    if not results:
+        print("HATA: Ada modeli GA hiçbir adadan sonuç alamadı.")
+        return {}
+
+    # Eşitlikte düşük numaralı ada seçilir (sonuç süreç bitiş sırasına bağlı olmasın)
+    _, best, _, _ = max(sorted(results, key=lambda r: r[0]), key=lambda r: r[2])
+    return best
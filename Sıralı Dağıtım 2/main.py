@@ -3,6 +3,7 @@ from graph.graph_builder import build_graph
 from astar.astar import a_star
 from csp.csp import backtracking_search
 from ga.genetic_algorithm import genetic_algorithm
+from models.registry import EntityRegistry
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 
@@ -41,10 +42,11 @@ def visualize(drones, deliveries, no_fly_zones, assignment):
 
     # Droneların rotalarını çiz
     colors = ['green', 'purple', 'orange', 'brown', 'blue']
+    registry = EntityRegistry(drones, deliveries)
     for idx, (drone_id, route) in enumerate(drone_routes.items()):
-        drone_start = next(d.start_pos for d in drones if d.id == drone_id)
+        drone_start = registry.drone(drone_id).start_pos
         # Rotayı teslimat sırasına göre sırala veya olduğu gibi kullan
-        points = [drone_start] + [next(d.pos for d in deliveries if d.id == del_id) for del_id in route]
+        points = [drone_start] + [registry.delivery(del_id).pos for del_id in route]
 
         xs, ys = zip(*points)
         ax.plot(xs, ys, color=colors[idx % len(colors)], linewidth=2, label=f'Drone {drone_id} Route')
@@ -64,7 +66,7 @@ def main():
     print_graph(graph)
 
     current_time = 0
-    csp_solution = backtracking_search(drones, deliveries, no_fly_zones, current_time)
+    csp_solution = backtracking_search(drones, deliveries, no_fly_zones, current_time, maximize=True)
     print(f"CSP solution (delivery_id -> drone_id): {csp_solution}")
 
     ga_solution = genetic_algorithm(drones, deliveries, no_fly_zones, current_time)
@@ -0,0 +1,44 @@
+from array import array
+from typing import Dict, List, Optional
+from models.drone import Drone
+from models.delivery import DeliveryPoint
+
+class EntityRegistry:
+    """
+    Drone ve teslimatlar için dış ID <-> yoğun indeks (listedeki sıra) eşlemesi. ID ile nesne erişimi
+    listeyi taramadan O(1)'dir; sık okunan alanlar indeks sırasıyla `array` sütunlarında da tutulur.
+    Çözücüler (A*, CSP, GA) kaydı çağrı başında bir kez kurup iç döngülere geçirir.
+    """
+    def __init__(self, drones: List[Drone], deliveries: List[DeliveryPoint]):
+        self.drones = list(drones)
+        self.deliveries = list(deliveries)
+        self.drone_index: Dict[int, int] = {drone.id: i for i, drone in enumerate(self.drones)}
+        self.delivery_index: Dict[int, int] = {delivery.id: i for i, delivery in enumerate(self.deliveries)}
+
+        # Sütunlar (indeks sırasıyla)
+        self.drone_max_weight = array("d", (drone.max_weight for drone in self.drones))
+        self.drone_start_x = array("d", (drone.start_pos[0] for drone in self.drones))
+        self.drone_start_y = array("d", (drone.start_pos[1] for drone in self.drones))
+        self.delivery_x = array("d", (delivery.pos[0] for delivery in self.deliveries))
+        self.delivery_y = array("d", (delivery.pos[1] for delivery in self.deliveries))
+        self.delivery_weight = array("d", (delivery.weight for delivery in self.deliveries))
+        self.delivery_priority = array("i", (delivery.priority for delivery in self.deliveries))
+        self.window_start = array("d", (delivery.time_window[0] for delivery in self.deliveries))
+        self.window_end = array("d", (delivery.time_window[1] for delivery in self.deliveries))
+
+    @classmethod
+    def ensure(cls, registry: Optional["EntityRegistry"], drones: List[Drone], deliveries: List[DeliveryPoint]) -> "EntityRegistry":
+        # Çağırandan kayıt gelmediyse listelerden kurar (çağrı başına bir kez O(n))
+        return registry if registry is not None else cls(drones, deliveries)
+
+    def drone(self, drone_id: int) -> Optional[Drone]:
+        i = self.drone_index.get(drone_id)
+        return None if i is None else self.drones[i]
+
+    def delivery(self, delivery_id: int) -> Optional[DeliveryPoint]:
+        i = self.delivery_index.get(delivery_id)
+        return None if i is None else self.deliveries[i]
+
+    def delivery_of_node(self, node: str) -> Optional[DeliveryPoint]:
+        # Graf düğüm anahtarı ("DP12") -> teslimat
+        return self.delivery(int(node[2:])) if node.startswith("DP") else None
@@ -1,10 +1,19 @@
 import heapq
-from typing import List, Tuple, Optional, Callable
+from collections import OrderedDict
+from typing import List, Tuple, Optional, Dict, TYPE_CHECKING
 from core.drone import Drone
 from core.delivery_point import DeliveryPoint
 from core.no_fly_zone import NoFlyZone
-from geometry_utils import euclidean_distance, check_path_for_nfz_intersections
-from datetime_utils import time # datetime.time objesi için
+from core.location_index import LocationIndex
+from core.nfz_index import NFZIndex, get_nfz_index
+from utils.geometry_utils import euclidean_distance, inflate_polygon
+
+if TYPE_CHECKING:
+    from algorithms.nfz_cache import NFZSegmentCache
+
+# NFZ köşelerinin dışarı taşınma payı (metre). Kenara teğet yollar kesişim sayılmasın diye > 0 olmalı.
+NFZ_INFLATION_MARGIN = 1.0
+VISIBILITY_GRAPH_CACHE_SIZE = 32
 
 
 class AStarPath:
@@ -13,29 +22,168 @@ class AStarPath:
         self.points = points # [(x1,y1), (x2,y2), ...]
         self.length = length # Metre cinsinden toplam uzunluk
 
+
+class VisibilityGraph:
+    """
+    Aktif NFZ'lerin şişirilmiş köşeleri ve bu köşeler arasındaki engelsiz (görünür) kenarlar.
+    Başlangıç/hedef noktaları grafa eklenmez; her sorguda ayrıca bağlanır.
+    """
+    def __init__(self, active_nfzs: List[NoFlyZone], margin: float = NFZ_INFLATION_MARGIN):
+        self.nfzs = active_nfzs
+        self.index = get_nfz_index(active_nfzs)
+        self.nodes: List[Tuple[float, float]] = []
+        for nfz in active_nfzs:
+            for vertex in inflate_polygon(nfz.coordinates, margin):
+                # Başka bir NFZ'nin içine düşen köşeler kullanılamaz
+                if self.index.zone_containing(vertex) is None:
+                    self.nodes.append(vertex)
+
+        self.edges: List[List[Tuple[int, float]]] = [[] for _ in self.nodes]
+        for i in range(len(self.nodes)):
+            for j in range(i + 1, len(self.nodes)):
+                if self.is_visible(self.nodes[i], self.nodes[j]):
+                    dist = euclidean_distance(self.nodes[i], self.nodes[j])
+                    self.edges[i].append((j, dist))
+                    self.edges[j].append((i, dist))
+
+    def is_visible(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> bool:
+        return not self.index.segment_intersects_any(p1, p2)
+
+
+_visibility_graph_cache: "OrderedDict[tuple, VisibilityGraph]" = OrderedDict()
+
+def get_visibility_graph(active_nfzs: List[NoFlyZone], margin: float = NFZ_INFLATION_MARGIN) -> VisibilityGraph:
+    # Aynı aktif NFZ kümesi için graf bir kez kurulur (zaman penceresi değişene kadar tekrar kullanılır).
+    key = (margin,) + tuple(sorted((nfz.id, tuple(nfz.coordinates)) for nfz in active_nfzs))
+    graph = _visibility_graph_cache.get(key)
+    if graph is not None:
+        _visibility_graph_cache.move_to_end(key)
+        return graph
+
+    graph = VisibilityGraph(active_nfzs, margin)
+    _visibility_graph_cache[key] = graph
+    if len(_visibility_graph_cache) > VISIBILITY_GRAPH_CACHE_SIZE:
+        _visibility_graph_cache.popitem(last=False)
+    return graph
+
+
+def check_path_for_nfz_intersections(
+    start_pos: Tuple[float, float],
+    goal_pos: Tuple[float, float],
+    no_fly_zones: List[NoFlyZone],
+    current_time: float # Simülasyon saniyesi
+) -> bool:
+    # Düz yol aktif bir NFZ ile kesişiyor mu?
+    for nfz in no_fly_zones:
+        if nfz.is_active(current_time) and nfz.intersects_segment(start_pos, goal_pos):
+            return True
+    return False
+
+
+def find_waypoint_path(
+    start_pos: Tuple[float, float],
+    goal_pos: Tuple[float, float],
+    active_nfzs: List[NoFlyZone],
+    margin: float = NFZ_INFLATION_MARGIN,
+    nfz_index: Optional[NFZIndex] = None
+) -> Optional[AStarPath]:
+    """
+    Aktif NFZ'lerin görünürlük grafı üzerinde A* ile en kısa yolu bulur.
+    Başlangıç veya hedef bir NFZ içindeyse ya da yol yoksa None döner.
+    """
+    if nfz_index is None:
+        nfz_index = get_nfz_index(active_nfzs)
+    if nfz_index.zone_containing(start_pos) is not None or nfz_index.zone_containing(goal_pos) is not None:
+        return None
+
+    if not nfz_index.segment_intersects_any(start_pos, goal_pos):
+        return AStarPath(points=[start_pos, goal_pos], length=euclidean_distance(start_pos, goal_pos))
+
+    graph = get_visibility_graph(active_nfzs, margin)
+    nodes = graph.nodes
+    start_idx, goal_idx = len(nodes), len(nodes) + 1
+
+    def position(idx: int) -> Tuple[float, float]:
+        if idx == start_idx:
+            return start_pos
+        if idx == goal_idx:
+            return goal_pos
+        return nodes[idx]
+
+    sees_goal: Dict[int, bool] = {}
+
+    def neighbors(idx: int) -> List[Tuple[int, float]]:
+        if idx == start_idx:
+            result = [(j, euclidean_distance(start_pos, p)) for j, p in enumerate(nodes) if graph.is_visible(start_pos, p)]
+        else:
+            result = list(graph.edges[idx])
+            if idx not in sees_goal:
+                sees_goal[idx] = graph.is_visible(nodes[idx], goal_pos)
+            if sees_goal[idx]:
+                result.append((goal_idx, euclidean_distance(nodes[idx], goal_pos)))
+        return result
+
+    g_score = {start_idx: 0.0}
+    came_from: Dict[int, int] = {}
+    counter = 0
+    open_set = [(euclidean_distance(start_pos, goal_pos), counter, start_idx)]
+    closed = set()
+
+    while open_set:
+        _, _, current = heapq.heappop(open_set)
+        if current == goal_idx:
+            points = [goal_pos]
+            while current in came_from:
+                current = came_from[current]
+                points.append(position(current))
+            return AStarPath(points=points[::-1], length=g_score[goal_idx])
+        if current in closed:
+            continue
+        closed.add(current)
+
+        for neighbor, cost in neighbors(current):
+            tentative_g = g_score[current] + cost
+            if tentative_g < g_score.get(neighbor, float('inf')):
+                g_score[neighbor] = tentative_g
+                came_from[neighbor] = current
+                counter += 1
+                f_score = tentative_g + euclidean_distance(position(neighbor), goal_pos)
+                heapq.heappush(open_set, (f_score, counter, neighbor))
+    return None
+
+
 def find_path_astar(
     start_pos: Tuple[float, float],
     goal_pos: Tuple[float, float],
     drone: Drone, # Batarya kontrolü için
     delivery: DeliveryPoint, # Ağırlık ve öncelik için (maliyet fonksiyonunda kullanılacak)
     no_fly_zones: List[NoFlyZone],
-    current_time: time
+    current_time: float, # Simülasyon saniyesi
+    location_index: Optional[LocationIndex] = None,
+    nfz_cache: Optional["NFZSegmentCache"] = None
 ) -> Optional[AStarPath]:
-    
-    distance = euclidean_distance(start_pos, goal_pos)
 
-    # 1. Batarya Kontrolü
+    if location_index is not None:
+        distance = location_index.distance_between(start_pos, goal_pos)
+    else:
+        distance = euclidean_distance(start_pos, goal_pos)
+
+    # 1. Batarya Kontrolü (düz mesafe alt sınırdır)
     if not drone.has_enough_battery(distance):
         return None
 
-    # 2. No-Fly Zone Kontrolü
-    path_crosses_nfz = check_path_for_nfz_intersections(start_pos, goal_pos, no_fly_zones, current_time)
-    
-    if path_crosses_nfz:
-        return None # NFZ'den geçen yollar kabul edilmez
+    # 2. No-Fly Zone'ların etrafından dolaşan yol
+    if nfz_cache is not None:
+        path = nfz_cache.find_path(start_pos, goal_pos, current_time)
+    else:
+        active_nfzs = [nfz for nfz in no_fly_zones if nfz.is_active(current_time)]
+        path = find_waypoint_path(start_pos, goal_pos, active_nfzs)
+    if path is None:
+        return None
 
-    # Düz yol geçerli ise
-    path = AStarPath(points=[start_pos, goal_pos], length=distance)
+    # Dolambaçlı yol için batarya tekrar kontrol edilir
+    if path.length > distance and not drone.has_enough_battery(path.length):
+        return None
     return path
 
 
@@ -43,7 +191,7 @@ def a_star_heuristic_cost(
     start_pos: Tuple[float, float],
     goal_pos: Tuple[float, float],
     no_fly_zones: List[NoFlyZone],
-    current_time: time,
+    current_time: float, # Simülasyon saniyesi
     base_penalty_nfz: float = 10000.0 # NFZ kesişimi için temel ceza
     ) -> float:
 
@@ -55,15 +203,15 @@ def a_star_heuristic_cost(
 
 
 def a_star_delivery_cost(
-    distance: float, 
-    weight: float, 
-    priority: int 
+    distance: float,
+    weight: float,
+    priority: int
     ) -> float:
     """
     Maliyet Fonksiyonu: distance * weight + (6 - priority) * 100
     """
     # Öncelik 1 (en yüksek) daha düşük maliyet, 5 (en düşük) daha yüksek maliyet verir.
-    priority_penalty_multiplier = 100 
+    priority_penalty_multiplier = 100
 
     cost = (distance * weight) + ((6 - priority) * priority_penalty_multiplier)
     return cost
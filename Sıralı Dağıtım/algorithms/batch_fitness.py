@@ -0,0 +1,170 @@
+import random
+from typing import List, Dict, Tuple, Optional, Sequence
+import numpy as np
+from core.drone import Drone
+from core.delivery_point import DeliveryPoint
+from core.no_fly_zone import NoFlyZone
+from core.location_index import LocationIndex
+from algorithms.nfz_cache import NFZSegmentCache
+
+# Teslimat noktasında geçen süre aralığı (saniye)
+SERVICE_TIME_RANGE = (30.0, 90.0)
+
+def sample_service_times(delivery_ids: Sequence[int], seed: Optional[int] = None) -> Dict[int, float]:
+    """
+    Her teslimat için servis süresini bir kez çeker. Aynı seed ile aynı süreler üretildiğinden
+    tekil ve toplu fitness hesapları birebir karşılaştırılabilir.
+    """
+    rng = random.Random(seed)
+    return {delivery_id: rng.uniform(*SERVICE_TIME_RANGE) for delivery_id in delivery_ids}
+
+def encode_population(population: Sequence[Sequence[int]], delivery_ids: Sequence[int]) -> np.ndarray:
+    """
+    Kromozomları tamsayı matrisine çevirir: hücre değeri teslimatın `delivery_ids` içindeki sırası + 1'dir,
+    0 kromozomun bittiğini gösterir (0. yuva drone'un başlangıç konumudur).
+    """
+    slot_of = {delivery_id: i + 1 for i, delivery_id in enumerate(delivery_ids)}
+    length = max((len(chromosome) for chromosome in population), default=0)
+    genes = np.zeros((len(population), length), dtype=np.int64)
+    for row, chromosome in enumerate(population):
+        genes[row, :len(chromosome)] = [slot_of[delivery_id] for delivery_id in chromosome]
+    return genes
+
+def evaluate_population(
+    population: Sequence[Sequence[int]],
+    drone_initial_state: Drone,
+    deliveries_dict: Dict[int, DeliveryPoint],
+    no_fly_zones: List[NoFlyZone],
+    initial_time: float, # Simülasyon saniyesi
+    base_start_pos: Tuple[float, float],
+    location_index: Optional[LocationIndex] = None,
+    nfz_cache: Optional[NFZSegmentCache] = None,
+    service_times: Optional[Dict[int, float]] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    `calculate_sequence_fitness`'in tüm popülasyon için toplu (vektörel) karşılığı.
+    Kromozomlar tamsayı matrisine çevrilir ve her adımda (k. teslimat) tüm kromozomların mesafe, uçuş süresi,
+    batarya, zaman penceresi ihlali ve fitness değerleri NumPy ile birlikte güncellenir. NFZ yolları yalnızca
+    farklı (nereden, nereye, aktivite dönemi) üçlüleri için bir kez hesaplanır.
+    Returns: fitness, tamamlanan teslimat, toplam enerji ve ihlal sayısı dizileri (kromozom sırasıyla).
+    """
+    delivery_ids = sorted({delivery_id for chromosome in population for delivery_id in chromosome})
+    genes = encode_population(population, delivery_ids)
+    num_chromosomes, length = genes.shape
+
+    # Yuva koordinatları ve yuvalar arası düz mesafeler (0 = başlangıç konumu)
+    coords = [drone_initial_state.current_pos] + [deliveries_dict[i].pos for i in delivery_ids]
+    num_slots = len(coords)
+    xy = np.asarray(coords, dtype=float).reshape(-1, 2)
+    dx = np.subtract.outer(xy[:, 0], xy[:, 0])
+    dy = np.subtract.outer(xy[:, 1], xy[:, 1])
+    dist = np.sqrt(dx * dx + dy * dy) # euclidean_distance ile aynı işlem sırası
+    from_indexed = np.zeros(num_slots, dtype=bool) # Skaler hesaptaki gibi: düz bacak matristen okunur mu?
+    if location_index is not None:
+        start_idx = location_index.index_of(coords[0])
+        slots = np.arange(num_slots) if start_idx is not None else np.arange(1, num_slots)
+        idx = ([start_idx] if start_idx is not None else []) + [location_index.delivery_idx[i] for i in delivery_ids]
+        dist[np.ix_(slots, slots)] = location_index.distance_submatrix(idx)
+        from_indexed[slots] = True
+
+    speed = drone_initial_state.speed
+    consumption = drone_initial_state.consumption_rate
+    if location_index is not None:
+        row = location_index.drone_row[drone_initial_state.id]
+        seconds_per_meter = location_index.seconds_per_meter[row]
+        mah_per_meter = location_index.mah_per_meter[row]
+
+    # Zaman pencereleri simülasyon saniyesi cinsinden (pencere yoksa her zaman uygun)
+    window_start = np.full(num_slots, -np.inf)
+    window_end = np.full(num_slots, np.inf)
+    for slot, delivery_id in enumerate(delivery_ids, start=1):
+        window_seconds = deliveries_dict[delivery_id].window_seconds
+        if window_seconds is not None:
+            window_start[slot], window_end[slot] = window_seconds
+
+    if service_times is not None:
+        service = np.array([0.0] + [service_times[i] for i in delivery_ids])
+    else:
+        rng = np.random.default_rng(random.getrandbits(64))
+
+    if no_fly_zones and nfz_cache is None:
+        nfz_cache = NFZSegmentCache(no_fly_zones)
+    breakpoints = np.asarray(nfz_cache.breakpoints if no_fly_zones else [], dtype=float)
+
+    pos = np.zeros(num_chromosomes, dtype=np.int64)
+    sim_time = np.full(num_chromosomes, float(initial_time))
+    battery = np.full(num_chromosomes, float(drone_initial_state.current_battery))
+    energy_used = np.zeros(num_chromosomes)
+    completed = np.zeros(num_chromosomes, dtype=np.int64)
+    violations = np.zeros(num_chromosomes, dtype=np.int64)
+    alive = np.ones(num_chromosomes, dtype=bool)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for k in range(length):
+            rows = np.nonzero(alive & (genes[:, k] > 0))[0]
+            if rows.size == 0:
+                break
+            src, dst = pos[rows], genes[rows, k]
+            straight = dist[src, dst]
+
+            # 1. Düz mesafe batarya alt sınırı
+            ok = battery[rows] >= consumption * (straight / speed)
+
+            # 2. NFZ yolları: farklı (nereden, nereye, dönem) üçlüsü başına bir kez
+            path_length = straight.copy()
+            is_straight = np.ones(rows.size, dtype=bool)
+            if no_fly_zones and ok.any():
+                seconds = sim_time[rows]
+                # NFZSegmentCache.epoch_of'un vektörel karşılığı
+                i = np.searchsorted(breakpoints, seconds, side='left')
+                on_breakpoint = np.zeros(rows.size, dtype=bool)
+                if breakpoints.size:
+                    on_breakpoint = (i < breakpoints.size) & (breakpoints[np.minimum(i, breakpoints.size - 1)] == seconds)
+                epochs = 2 * i + on_breakpoint
+                keys = np.stack([src, dst, epochs], axis=1)[ok]
+                unique_keys, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+                ok_rows = np.nonzero(ok)[0]
+                found = np.empty(len(unique_keys), dtype=bool)
+                lengths = np.empty(len(unique_keys))
+                straight_path = np.empty(len(unique_keys), dtype=bool)
+                for u, (a, b, _) in enumerate(unique_keys):
+                    path = nfz_cache.find_path(coords[a], coords[b], seconds[ok_rows[first[u]]])
+                    found[u] = path is not None
+                    lengths[u] = path.length if path is not None else np.inf
+                    straight_path[u] = path is not None and len(path.points) == 2
+                inverse = inverse.reshape(-1)
+                ok[ok_rows] = found[inverse]
+                path_length[ok_rows] = lengths[inverse]
+                is_straight[ok_rows] = straight_path[inverse]
+                # Dolambaçlı yol için batarya tekrar kontrol edilir
+                detour = ok & (path_length > straight)
+                ok[detour] = battery[rows[detour]] >= consumption * (path_length[detour] / speed)
+
+            # Düz bacak matristen, dolambaçlı bacak yol uzunluğundan
+            use_matrix = is_straight & from_indexed[src]
+            flight_time = path_length / speed
+            energy = consumption * flight_time
+            if location_index is not None:
+                flight_time = np.where(use_matrix, straight * seconds_per_meter, flight_time)
+                energy = np.where(use_matrix, straight * mah_per_meter, energy)
+
+            # Batarya kontrolü tekrar teyit
+            ok &= battery[rows] >= energy
+            failed = rows[~ok]
+            violations[failed] += 1
+            alive[failed] = False
+
+            rows, dst, flight_time, energy = rows[ok], dst[ok], flight_time[ok], energy[ok]
+            # Skaler hesaptaki sırayla toplanır; float sonuçlar birebir aynıdır
+            arrival = sim_time[rows] + flight_time
+            violations[rows] += ~((window_start[dst] <= arrival) & (arrival <= window_end[dst]))
+
+            battery[rows] -= energy
+            energy_used[rows] += energy
+            pos[rows] = dst
+            step_service = service[dst] if service_times is not None else rng.uniform(*SERVICE_TIME_RANGE, size=rows.size)
+            sim_time[rows] = arrival + step_service
+            completed[rows] += 1
+
+    fitness = (completed * 100.0) - (energy_used * 0.2) - (violations * 2000.0)
+    return fitness, completed, energy_used, violations
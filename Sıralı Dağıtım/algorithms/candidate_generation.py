@@ -0,0 +1,63 @@
+from typing import List, Tuple, Optional
+import numpy as np
+from core.drone import Drone
+from core.delivery_point import DeliveryPoint
+
+# Drone başına (ve teslimat başına) en yakın aday sayısı varsayılanı; None = sınırsız
+DEFAULT_MAX_CANDIDATES = 25
+
+def generate_candidate_pairs(
+    drones: List[Drone],
+    deliveries: List[DeliveryPoint],
+    current_sim_time: float, # Simülasyon saniyesi
+    max_candidates: Optional[int] = DEFAULT_MAX_CANDIDATES
+) -> List[Tuple[Drone, DeliveryPoint]]:
+    """
+    CSP modeline girecek (drone, teslimat) adaylarını vektörel ön elemeyle üretir.
+
+    - Düz mesafe enerjisi bataryayı aşan çiftler elenir (yol ancak uzayabilir).
+    - Düz mesafeyle bile zaman penceresinin bitişinden sonra varılacak çiftler elenir.
+    - Kalanlardan her drone için en yakın `max_candidates` teslimat ve her teslimat için en yakın
+      `max_candidates` drone tutulur (iki yönlü k-en yakın komşu birleşimi).
+    NFZ ve kesin zaman penceresi kontrolü yalnızca bu adaylar için yapılır.
+    """
+    open_deliveries = [t for t in deliveries if not t.is_assigned]
+    if not drones or not open_deliveries:
+        return []
+
+    drone_pos = np.array([d.current_pos for d in drones], dtype=float).reshape(-1, 2)
+    delivery_pos = np.array([t.pos for t in open_deliveries], dtype=float).reshape(-1, 2)
+    diff = drone_pos[:, None, :] - delivery_pos[None, :, :]
+    distances = np.hypot(diff[..., 0], diff[..., 1])
+
+    speeds = np.array([d.speed for d in drones], dtype=float)
+    consumption = np.array([d.consumption_rate for d in drones], dtype=float)
+    battery = np.array([d.current_battery for d in drones], dtype=float)
+    with np.errstate(divide='ignore'):
+        travel_time = distances / speeds[:, None]
+
+    feasible = travel_time * consumption[:, None] <= battery[:, None]
+
+    window_end = np.array([t.window_seconds[1] if t.window_seconds is not None else np.inf for t in open_deliveries])
+    feasible &= current_sim_time + travel_time <= window_end[None, :]
+
+    if max_candidates is not None:
+        masked = np.where(feasible, distances, np.inf)
+        num_drones, num_deliveries = masked.shape
+
+        keep_for_drones = np.ones_like(feasible)
+        if num_deliveries > max_candidates:
+            keep_for_drones[:] = False
+            nearest = np.argpartition(masked, max_candidates - 1, axis=1)[:, :max_candidates]
+            np.put_along_axis(keep_for_drones, nearest, True, axis=1)
+
+        keep_for_deliveries = np.ones_like(feasible)
+        if num_drones > max_candidates:
+            keep_for_deliveries[:] = False
+            nearest = np.argpartition(masked, max_candidates - 1, axis=0)[:max_candidates, :]
+            np.put_along_axis(keep_for_deliveries, nearest, True, axis=0)
+
+        feasible &= keep_for_drones | keep_for_deliveries
+
+    rows, cols = np.nonzero(feasible)
+    return [(drones[i], open_deliveries[j]) for i, j in zip(rows.tolist(), cols.tolist())]
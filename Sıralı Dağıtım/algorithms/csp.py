@@ -1,14 +1,21 @@
 from typing import List, Dict, Tuple, Optional
-from datetime import datetime, time
 from dataclasses import dataclass
 from core.drone import Drone
 from core.delivery_point import DeliveryPoint
 from core.no_fly_zone import NoFlyZone
+from core.location_index import LocationIndex
+from core.nfz_index import get_nfz_index
+from algorithms.a_star import find_waypoint_path
+from algorithms.nfz_cache import NFZSegmentCache
+from algorithms.candidate_generation import generate_candidate_pairs, DEFAULT_MAX_CANDIDATES
 from utils.geometry_utils import euclidean_distance
-from utils.datetime_utils import time_to_seconds, add_seconds_to_time, parse_time, seconds_to_time # <<< Make sure seconds_to_time is imported here
+from utils.profiling import Profiler, NULL_PROFILER
+from utils.sim_logging import get_logger, DEBUG
 
 from ortools.sat.python import cp_model
 
+logger = get_logger("csp")
+
 @dataclass
 class PathInfo:
     points: List[Tuple[float, float]]
@@ -24,95 +31,139 @@ def calculate_path_info(
     drone_speed: float,
     drone_consumption_rate: float,
     no_fly_zones: List[NoFlyZone],
-    current_sim_time: datetime.time,
-    base_station_pos: Tuple[float, float]
+    current_sim_time: float, # Simülasyon saniyesi
+    base_station_pos: Tuple[float, float],
+    location_index: Optional[LocationIndex] = None,
+    nfz_cache: Optional[NFZSegmentCache] = None
 ) -> PathInfo:
-    path_points = [start_pos, end_pos]
-    total_distance = euclidean_distance(start_pos, end_pos)
-    total_travel_time_seconds = total_distance / drone_speed if drone_speed > 0 else float('inf')
-    total_energy_consumption_mah = drone_consumption_rate * total_travel_time_seconds
-
-    for nfz in no_fly_zones:
-        if nfz.is_active(current_sim_time):
-            # sadece başlangıç veya bitiş noktası içindeyse geçersiz sayıyoruz.
-            if nfz.contains_point(start_pos) or nfz.contains_point(end_pos) or \
-               nfz.intersects_segment(start_pos, end_pos): 
+    if nfz_cache is not None:
+        # Aynı aktivite dönemi içinde aynı bacak için geometri tekrar hesaplanmaz
+        path = nfz_cache.find_path(start_pos, end_pos, current_sim_time)
+        if path is None:
+            return PathInfo([], 0.0, 0.0, 0.0, False, "NFZ ile çakışıyor veya etrafında yol yok")
+    else:
+        active_nfzs = [nfz for nfz in no_fly_zones if nfz.is_active(current_sim_time)]
+        nfz_index = get_nfz_index(active_nfzs)
+        for point in (start_pos, end_pos):
+            # Başlangıç veya bitiş noktası NFZ içindeyse etrafından dolaşmak mümkün değil
+            nfz = nfz_index.zone_containing(point)
+            if nfz is not None:
                 return PathInfo([], 0.0, 0.0, 0.0, False, f"NFZ {nfz.id} ile çakışıyor")
 
+        # Düz yol NFZ'yi kesiyorsa görünürlük grafı üzerinde A* ile dolaşılır
+        path = find_waypoint_path(start_pos, end_pos, active_nfzs, nfz_index=nfz_index)
+        if path is None:
+            return PathInfo([], 0.0, 0.0, 0.0, False, "NFZ etrafında geçerli yol bulunamadı")
 
-    return PathInfo(path_points, total_distance, total_travel_time_seconds, total_energy_consumption_mah, True)
+    total_distance = path.length
+    if location_index is not None and len(path.points) == 2:
+        total_distance = location_index.distance_between(start_pos, end_pos)
+    total_travel_time_seconds = total_distance / drone_speed if drone_speed > 0 else float('inf')
+    total_energy_consumption_mah = drone_consumption_rate * total_travel_time_seconds
 
+    # Nokta listesi drone tarafından tüketildiği için (önbellekteki yol bozulmasın) kopyalanır
+    return PathInfo(list(path.points), total_distance, total_travel_time_seconds, total_energy_consumption_mah, True)
 
-def solve_assignment_csp(
+
+def find_feasible_assignments(
     drones: List[Drone],
     deliveries: List[DeliveryPoint],
     no_fly_zones: List[NoFlyZone],
-    current_sim_time: datetime.time,
-    base_station_pos: Tuple[float, float] = (0.0, 0.0)
-) -> List[Dict]:
+    current_sim_time: float, # Simülasyon saniyesi
+    base_station_pos: Tuple[float, float] = (0.0, 0.0),
+    location_index: Optional[LocationIndex] = None,
+    nfz_cache: Optional[NFZSegmentCache] = None,
+    max_candidates: Optional[int] = DEFAULT_MAX_CANDIDATES,
+    early_arrivals: Optional[Dict[Tuple[int, int], float]] = None
+) -> Dict[Tuple[int, int], PathInfo]:
     """
-    Dronlar ve teslimatlar arasında optimal atama yapmak için bir CSP modeli (OR-Tools CP-SAT) kullanır.
+    Ön elemeden geçen (drone, teslimat) adayları için NFZ, batarya ve zaman penceresi kısıtlarını kontrol eder.
+    Yalnızca uygun çiftlerin yol bilgisini {(drone_id, teslimat_id): PathInfo} olarak döndürür.
+    `early_arrivals` verilirse, pencere açılmadan varacağı için elenen çiftlerin uygun hale geleceği kalkış
+    saniyesi (pencere başı - uçuş süresi) bu sözlüğe yazılır.
     """
-    model = cp_model.CpModel()
+    path_infos: Dict[Tuple[int, int], PathInfo] = {}
 
-    # Değişkenler: x[d][t] = 1 eğer drone d teslimat t'ye atanırsa, aksi takdirde 0
-    x = {}
-    for d in drones:
-        for t in deliveries:
-            x[(d.id, t.id)] = model.NewBoolVar(f'x_d{d.id}_t{t.id}')
+    for d, t in generate_candidate_pairs(drones, deliveries, current_sim_time, max_candidates):
+        path_info = calculate_path_info(d.current_pos, t.pos, d.speed, d.consumption_rate, no_fly_zones, current_sim_time, base_station_pos, location_index, nfz_cache)
 
-    # Kısıt 1: Her teslimat en fazla bir drone'a atanır
-    for t in deliveries:
-        model.AddAtMostOne(x[(d.id, t.id)] for d in drones)
+        if not path_info.valid:
+            # Yol NFZ nedeniyle geçersiz
+            continue
 
-    # Kısıt 2: Her drone en fazla bir teslimata atanır
-    for d in drones:
-        model.AddAtMostOne(x[(d.id, t.id)] for t in deliveries)
+        # Batarya kontrolü
+        if d.current_battery < path_info.energy_consumption_mah:
+            continue
 
-    # Yol bilgilerini önceden hesapla ve kısıtları ekle
-    possible_assignments = []
-    path_infos: Dict[Tuple[int, int], PathInfo] = {}
+        # Zaman penceresi kontrolü
+        estimated_arrival_time = current_sim_time + path_info.travel_time_seconds
+        if not t.is_within_time_window(estimated_arrival_time):
+            if early_arrivals is not None and t.window_seconds is not None and estimated_arrival_time < t.window_seconds[0]:
+                early_arrivals[(d.id, t.id)] = t.window_seconds[0] - path_info.travel_time_seconds
+            continue
 
-    for d in drones:
-        for t in deliveries:
-            if t.is_assigned: # Zaten atanmış teslimatları ele alma
-                continue
+        path_infos[(d.id, t.id)] = path_info
 
-            path_info = calculate_path_info(d.current_pos, t.pos, d.speed, d.consumption_rate, no_fly_zones, current_sim_time, base_station_pos)
+    return path_infos
 
-            if not path_info.valid:
-                # Yol NFZ nedeniyle geçersizse, bu atamayı yasakla
-                model.Add(x[(d.id, t.id)] == 0)
-                continue
 
-            # Batarya kontrolü
-            if d.current_battery < path_info.energy_consumption_mah:
-                # Yeterli batarya yoksa bu atamayı yasakla
-                model.Add(x[(d.id, t.id)] == 0)
-                continue
+def solve_assignment_csp(
+    drones: List[Drone],
+    deliveries: List[DeliveryPoint],
+    no_fly_zones: List[NoFlyZone],
+    current_sim_time: float, # Simülasyon saniyesi
+    base_station_pos: Tuple[float, float] = (0.0, 0.0),
+    location_index: Optional[LocationIndex] = None,
+    nfz_cache: Optional[NFZSegmentCache] = None,
+    max_candidates: Optional[int] = DEFAULT_MAX_CANDIDATES,
+    profiler: Profiler = NULL_PROFILER,
+    early_arrivals: Optional[Dict[Tuple[int, int], float]] = None
+) -> List[Dict]:
+    """
+    Dronlar ve teslimatlar arasında optimal atama yapmak için bir CSP modeli (OR-Tools CP-SAT) kullanır.
+    Model yalnızca uygun (drone, teslimat) adayları üzerinde kurulur.
+    `profiler` açıksa yol bilgisi, model kurma ve çözüm süreleri ayrı aşamalar olarak kaydedilir.
+    `early_arrivals` find_feasible_assignments'a aktarılır.
+    """
+    model = cp_model.CpModel()
 
-            # Zaman penceresi kontrolü
-            arrival_time_seconds = time_to_seconds(current_sim_time) + path_info.travel_time_seconds
-            estimated_arrival_time = seconds_to_time(arrival_time_seconds) 
+    # Yol bilgilerini önceden hesapla; yalnızca uygun çiftler modele girer
+    with profiler.phase("path_info"):
+        path_infos = find_feasible_assignments(drones, deliveries, no_fly_zones, current_sim_time, base_station_pos, location_index, nfz_cache, max_candidates,
+                                               early_arrivals)
+    possible_assignments = list(path_infos.keys())
+    profiler.count("csp_candidates", len(possible_assignments))
+
+    with profiler.phase("model_build"):
+        # Değişkenler: x[d][t] = 1 eğer drone d teslimat t'ye atanırsa, aksi takdirde 0
+        x = {}
+        vars_by_drone: Dict[int, list] = {}
+        vars_by_delivery: Dict[int, list] = {}
+        for d_id, t_id in possible_assignments:
+            x[(d_id, t_id)] = model.NewBoolVar(f'x_d{d_id}_t{t_id}')
+            vars_by_drone.setdefault(d_id, []).append(x[(d_id, t_id)])
+            vars_by_delivery.setdefault(t_id, []).append(x[(d_id, t_id)])
 
-            if not t.is_within_time_window(estimated_arrival_time):
-                model.Add(x[(d.id, t.id)] == 0)
-                continue
+        # Kısıt 1: Her teslimat en fazla bir drone'a atanır
+        for var_list in vars_by_delivery.values():
+            model.AddAtMostOne(var_list)
 
-            path_infos[(d.id, t.id)] = path_info
-            possible_assignments.append((d.id, t.id))
+        # Kısıt 2: Her drone en fazla bir teslimata atanır
+        for var_list in vars_by_drone.values():
+            model.AddAtMostOne(var_list)
 
-    objective_terms = []
-    for d_id, t_id in possible_assignments:
-        delivery = next(t for t in deliveries if t.id == t_id)
-        objective_terms.append(x[(d_id, t_id)] * delivery.priority)
+        priorities = {t.id: t.priority for t in deliveries}
+        objective_terms = []
+        for d_id, t_id in possible_assignments:
+            objective_terms.append(x[(d_id, t_id)] * priorities[t_id])
 
-    model.Maximize(sum(objective_terms))
+        model.Maximize(sum(objective_terms))
 
 
     solver = cp_model.CpSolver()
     solver.parameters.log_search_progress = False 
-    status = solver.Solve(model)
+    with profiler.phase("solve"):
+        status = solver.Solve(model)
 
     results = []
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
@@ -123,8 +174,10 @@ def solve_assignment_csp(
                     'delivery_id': t_id,
                     'path_info': path_infos[(d_id, t_id)]
                 })
-        print(f"CSP Çözücü Durumu: {solver.StatusName(status)}, Toplam Amaç Değeri: {solver.ObjectiveValue()}")
-    else:
-        print(f"CSP Çözücü Durumu: {solver.StatusName(status)}")
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("CSP Çözücü Durumu: %s, Toplam Amaç Değeri: %s", solver.StatusName(status), solver.ObjectiveValue(),
+                         extra={"event": "csp_status", "assignments": len(results)})
+    elif logger.isEnabledFor(DEBUG):
+        logger.debug("CSP Çözücü Durumu: %s", solver.StatusName(status), extra={"event": "csp_status", "assignments": 0})
 
     return results
\ No newline at end of file
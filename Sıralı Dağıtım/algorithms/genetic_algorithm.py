@@ -1,21 +1,109 @@
 import random
+from collections import OrderedDict
 from typing import List, Dict, Tuple, Callable, Any, Optional
 from core.drone import Drone
 from core.delivery_point import DeliveryPoint
 from core.no_fly_zone import NoFlyZone
+from core.location_index import LocationIndex
 from algorithms.a_star import find_path_astar, a_star_delivery_cost
-from geometry_utils import euclidean_distance
-from datetime_utils import time as وقت, add_seconds_to_time, time_to_seconds
+from algorithms.nfz_cache import NFZSegmentCache
+from algorithms.batch_fitness import SERVICE_TIME_RANGE, sample_service_times, evaluate_population
+from utils.geometry_utils import euclidean_distance
+from utils.sim_logging import get_logger, DEBUG
 
 # Bir drone için rota (teslimat sıralaması)
 Chromosome = List[int] 
+
+# Bu uzunluktan itibaren GA, toplu değerlendirme yerine önek ağacıyla artımlı değerlendirme kullanır
+INCREMENTAL_EVALUATION_MIN_STOPS = 20
+
+logger = get_logger("ga")
+
+class FitnessCache:
+    """
+    Kromozomun kanonik anahtarıyla (teslimat ID tuple'ı) fitness değerlerini tutan sınırlı LRU önbellek.
+    Servis süreleri çalıştırma başına sabit olduğundan aynı sıralama her zaman aynı fitness değerini alır;
+    elitler ve tekrar eden bireyler yeniden değerlendirilmez.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, ...], float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Tuple[int, ...]) -> Optional[float]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def store(self, key: Tuple[int, ...], value: float) -> None:
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+def sequence_step(
+    drone: Drone, # Güncel bataryası ayarlanmış geçici drone
+    current_pos: Tuple[float, float],
+    current_time: float, # Simülasyon saniyesi
+    delivery: DeliveryPoint,
+    no_fly_zones: List[NoFlyZone],
+    location_index: Optional[LocationIndex] = None,
+    nfz_cache: Optional[NFZSegmentCache] = None,
+    service_times: Optional[Dict[int, float]] = None
+) -> Optional[Tuple[float, bool, float]]:
+    """
+    Rotadaki tek bir teslimat adımını hesaplar. Yol bulunamaz ya da batarya yetmezse None döner
+    (rota burada kesilir), aksi halde (harcanan enerji, zaman penceresi ihlali, servis sonrası zaman).
+    """
+    path_info = find_path_astar(current_pos, delivery.pos, drone, delivery, no_fly_zones, current_time, location_index, nfz_cache)
+    if path_info is None: 
+        return None
+
+    from_idx = location_index.index_of(current_pos) if location_index is not None else None
+    if from_idx is not None and len(path_info.points) == 2:
+        to_idx = location_index.delivery_idx[delivery.id]
+        flight_time_seconds = location_index.travel_time(drone.id, from_idx, to_idx)
+        energy_consumed = location_index.energy(drone.id, from_idx, to_idx)
+    else:
+        distance = path_info.length
+        flight_time_seconds = drone.calculate_flight_time(distance)
+        energy_consumed = drone.calculate_battery_consumption(flight_time_seconds)
+
+    # Batarya kontrolü tekrar teyit
+    if drone.current_battery < energy_consumed:
+        return None
+
+    # Zaman penceresi kontrolü
+    estimated_arrival_time = current_time + flight_time_seconds
+    window_violated = not delivery.is_within_time_window(estimated_arrival_time)
+    service_time = service_times[delivery.id] if service_times is not None else random.uniform(*SERVICE_TIME_RANGE)
+    next_time = estimated_arrival_time + service_time # Teslimat süresi için küçük bir ekleme
+    return energy_consumed, window_violated, next_time
+
+
 def calculate_sequence_fitness(
     chromosome: Chromosome, # Teslimat ID'lerinin sıralaması
     drone_initial_state: Drone, # Drone'un bu sekansa başlamadan önceki durumu
     deliveries_dict: Dict[int, DeliveryPoint],
     no_fly_zones: List[NoFlyZone],
-    initial_time: وقت,
-    base_start_pos: Tuple[float,float] # Şarj vb için üs konumu
+    initial_time: float, # Simülasyon saniyesi
+    base_start_pos: Tuple[float,float], # Şarj vb için üs konumu
+    location_index: Optional[LocationIndex] = None, # Verilirse düz bacaklar matristen okunur
+    nfz_cache: Optional[NFZSegmentCache] = None, # Verilirse bacak yolları dönem önbelleğinden okunur
+    service_times: Optional[Dict[int, float]] = None # Teslimat başına servis süresi; None = her adımda rastgele
 ) -> Tuple[float, int, float, int]: # fitness, num_deliveries, total_energy, total_violations
 
     num_deliveries_completed = 0
@@ -43,31 +131,18 @@ def calculate_sequence_fitness(
 
     for delivery_id in chromosome:
         delivery = deliveries_dict[delivery_id]
-
-        path_info = find_path_astar(current_pos, delivery.pos, temp_drone_for_calc, delivery, no_fly_zones, current_time)
-
-        if path_info is None: 
-            total_violations += 1 
-            break 
-        
-        distance = path_info.length
-        flight_time_seconds = temp_drone_for_calc.calculate_flight_time(distance)
-        energy_consumed = temp_drone_for_calc.calculate_battery_consumption(flight_time_seconds)
-
-        # Batarya kontrolü tekrar teyit
-        if temp_drone_for_calc.current_battery < energy_consumed:
-            total_violations +=1 # Batarya yetmedi
+        step = sequence_step(temp_drone_for_calc, current_pos, current_time, delivery, no_fly_zones, location_index, nfz_cache, service_times)
+        if step is None:
+            total_violations += 1 # Yol yok ya da batarya yetmedi
             break
 
-        # Zaman penceresi kontrolü
-        estimated_arrival_time = add_seconds_to_time(current_time, flight_time_seconds)
-        if not delivery.is_within_time_window(estimated_arrival_time):
+        energy_consumed, window_violated, current_time = step
+        if window_violated:
             total_violations += 1 
         # Teslimat başarılı 
         temp_drone_for_calc.current_battery -= energy_consumed
         total_energy_used += energy_consumed
         current_pos = delivery.pos
-        current_time = add_seconds_to_time(estimated_arrival_time, random.uniform(30,90)) # Teslimat süresi için küçük bir ekleme
         num_deliveries_completed += 1
 
     fitness = (num_deliveries_completed * 100.0) - (total_energy_used * 0.2) - (total_violations * 2000.0)
@@ -75,20 +150,118 @@ def calculate_sequence_fitness(
     return fitness, num_deliveries_completed, total_energy_used, total_violations
 
 
-def initialize_population(assigned_deliveries: List[int], population_size: int) -> List[Chromosome]:
+class _PrefixNode:
+    __slots__ = ("state", "children")
+
+    def __init__(self, state: tuple):
+        self.state = state # (konum, batarya, zaman, toplam enerji, tamamlanan, ihlal, rota kesildi mi)
+        self.children: Dict[int, "_PrefixNode"] = {}
+
+
+class IncrementalSequenceEvaluator:
+    """
+    Rota öneklerinden sonraki ara durumları (konum, batarya, zaman, enerji, ihlal) bir önek ağacında (trie) tutar.
+    Yeni bir kromozom önbellekteki en uzun ortak önekin sonundan itibaren simüle edilir; takas mutasyonunda
+    yalnızca ilk değişen indeksten sonraki son ek yeniden hesaplanır. Adımlar `sequence_step` ile yapıldığından
+    sonuçlar `calculate_sequence_fitness` ile aynıdır. Servis süreleri sabit olmalıdır; düğüm sayısı
+    `max_nodes`'u aşınca ağaç temizlenir.
+    """
+    def __init__(
+        self,
+        drone_initial_state: Drone,
+        deliveries_dict: Dict[int, DeliveryPoint],
+        no_fly_zones: List[NoFlyZone],
+        initial_time: float,
+        service_times: Dict[int, float],
+        location_index: Optional[LocationIndex] = None,
+        nfz_cache: Optional[NFZSegmentCache] = None,
+        max_nodes: int = 100000
+    ):
+        self.deliveries_dict = deliveries_dict
+        self.no_fly_zones = no_fly_zones
+        self.service_times = service_times
+        self.location_index = location_index
+        self.nfz_cache = nfz_cache
+        self.max_nodes = max_nodes
+
+        self._temp_drone = Drone(
+            id=drone_initial_state.id,
+            max_weight=drone_initial_state.max_weight,
+            battery_capacity=drone_initial_state.battery_capacity,
+            speed=drone_initial_state.speed,
+            start_pos=drone_initial_state.current_pos,
+            consumption_rate=drone_initial_state.consumption_rate,
+            charge_time_per_mah=drone_initial_state.charge_time_per_mah
+        )
+        self._initial_state = (drone_initial_state.current_pos, drone_initial_state.current_battery, initial_time, 0.0, 0, 0, False)
+        self.clear()
+
+    def clear(self) -> None:
+        self._root = _PrefixNode(self._initial_state)
+        self.num_nodes = 0
+        self.steps_computed = 0
+        self.steps_reused = 0
+
+    def _advance(self, state: tuple, delivery_id: int) -> tuple:
+        pos, battery, current_time, energy_used, completed, violations, _ = state
+        delivery = self.deliveries_dict[delivery_id]
+        self._temp_drone.current_battery = battery
+        step = sequence_step(self._temp_drone, pos, current_time, delivery, self.no_fly_zones,
+                             self.location_index, self.nfz_cache, self.service_times)
+        if step is None:
+            return pos, battery, current_time, energy_used, completed, violations + 1, True
+        energy_consumed, window_violated, next_time = step
+        return (delivery.pos, battery - energy_consumed, next_time, energy_used + energy_consumed,
+                completed + 1, violations + (1 if window_violated else 0), False)
+
+    def evaluate(self, chromosome: Chromosome) -> Tuple[float, int, float, int]:
+        # calculate_sequence_fitness ile aynı dönüş: fitness, num_deliveries, total_energy, total_violations
+        node = self._root
+        for delivery_id in chromosome:
+            if node.state[6]: # Rota önceki adımda kesildi
+                break
+            child = node.children.get(delivery_id)
+            if child is None:
+                child = _PrefixNode(self._advance(node.state, delivery_id))
+                node.children[delivery_id] = child
+                self.num_nodes += 1
+                self.steps_computed += 1
+            else:
+                self.steps_reused += 1
+            node = child
+
+        _, _, _, total_energy_used, num_deliveries_completed, total_violations, _ = node.state
+        if self.num_nodes > self.max_nodes:
+            self._root = _PrefixNode(self._initial_state)
+            self.num_nodes = 0
+        fitness = (num_deliveries_completed * 100.0) - (total_energy_used * 0.2) - (total_violations * 2000.0)
+        return fitness, num_deliveries_completed, total_energy_used, total_violations
+
+    @property
+    def reuse_rate(self) -> float:
+        total = self.steps_computed + self.steps_reused
+        return self.steps_reused / total if total else 0.0
+
+
+def initialize_population(assigned_deliveries: List[int], population_size: int,
+                          rng: Optional[random.Random] = None) -> List[Chromosome]:
+    # rng verilmezse modül düzeyindeki (global) rastgele üreteç kullanılır
+    rng = rng or random
     population = []
     for _ in range(population_size):
-        chromosome = random.sample(assigned_deliveries, len(assigned_deliveries))
+        chromosome = rng.sample(assigned_deliveries, len(assigned_deliveries))
         population.append(chromosome)
     return population
 
-def selection(population: List[Chromosome], fitness_scores: List[float], num_parents: int) -> List[Chromosome]:
+def selection(population: List[Chromosome], fitness_scores: List[float], num_parents: int,
+              rng: Optional[random.Random] = None) -> List[Chromosome]:
+    rng = rng or random
     parents = []
     tournament_size = max(2, len(population) // 10)
 
     
     for _ in range(num_parents):
-        tournament_contenders_indices = random.sample(range(len(population)), tournament_size)
+        tournament_contenders_indices = rng.sample(range(len(population)), tournament_size)
         winner_index = -1
         best_fitness_in_tournament = -float('inf')
         for contender_idx in tournament_contenders_indices:
@@ -98,16 +271,18 @@ def selection(population: List[Chromosome], fitness_scores: List[float], num_par
         if winner_index != -1:
             parents.append(population[winner_index])
         else: 
-            parents.append(random.choice(population))
+            parents.append(rng.choice(population))
             
     return parents
 
 
-def crossover_ordered(parent1: Chromosome, parent2: Chromosome) -> Tuple[Chromosome, Chromosome]:
+def crossover_ordered(parent1: Chromosome, parent2: Chromosome,
+                      rng: Optional[random.Random] = None) -> Tuple[Chromosome, Chromosome]:
+    rng = rng or random
     size = len(parent1)
     child1, child2 = [-1]*size, [-1]*size
 
-    start, end = sorted(random.sample(range(size), 2))
+    start, end = sorted(rng.sample(range(size), 2))
 
     child1[start:end+1] = parent1[start:end+1]
     child2[start:end+1] = parent2[start:end+1]
@@ -128,9 +303,10 @@ def crossover_ordered(parent1: Chromosome, parent2: Chromosome) -> Tuple[Chromos
     return child1, child2
 
 
-def mutate_swap(chromosome: Chromosome, mutation_rate: float) -> Chromosome:
-    if random.random() < mutation_rate and len(chromosome) >= 2:
-        idx1, idx2 = random.sample(range(len(chromosome)), 2)
+def mutate_swap(chromosome: Chromosome, mutation_rate: float, rng: Optional[random.Random] = None) -> Chromosome:
+    rng = rng or random
+    if rng.random() < mutation_rate and len(chromosome) >= 2:
+        idx1, idx2 = rng.sample(range(len(chromosome)), 2)
         chromosome[idx1], chromosome[idx2] = chromosome[idx2], chromosome[idx1]
     return chromosome
 
@@ -140,35 +316,72 @@ def run_genetic_algorithm(
     assigned_delivery_ids: List[int], # Bu drone'a atanmış teslimat ID'leri
     all_deliveries_dict: Dict[int, DeliveryPoint], # Tüm teslimatların haritası
     no_fly_zones: List[NoFlyZone],
-    current_sim_time: وقت,
+    current_sim_time: float, # Simülasyon saniyesi
     base_station_pos: Tuple[float,float],
     generations: int = 100,
     population_size: int = 50,
     mutation_rate: float = 0.1,
     crossover_rate: float = 0.8, 
-    num_elites: int = 2 
+    num_elites: int = 2,
+    location_index: Optional[LocationIndex] = None,
+    nfz_cache: Optional[NFZSegmentCache] = None,
+    service_times: Optional[Dict[int, float]] = None,
+    service_time_seed: Optional[int] = None,
+    fitness_cache: Optional[FitnessCache] = None,
+    incremental_evaluation: Optional[bool] = None, # None = rota uzunluğuna göre otomatik
+    rng: Optional[random.Random] = None # None = global `random` modülü
 ) -> Tuple[Optional[Chromosome], float]:
     """
     Belirli bir drone için teslimat sıralamasını optimize eder.
+    Servis süreleri verilmezse çalıştırma başına bir kez (`service_time_seed` ile) çekilir; böylece aynı
+    kromozom her nesilde aynı fitness değerini alır. Popülasyon her nesilde toplu olarak değerlendirilir,
+    önbellekte (`fitness_cache`) olmayan kromozomlar tek bir toplu çağrıda hesaplanır. Uzun rotalarda
+    (`INCREMENTAL_EVALUATION_MIN_STOPS` ve üzeri) bunun yerine yalnızca değişen son ekler simüle edilir.
+    Seçim, çaprazlama ve mutasyon `rng` üzerinden yapılır; verilmezse global `random` durumu kullanılır.
     Returns: En iyi rota (teslimat ID listesi) ve fitness değeri.
     """
     if not assigned_delivery_ids:
         return None, -float('inf')
+    rng = rng or random
+    if service_times is None:
+        service_times = sample_service_times(assigned_delivery_ids, service_time_seed)
     if len(assigned_delivery_ids) == 1: 
         fitness, _, _, _ = calculate_sequence_fitness(
-            assigned_delivery_ids, drone, all_deliveries_dict, no_fly_zones, current_sim_time, base_station_pos
+            assigned_delivery_ids, drone, all_deliveries_dict, no_fly_zones, current_sim_time, base_station_pos, location_index, nfz_cache, service_times
         )
         return assigned_delivery_ids, fitness
 
-    population = initialize_population(assigned_delivery_ids, population_size)
+    if fitness_cache is None:
+        fitness_cache = FitnessCache()
+    if incremental_evaluation is None:
+        incremental_evaluation = len(assigned_delivery_ids) >= INCREMENTAL_EVALUATION_MIN_STOPS
+    evaluator = None
+    if incremental_evaluation:
+        evaluator = IncrementalSequenceEvaluator(
+            drone, all_deliveries_dict, no_fly_zones, current_sim_time, service_times, location_index, nfz_cache
+        )
+    population = initialize_population(assigned_delivery_ids, population_size, rng)
     best_chromosome_overall = None
     best_fitness_overall = -float('inf')
 
     for gen in range(generations):
-        fitness_scores = [
-            calculate_sequence_fitness(chromo, drone, all_deliveries_dict, no_fly_zones, current_sim_time, base_station_pos)[0]
-            for chromo in population
-        ]
+        scores_by_key: Dict[Tuple[int, ...], Optional[float]] = {}
+        for chromo in population:
+            key = tuple(chromo)
+            if key not in scores_by_key:
+                scores_by_key[key] = fitness_cache.lookup(key)
+        missing = [key for key, score in scores_by_key.items() if score is None]
+        if missing:
+            if evaluator is not None:
+                missing_scores = [evaluator.evaluate(key)[0] for key in missing]
+            else:
+                missing_scores = evaluate_population(
+                    missing, drone, all_deliveries_dict, no_fly_zones, current_sim_time, base_station_pos, location_index, nfz_cache, service_times
+                )[0].tolist()
+            for key, score in zip(missing, missing_scores):
+                scores_by_key[key] = score
+                fitness_cache.store(key, score)
+        fitness_scores = [scores_by_key[tuple(chromo)] for chromo in population]
 
         # En iyileri bul ve sakla
         sorted_population_with_scores = sorted(zip(population, fitness_scores), key=lambda x: x[1], reverse=True)
@@ -187,18 +400,18 @@ def run_genetic_algorithm(
              num_parents_to_select = max(0, num_parents_to_select -1) if population_size > len(next_generation) else 0
         
         if num_parents_to_select > 0 :
-            parents = selection(population, fitness_scores, num_parents_to_select)
+            parents = selection(population, fitness_scores, num_parents_to_select, rng)
 
             for i in range(0, len(parents) -1, 2): 
                 parent1, parent2 = parents[i], parents[i+1]
-                if random.random() < crossover_rate:
-                    child1, child2 = crossover_ordered(parent1, parent2)
+                if rng.random() < crossover_rate:
+                    child1, child2 = crossover_ordered(parent1, parent2, rng)
                     next_generation.extend([child1, child2])
                 else: 
                     next_generation.extend([parent1, parent2])
         
         for i in range(num_elites, len(next_generation)): 
-            next_generation[i] = mutate_swap(next_generation[i], mutation_rate)
+            next_generation[i] = mutate_swap(next_generation[i], mutation_rate, rng)
 
         if len(next_generation) < population_size and population:
              needed = population_size - len(next_generation)
@@ -207,8 +420,11 @@ def run_genetic_algorithm(
 
         population = next_generation[:population_size] 
 
-        if gen % 10 == 0:
-             print(f"GA Gen {gen}: Best Fitness = {best_fitness_overall:.2f}, Pop Size: {len(population)}")
+        if gen % 10 == 0 and logger.isEnabledFor(DEBUG):
+            logger.debug("GA Gen %d: Best Fitness = %.2f, Pop Size: %d", gen, best_fitness_overall, len(population),
+                         extra={"event": "ga_generation", "drone_id": drone.id})
 
-    print(f"GA Tamamlandı. En İyi Rota: {best_chromosome_overall}, Fitness: {best_fitness_overall:.2f}")
+    logger.info("GA Tamamlandı. En İyi Rota: %s, Fitness: %.2f, Fitness önbelleği isabet oranı: %.1f%%",
+                best_chromosome_overall, best_fitness_overall, fitness_cache.hit_rate * 100,
+                extra={"event": "ga_done", "drone_id": drone.id})
     return best_chromosome_overall, best_fitness_overall
\ No newline at end of file
@@ -0,0 +1,182 @@
+import time as pytime
+from typing import List, Dict, Tuple, Optional, Set
+from core.drone import Drone
+from core.delivery_point import DeliveryPoint
+from core.no_fly_zone import NoFlyZone
+from core.location_index import LocationIndex
+from algorithms.csp import PathInfo, find_feasible_assignments
+from algorithms.nfz_cache import NFZSegmentCache
+from algorithms.candidate_generation import DEFAULT_MAX_CANDIDATES
+from utils.profiling import Profiler, NULL_PROFILER
+from utils.sim_logging import get_logger, DEBUG
+
+from ortools.sat.python import cp_model
+
+logger = get_logger("csp")
+
+class IncrementalAssignmentService:
+    """
+    Simülasyon adımları arasında CP-SAT model iskeletini koruyan atama servisi.
+
+    Her (drone, teslimat) çifti için BoolVar yalnızca çift ilk kez uygun olduğunda oluşturulur; sonraki
+    adımlarda değişken silinmez, uygun olmadığında alan (domain) [0, 0]'a sabitlenir. Yeni değişken alan
+    drone/teslimatlar için yalnızca ek bir AtMostOne kısıtı eklenir (eski kısıt yeni kümenin alt kümesi
+    olduğundan geçerli kalır). Sıcak başlangıç için `AddHint` ile tam ve uygun bir eşleştirme verilir: önceki
+    çözümün hâlâ uygun çiftleri (ör. şarj eşiği yüzünden başlatılmayanlar), ardından öncelik sırasıyla açgözlü
+    seçilen boştaki drone/bekleyen teslimat çiftleri.
+    Ölü değişken/kısıt sayısı çok artarsa model sıfırdan yeniden kurulur.
+    """
+    def __init__(
+        self,
+        base_station_pos: Tuple[float, float] = (0.0, 0.0),
+        max_time_in_seconds: Optional[float] = None,
+        num_workers: int = 0,
+        rebuild_ratio: float = 4.0,
+        location_index: Optional[LocationIndex] = None,
+        nfz_cache: Optional[NFZSegmentCache] = None,
+        max_candidates: Optional[int] = DEFAULT_MAX_CANDIDATES,
+        profiler: Profiler = NULL_PROFILER
+    ):
+        self.base_station_pos = base_station_pos
+        self.max_time_in_seconds = max_time_in_seconds # Adım başına çözüm süresi sınırı (None = sınırsız)
+        self.num_workers = num_workers # 0 = OR-Tools varsayılanı
+        self.rebuild_ratio = rebuild_ratio
+        self.location_index = location_index
+        self.nfz_cache = nfz_cache
+        self.max_candidates = max_candidates
+        self.profiler = profiler # Açıksa yol bilgisi / model kurma / çözüm aşamaları kaydedilir
+
+        self.solve_count = 0
+        self.rebuild_count = 0
+        self.last_status: Optional[str] = None
+        self.last_solve_wall_time = 0.0
+        self.last_build_wall_time = 0.0
+        self._reset_model()
+
+    def _reset_model(self):
+        self.model = cp_model.CpModel()
+        self._vars: Dict[Tuple[int, int], cp_model.IntVar] = {}
+        self._enabled: Set[Tuple[int, int]] = set()
+        self._num_constraints = 0
+        self._previous_solution: Set[Tuple[int, int]] = set()
+
+    def _set_enabled(self, key: Tuple[int, int], enabled: bool):
+        # BoolVar alanının üst sınırı değiştirilerek değişken açılır/kapatılır
+        self.model.Proto().variables[self._vars[key].Index()].domain[1] = 1 if enabled else 0
+        if enabled:
+            self._enabled.add(key)
+        else:
+            self._enabled.discard(key)
+
+    def _needs_rebuild(self, num_feasible: int) -> bool:
+        live = max(num_feasible, 1)
+        return len(self._vars) > self.rebuild_ratio * live + 64 or self._num_constraints > self.rebuild_ratio * live + 64
+
+    def solve(
+        self,
+        drones: List[Drone],
+        deliveries: List[DeliveryPoint],
+        no_fly_zones: List[NoFlyZone],
+        current_sim_time: float, # Simülasyon saniyesi
+        early_arrivals: Optional[Dict[Tuple[int, int], float]] = None
+    ) -> List[Dict]:
+        build_start = pytime.perf_counter()
+        path_infos: Dict[Tuple[int, int], PathInfo] = find_feasible_assignments(
+            drones, deliveries, no_fly_zones, current_sim_time, self.base_station_pos, self.location_index, self.nfz_cache, self.max_candidates,
+            early_arrivals
+        )
+        path_info_time = pytime.perf_counter() - build_start
+
+        if self._needs_rebuild(len(path_infos)):
+            previous_solution = self._previous_solution
+            self._reset_model()
+            self._previous_solution = previous_solution
+            self.rebuild_count += 1
+
+        # Yeni çiftler için değişken oluştur, kapsamı genişleyen drone/teslimatları işaretle
+        changed_drones: Set[int] = set()
+        changed_deliveries: Set[int] = set()
+        for key in path_infos:
+            if key not in self._vars:
+                d_id, t_id = key
+                self._vars[key] = self.model.NewBoolVar(f'x_d{d_id}_t{t_id}')
+                self._enabled.add(key)
+                changed_drones.add(d_id)
+                changed_deliveries.add(t_id)
+            elif key not in self._enabled:
+                self._set_enabled(key, True)
+
+        for key in list(self._enabled):
+            if key not in path_infos:
+                self._set_enabled(key, False)
+
+        if changed_drones or changed_deliveries:
+            vars_by_drone: Dict[int, List[cp_model.IntVar]] = {}
+            vars_by_delivery: Dict[int, List[cp_model.IntVar]] = {}
+            for (d_id, t_id), var in self._vars.items():
+                if d_id in changed_drones:
+                    vars_by_drone.setdefault(d_id, []).append(var)
+                if t_id in changed_deliveries:
+                    vars_by_delivery.setdefault(t_id, []).append(var)
+            # Kısıt 1: Her teslimat en fazla bir drone'a atanır
+            for var_list in vars_by_delivery.values():
+                if len(var_list) > 1:
+                    self.model.AddAtMostOne(var_list); self._num_constraints += 1
+            # Kısıt 2: Her drone en fazla bir teslimata atanır
+            for var_list in vars_by_drone.values():
+                if len(var_list) > 1:
+                    self.model.AddAtMostOne(var_list); self._num_constraints += 1
+
+        priorities = {t.id: t.priority for t in deliveries}
+        self.model.Maximize(sum(self._vars[key] * priorities[key[1]] for key in path_infos))
+
+        # Sıcak başlangıç: önceki çözümün çiftlerinin çoğunun dronu artık görevde olduğundan, ipucu bu çözümün uygun
+        # çiftlerinden açgözlü kurulur (önce hâlâ uygun eski çiftler, sonra yüksek öncelik ve kısa yol)
+        hint: Set[Tuple[int, int]] = set()
+        used_drones: Set[int] = set()
+        used_deliveries: Set[int] = set()
+        for key in sorted(path_infos, key=lambda k: (k not in self._previous_solution, -priorities[k[1]], path_infos[k].length)):
+            if key[0] not in used_drones and key[1] not in used_deliveries:
+                hint.add(key)
+                used_drones.add(key[0])
+                used_deliveries.add(key[1])
+        self.model.ClearHints()
+        for key in path_infos:
+            self.model.AddHint(self._vars[key], 1 if key in hint else 0)
+        self.last_build_wall_time = pytime.perf_counter() - build_start
+        if self.profiler.enabled:
+            self.profiler.add_time("path_info", path_info_time)
+            self.profiler.add_time("model_build", self.last_build_wall_time - path_info_time)
+            self.profiler.count("csp_candidates", len(path_infos))
+
+        solver = cp_model.CpSolver()
+        solver.parameters.log_search_progress = False
+        if self.max_time_in_seconds is not None:
+            solver.parameters.max_time_in_seconds = self.max_time_in_seconds
+        if self.num_workers > 0:
+            solver.parameters.num_workers = self.num_workers
+        with self.profiler.phase("solve"):
+            status = solver.Solve(self.model)
+        self.solve_count += 1
+        self.last_status = solver.StatusName(status)
+        self.last_solve_wall_time = solver.WallTime()
+
+        results = []
+        if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+            self._previous_solution = set()
+            for key, path_info in path_infos.items():
+                if solver.Value(self._vars[key]) == 1:
+                    self._previous_solution.add(key)
+                    results.append({
+                        'drone_id': key[0],
+                        'delivery_id': key[1],
+                        'path_info': path_info
+                    })
+            if logger.isEnabledFor(DEBUG):
+                logger.debug("CSP (artımlı) Durumu: %s, Amaç: %s, Değişken: %d (aktif %d), Süre: %.3fs",
+                             self.last_status, solver.ObjectiveValue(), len(self._vars), len(self._enabled),
+                             self.last_solve_wall_time, extra={"event": "csp_status", "assignments": len(results)})
+        elif logger.isEnabledFor(DEBUG):
+            logger.debug("CSP (artımlı) Durumu: %s", self.last_status, extra={"event": "csp_status", "assignments": 0})
+
+        return results
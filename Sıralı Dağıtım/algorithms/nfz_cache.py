@@ -0,0 +1,95 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import List, Tuple, Optional, Dict
+from core.no_fly_zone import NoFlyZone
+from core.nfz_index import NFZIndex
+from algorithms.a_star import AStarPath, find_waypoint_path
+from utils.datetime_utils import in_time_window
+
+class NFZSegmentCache:
+    """
+    Simülasyon zamanını "aktivite dönemlerine" (aktif NFZ kümesinin sabit kaldığı aralıklar) böler ve
+    (aktif küme, başlangıç, bitiş) anahtarıyla yol/kesişim sonuçlarını sınırlı bir LRU önbellekte tutar.
+    Böylece CSP'nin her dakika tekrarladığı aynı geometri hesapları yalnızca dönem değiştiğinde yapılır.
+    """
+    def __init__(self, no_fly_zones: List[NoFlyZone], max_entries: int = 50000):
+        self.no_fly_zones = no_fly_zones
+        self.max_entries = max_entries
+
+        # Kesme noktaları mutlak simülasyon saniyesidir (çok günlü simülasyonda da dönemler karışmaz)
+        breakpoints = set()
+        for nfz in no_fly_zones:
+            if nfz.active_seconds is not None:
+                breakpoints.update(nfz.active_seconds)
+        self.breakpoints: List[float] = sorted(breakpoints)
+
+        self._epoch_zones: Dict[int, Tuple[Tuple[int, ...], List[NoFlyZone], NFZIndex]] = {}
+        self._entries: "OrderedDict[tuple, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def epoch_of(self, sim_seconds: float) -> int:
+        # Çift numaralı dönemler kesme noktaları arasındaki açık aralıklar, tek numaralılar noktanın kendisidir
+        # (aralıklar kapalı olduğundan [başlangıç, bitiş] uçlarında aktif küme farklı olabilir).
+        i = bisect_left(self.breakpoints, sim_seconds)
+        if i < len(self.breakpoints) and self.breakpoints[i] == sim_seconds:
+            return 2 * i + 1
+        return 2 * i
+
+    def active_zones(self, sim_seconds: float) -> List[NoFlyZone]:
+        return self._epoch_state(sim_seconds)[1]
+
+    def _epoch_state(self, sim_seconds: float) -> Tuple[Tuple[int, ...], List[NoFlyZone], NFZIndex]:
+        epoch = self.epoch_of(sim_seconds)
+        state = self._epoch_zones.get(epoch)
+        if state is None:
+            zones = [nfz for nfz in self.no_fly_zones if in_time_window(nfz.active_seconds, sim_seconds)]
+            state = (tuple(sorted(nfz.id for nfz in zones)), zones, NFZIndex(zones))
+            self._epoch_zones[epoch] = state
+        return state
+
+    def _lookup(self, key: tuple):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def _store(self, key: tuple, value) -> None:
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def is_segment_blocked(self, p1: Tuple[float, float], p2: Tuple[float, float], sim_seconds: float) -> bool:
+        # Düz doğru parçası aktif bir NFZ ile kesişiyor mu?
+        active_key, _, nfz_index = self._epoch_state(sim_seconds)
+        key = ("segment", active_key, p1, p2)
+        found, blocked = self._lookup(key)
+        if not found:
+            blocked = nfz_index.segment_intersects_any(p1, p2)
+            self._store(key, blocked)
+        return blocked
+
+    def find_path(self, p1: Tuple[float, float], p2: Tuple[float, float], sim_seconds: float) -> Optional[AStarPath]:
+        """
+        find_waypoint_path sonucunu önbellekten döndürür. Dönen nesne paylaşıldığı için
+        `points` listesi değiştirilecekse çağıran tarafından kopyalanmalıdır.
+        """
+        active_key, zones, nfz_index = self._epoch_state(sim_seconds)
+        key = ("path", active_key, p1, p2)
+        found, path = self._lookup(key)
+        if not found:
+            path = find_waypoint_path(p1, p2, zones, nfz_index=nfz_index)
+            self._store(key, path)
+        return path
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,133 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Optional
+from core.drone import Drone
+from core.delivery_point import DeliveryPoint
+from core.no_fly_zone import NoFlyZone
+from core.location_index import LocationIndex
+from algorithms.nfz_cache import NFZSegmentCache
+from algorithms.genetic_algorithm import Chromosome, run_genetic_algorithm
+from utils.sim_logging import get_logger, configure_logging
+
+# Tuple düzenleri (işçi sürece yalnızca düz veri gönderilir; shapely poligonları gönderilmez)
+DroneState = Tuple[int, float, float, float, Tuple[float, float], float, float, float]
+# (id, max_weight, battery_capacity, speed, current_pos, consumption_rate, charge_time_per_mah, current_battery)
+DeliveryRecord = Tuple[int, Tuple[float, float], float, int, Optional[Tuple[int, int]]]
+# (id, pos, weight, priority, window_seconds)
+NFZRecord = Tuple[int, Tuple[Tuple[float, float], ...], Optional[Tuple[int, int]]]
+# (id, coordinates, active_seconds)
+
+logger = get_logger("ga")
+
+@dataclass(frozen=True)
+class RouteProblem:
+    """
+    Tek bir drone'un sıralama problemini tanımlayan, pickle'lanabilir küçük veri nesnesi.
+    İşçi süreç Drone/NoFlyZone nesnelerini, konum indeksini ve NFZ önbelleğini bundan yeniden kurar.
+    """
+    drone: DroneState
+    deliveries: Tuple[DeliveryRecord, ...]
+    no_fly_zones: Tuple[NFZRecord, ...]
+    current_time: float # Simülasyon saniyesi
+    base_station_pos: Tuple[float, float]
+    delivery_ids: Tuple[int, ...] # Sıralanacak teslimatlar
+    generations: int = 100
+    population_size: int = 50
+    mutation_rate: float = 0.1
+    crossover_rate: float = 0.8
+    num_elites: int = 2
+    seed: Optional[int] = None
+
+
+def build_route_problem(
+    drone: Drone,
+    delivery_ids: List[int],
+    deliveries_dict: Dict[int, DeliveryPoint],
+    no_fly_zones: List[NoFlyZone],
+    current_time: float,
+    base_station_pos: Tuple[float, float],
+    seed: Optional[int] = None,
+    **ga_params
+) -> RouteProblem:
+    drone_state = (drone.id, drone.max_weight, drone.battery_capacity, drone.speed, tuple(drone.current_pos),
+                   drone.consumption_rate, drone.charge_time_per_mah, drone.current_battery)
+    deliveries = tuple(
+        (t.id, tuple(t.pos), t.weight, t.priority, t.window_seconds)
+        for t in (deliveries_dict[i] for i in delivery_ids)
+    )
+    nfzs = tuple(
+        (nfz.id, tuple(tuple(p) for p in nfz.coordinates), nfz.active_seconds)
+        for nfz in no_fly_zones
+    )
+    return RouteProblem(drone_state, deliveries, nfzs, current_time, tuple(base_station_pos), tuple(delivery_ids),
+                        seed=seed, **ga_params)
+
+
+def solve_route_problem(problem: RouteProblem) -> Tuple[int, Optional[Chromosome], float]:
+    # İşçi süreçte çalışır: nesneleri yeniden kurar ve tek drone için GA'yı çalıştırır.
+    drone_id, max_weight, battery_capacity, speed, current_pos, consumption_rate, charge_time_per_mah, current_battery = problem.drone
+    drone = Drone(drone_id, max_weight, battery_capacity, speed, current_pos, consumption_rate, charge_time_per_mah)
+    drone.current_battery = current_battery
+    deliveries = [DeliveryPoint(t_id, pos, weight, priority, window_seconds=window_seconds)
+                  for t_id, pos, weight, priority, window_seconds in problem.deliveries]
+    no_fly_zones = [NoFlyZone(nfz_id, list(coordinates), active_seconds=active_seconds)
+                    for nfz_id, coordinates, active_seconds in problem.no_fly_zones]
+
+    location_index = LocationIndex(problem.base_station_pos, [drone], deliveries)
+    nfz_cache = NFZSegmentCache(no_fly_zones)
+    # Problem başına yerel üreteç: çağıranın global `random` durumuna dokunulmaz. seed None ise Random() işletim
+    # sisteminin entropisiyle başlar; fork ile kopyalanan işçiler aynı diziyi üretmez.
+    rng = random.Random(problem.seed)
+
+    best_chromosome, best_fitness = run_genetic_algorithm(
+        drone, list(problem.delivery_ids), {t.id: t for t in deliveries}, no_fly_zones, problem.current_time,
+        problem.base_station_pos, problem.generations, problem.population_size, problem.mutation_rate,
+        problem.crossover_rate, problem.num_elites, location_index, nfz_cache, service_time_seed=problem.seed, rng=rng
+    )
+    return drone_id, best_chromosome, best_fitness
+
+
+def run_fleet_genetic_algorithm(
+    drone_assignments: Dict[int, List[int]], # drone_id -> sıralanacak teslimat ID'leri
+    drones: List[Drone],
+    deliveries_dict: Dict[int, DeliveryPoint],
+    no_fly_zones: List[NoFlyZone],
+    current_sim_time: float,
+    base_station_pos: Tuple[float, float],
+    max_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    **ga_params
+) -> Dict[int, Tuple[Optional[Chromosome], float]]:
+    """
+    Atama sabitlendikten sonra dronların sıralama problemleri birbirinden bağımsızdır; her drone için GA
+    ayrı bir süreçte (ProcessPoolExecutor) çalıştırılır. Süreçlere yalnızca RouteProblem gönderilir.
+    `seed` verilirse drone başına seed + drone_id kullanılır, sonuç işçi sayısından bağımsızdır.
+    Returns: drone_id -> (en iyi rota, fitness)
+    """
+    drones_by_id = {d.id: d for d in drones}
+    problems = [
+        build_route_problem(drones_by_id[drone_id], delivery_ids, deliveries_dict, no_fly_zones, current_sim_time,
+                            base_station_pos, None if seed is None else seed + drone_id, **ga_params)
+        for drone_id, delivery_ids in drone_assignments.items() if delivery_ids
+    ]
+    if not problems:
+        return {}
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(problems))
+    if max_workers <= 1:
+        results = [solve_route_problem(problem) for problem in problems]
+    else:
+        # Büyük problemler önce gönderilir ki son işçiler boşta beklemesin
+        problems.sort(key=lambda p: len(p.delivery_ids), reverse=True)
+        # İşçiler ana sürecin günlük seviyesiyle başlar (QUIET ise işçiler de hiç biçimlendirme yapmaz)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=configure_logging,
+                                 initargs=(logger.getEffectiveLevel(),)) as executor:
+            results = list(executor.map(solve_route_problem, problems))
+
+    logger.info("Filo GA tamamlandı: %d drone, %d işçi", len(results), max_workers,
+                extra={"event": "fleet_ga_done", "routes": len(results)})
+    return {drone_id: (chromosome, fitness) for drone_id, chromosome, fitness in results}
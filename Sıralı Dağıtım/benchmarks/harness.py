@@ -0,0 +1,117 @@
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# Bir benchmark: hazırlık (süreye dahil değil) ve ölçülecek çağrıyı döndüren fonksiyon.
+# setup() -> (run, items); `items` bir çalıştırmada işlenen öğe (ör. yapılan atama, tamamlanan teslimat) sayısıdır.
+# Sayı ancak çalıştırmanın sonucundan bilinebiliyorsa `items`, run()'ın dönüş değerini alan bir fonksiyon olabilir.
+BenchmarkSetup = Callable[[], Tuple[Callable[[], object], Union[int, Callable[[object], int]]]]
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def measure(name: str, size: str, setup: BenchmarkSetup, repeats: int = 5, quiet: bool = True) -> dict:
+    """
+    Ölçülecek çağrıyı `repeats` kez çalıştırır (her seferinde yeni setup ile) ve süre istatistiklerini,
+    saniye başına işlenen öğe sayısını ve ayrı bir çalıştırmada tracemalloc ile tepe belleği kaydeder.
+    tracemalloc süreyi yavaşlattığı için zaman ölçümleri onsuz yapılır.
+    """
+    output = open(os.devnull, "w") if quiet else None
+    try:
+        durations = []
+        items = 0
+        for _ in range(repeats):
+            run, items = setup()
+            with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+                start = time.perf_counter()
+                result = run()
+                durations.append(time.perf_counter() - start)
+            if callable(items):
+                items = items(result)
+
+        run, _ = setup()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+                run()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        if output is not None:
+            output.close()
+
+    median = statistics.median(durations)
+    return {
+        "name": name,
+        "size": size,
+        "repeats": repeats,
+        "median_sec": median,
+        "min_sec": min(durations),
+        "max_sec": max(durations),
+        "items": items,
+        "throughput_per_sec": items / median if median > 0 else None,
+        "peak_memory_mb": peak_bytes / 1e6,
+    }
+
+def run_suite(benchmarks: Dict[str, Dict[str, BenchmarkSetup]], sizes: List[str], repeats: int = 5,
+              only: Optional[List[str]] = None) -> dict:
+    # benchmarks: isim -> {boyut -> setup}. Sonuçlar commit ve ortam bilgisiyle birlikte döner.
+    results = []
+    for name, by_size in benchmarks.items():
+        if only and name not in only:
+            continue
+        for size in sizes:
+            if size not in by_size:
+                continue
+            result = measure(name, size, by_size[size], repeats)
+            results.append(result)
+            print(f"{name:<28} {size:<8} medyan {result['median_sec'] * 1000:10.2f} ms  "
+                  f"{result['throughput_per_sec'] or 0:12.1f} öğe/s  tepe {result['peak_memory_mb']:8.2f} MB")
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+def write_results(path: str, report: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare_results(baseline: dict, current: dict, threshold: float = 1.2) -> List[dict]:
+    """
+    İki rapordaki aynı (isim, boyut) ölçümlerini karşılaştırır; medyan süresi `threshold` katından fazla
+    artanlar gerileme (regression) olarak işaretlenir. Karşılaştırma tablosu yazdırılır ve döndürülür.
+    """
+    old = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    rows = []
+    print(f"Karşılaştırma: {baseline.get('commit')} -> {current.get('commit')}")
+    for r in current.get("results", []):
+        before = old.get((r["name"], r["size"]))
+        if before is None or before["median_sec"] <= 0:
+            continue
+        ratio = r["median_sec"] / before["median_sec"]
+        regression = ratio > threshold
+        rows.append({"name": r["name"], "size": r["size"], "ratio": ratio, "regression": regression,
+                     "memory_ratio": r["peak_memory_mb"] / before["peak_memory_mb"] if before["peak_memory_mb"] else None})
+        flag = "  <-- GERİLEME" if regression else ""
+        print(f"{r['name']:<28} {r['size']:<8} {before['median_sec'] * 1000:10.2f} ms -> "
+              f"{r['median_sec'] * 1000:10.2f} ms  x{ratio:.2f}{flag}")
+    return rows
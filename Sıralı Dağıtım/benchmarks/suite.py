@@ -0,0 +1,112 @@
+import argparse
+import random
+import statistics
+from typing import Dict
+from algorithms.a_star import find_path_astar, _visibility_graph_cache
+from algorithms.csp import solve_assignment_csp
+from algorithms.genetic_algorithm import run_genetic_algorithm
+from core.nfz_index import _nfz_index_cache
+from data.scenario_generator import ScenarioConfig, DISTRIBUTION_CLUSTERED, generate_scenario
+from simulation.simulation_manager import SimulationManager
+from simulation.event_simulation import EventDrivenSimulationManager
+from benchmarks.harness import run_suite, write_results, load_results, compare_results
+from utils.sim_logging import configure_logging, QUIET
+
+BENCHMARK_SEED = 42
+
+# Sabit seed'li senaryo boyutları
+BENCHMARK_SIZES: Dict[str, ScenarioConfig] = {
+    "small": ScenarioConfig(num_drones=5, num_deliveries=20, num_no_fly_zones=3),
+    "medium": ScenarioConfig(num_drones=20, num_deliveries=200, num_no_fly_zones=8, area_size=300.0, horizon_minutes=240),
+    "large": ScenarioConfig(num_drones=50, num_deliveries=1000, num_no_fly_zones=20, area_size=1000.0,
+                            distribution=DISTRIBUTION_CLUSTERED, num_clusters=10, horizon_minutes=480),
+}
+GA_ROUTE_LENGTH = {"small": 10, "medium": 20, "large": 40}
+GA_GENERATIONS = 50
+ASTAR_LEGS = 200
+
+_scenarios: Dict[str, dict] = {}
+
+def _load(size: str, manager_cls=SimulationManager) -> SimulationManager:
+    # Senaryo sözlüğü bir kez üretilir; simülasyon nesneleri değiştiği için her setup'ta yeniden yüklenir
+    if size not in _scenarios:
+        _scenarios[size] = generate_scenario(BENCHMARK_SEED, BENCHMARK_SIZES[size])
+    manager = manager_cls()
+    manager.load_data_from_dict(_scenarios[size])
+    return manager
+
+def bench_solve_assignment_csp(size: str):
+    m = _load(size)
+    # Başlangıçta pencerelerin çoğu henüz açılmamıştır; çözüm, teslimatların yarısının penceresinin açıldığı anda ölçülür
+    solve_time = statistics.median(t.window_seconds[0] for t in m.deliveries if t.window_seconds is not None)
+    run = lambda: solve_assignment_csp(m.drones, m.deliveries, m.no_fly_zones, solve_time, m.BASE_STATION_POS,
+                                       m.location_index, m.nfz_cache)
+    return run, len # Yapılan atama sayısı
+
+def bench_run_genetic_algorithm(size: str):
+    m = _load(size)
+    route = [t.id for t in m.deliveries[:GA_ROUTE_LENGTH[size]]]
+    drone = m.drones[0]
+    def run():
+        random.seed(BENCHMARK_SEED)
+        return run_genetic_algorithm(drone, route, m.deliveries_dict, m.no_fly_zones, m.clock.now, m.BASE_STATION_POS,
+                                     generations=GA_GENERATIONS, location_index=m.location_index, nfz_cache=m.nfz_cache,
+                                     service_time_seed=BENCHMARK_SEED)
+    return run, len(route)
+
+def bench_find_path_astar(size: str):
+    # Önbelleksiz: her bacak için NFZ geometrisi ve görünürlük grafı araması ölçülür
+    m = _load(size)
+    rng = random.Random(BENCHMARK_SEED)
+    legs = [(rng.choice(m.drones), rng.choice(m.deliveries)) for _ in range(ASTAR_LEGS)]
+    def run():
+        for drone, delivery in legs:
+            # Modül düzeyindeki önbellekler her bacaktan önce boşaltılır; aksi halde ilk bacaktan sonra ısınırlar
+            _visibility_graph_cache.clear()
+            _nfz_index_cache.clear()
+            find_path_astar(drone.current_pos, delivery.pos, drone, delivery, m.no_fly_zones, m.clock.now)
+    return run, len(legs)
+
+def _completed_deliveries(results: dict) -> int:
+    return results["completed_deliveries_count"]
+
+def bench_simulated_day(size: str):
+    m = _load(size)
+    return m.run_simulation, _completed_deliveries
+
+def bench_simulated_day_event(size: str):
+    m = _load(size, EventDrivenSimulationManager)
+    return m.run_simulation, _completed_deliveries
+
+# İsim -> hangi boyutlarda çalışacağı. Adım tabanlı tam gün büyük senaryoda çok uzun sürdüğü için dışarıda.
+BENCHMARKS = {
+    "solve_assignment_csp": (bench_solve_assignment_csp, ("small", "medium", "large")),
+    "run_genetic_algorithm": (bench_run_genetic_algorithm, ("small", "medium", "large")),
+    "find_path_astar": (bench_find_path_astar, ("small", "medium", "large")),
+    "simulated_day": (bench_simulated_day, ("small", "medium")),
+    "simulated_day_event": (bench_simulated_day_event, ("small", "medium", "large")),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="CSP, GA, A* ve tam simülasyon ölçeklenme benchmark'ları")
+    parser.add_argument("--sizes", nargs="+", choices=list(BENCHMARK_SIZES), default=["small", "medium"])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=None)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak önceki sonuç dosyası (JSON)")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Gerileme sayılacak süre oranı")
+    args = parser.parse_args()
+    configure_logging(QUIET) # Ölçümlere günlük biçimlendirme süresi karışmasın
+
+    benchmarks = {
+        name: {size: (lambda fn=fn, size=size: fn(size)) for size in sizes}
+        for name, (fn, sizes) in BENCHMARKS.items()
+    }
+    report = run_suite(benchmarks, args.sizes, args.repeats, args.only)
+    write_results(args.output, report)
+    print(f"Sonuçlar yazıldı: {args.output}")
+    if args.compare:
+        compare_results(load_results(args.compare), report, args.threshold)
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,34 @@
 from typing import Tuple, Optional
 from datetime import datetime, time, timedelta
+from utils.datetime_utils import parse_time_window, format_time_window, in_time_window
 
 class DeliveryPoint:
     """
     Bir teslimat noktasını ve onunla ilişkili bilgileri temsil eder.
     """
-    def __init__(self, id: int, pos: Tuple[float, float], weight: float, priority: int, time_window: Optional[Tuple[str, str]] = None):
+    def __init__(self, id: int, pos: Tuple[float, float], weight: float, priority: int, time_window: Optional[Tuple[str, str]] = None,
+                 window_seconds: Optional[Tuple[int, int]] = None):
         self.id = id
         self.pos = pos  # (x, y) koordinatları
         self.weight = weight  # kg
         self.priority = priority
-        self.time_window = time_window  # (başlangıç_saati_str, bitiş_saati_str)
         self.status = "pending"  # Teslimat durumu: "pending", "in_progress", "completed", "failed"
         self.is_assigned = False
         self.assigned_drone_id: Optional[int] = None
 
-    def is_within_time_window(self, current_time: datetime.time) -> bool:
-        
-        if self.time_window is None:
-            return True  
+        # Zaman penceresi bir kez tamsayı simülasyon saniyesine (ilk gün 00:00'dan itibaren) çevrilir; karşılaştırmalar bunun üzerinden yapılır
+        self.window_seconds: Optional[Tuple[int, int]] = window_seconds
+        if window_seconds is None and time_window is not None:
+            try:
+                self.window_seconds = parse_time_window(time_window)
+            except ValueError:
+                print(f"HATA: Teslimat {self.id} için geçersiz zaman penceresi formatı: {time_window}")
+        if time_window is None and window_seconds is not None:
+            time_window = format_time_window(window_seconds)
+        self.time_window = time_window  # (başlangıç_saati_str, bitiş_saati_str), gösterim için
 
-        try:
-            window_start = datetime.strptime(self.time_window[0], "%H:%M").time()
-            window_end = datetime.strptime(self.time_window[1], "%H:%M").time()
-        except ValueError:
-            print(f"HATA: Teslimat {self.id} için geçersiz zaman penceresi formatı: {self.time_window}")
-            return True 
-
-        return window_start <= current_time <= window_end
+    def is_within_time_window(self, sim_seconds: float) -> bool:
+        return in_time_window(self.window_seconds, sim_seconds)
 
     def __str__(self):
         return (f"Delivery(ID: {self.id}, Pos: {self.pos}, Weight: {self.weight}kg, "
@@ -39,6 +39,11 @@ class Drone:
         # tüketim oranı * süre
         return self.consumption_rate * flight_duration_seconds
 
+    def has_enough_battery(self, distance: float) -> bool:
+        # Verilen mesafeyi mevcut batarya ile uçup uçamayacağını kontrol eder.
+        flight_time = self.calculate_flight_time(distance)
+        return self.current_battery >= self.calculate_battery_consumption(flight_time)
+
     def charge(self) -> float:
         charge_needed = self.battery_capacity - self.current_battery
         if charge_needed <= 0:
@@ -0,0 +1,105 @@
+from typing import List, Tuple, Dict, Optional, Sequence
+import numpy as np
+from core.drone import Drone
+from core.delivery_point import DeliveryPoint
+from utils.geometry_utils import euclidean_distance
+
+# Bu sayının üstündeki konumlarda (ör. üreticinin large/xlarge ön ayarları) yoğun matris tutulmaz: 4096 konum
+# yaklaşık 128 MB'tır ve bellek konum sayısının karesiyle büyür. Mesafeler istendikçe koordinatlardan hesaplanır.
+DENSE_MATRIX_MAX_LOCATIONS = 4096
+DISTANCE_ROW_BLOCK = 256 # Matris dolarken aynı anda hesaplanan satır sayısı (ara dizileri sınırlar)
+
+def _pairwise_distances(a: np.ndarray, b: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    # Eksen başına dış fark: (n, m, 2) boyutlu ara dizi oluşturulmaz
+    return np.hypot(np.subtract.outer(a[:, 0], b[:, 0]), np.subtract.outer(a[:, 1], b[:, 1]), out=out)
+
+class LocationIndex:
+    """
+    Baz istasyonu, drone başlangıç konumları ve teslimat noktalarını tamsayı indekslerle tutar.
+    Yoğun mesafe matrisi yükleme sırasında bir kez hesaplanır; CSP, GA ve simülasyon mesafe,
+    uçuş süresi ve enerji değerlerini bu indeksler üzerinden okur. Konum sayısı DENSE_MATRIX_MAX_LOCATIONS'ı
+    aşarsa `distance_matrix` None kalır ve aynı sorgular koordinatlardan hesaplanır.
+
+    İndeks düzeni: 0 = baz istasyonu, 1..D = drone başlangıç konumları, D+1.. = teslimatlar.
+    """
+    BASE_STATION_IDX = 0
+
+    def __init__(self, base_station_pos: Tuple[float, float], drones: List[Drone], deliveries: List[DeliveryPoint]):
+        positions = [base_station_pos] + [d.current_pos for d in drones] + [t.pos for t in deliveries]
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+
+        self.drone_start_idx: Dict[int, int] = {d.id: 1 + i for i, d in enumerate(drones)}
+        self.delivery_idx: Dict[int, int] = {t.id: 1 + len(drones) + i for i, t in enumerate(deliveries)}
+
+        # Aynı koordinattaki konumlar ilk indekse eşlenir (mesafeler zaten aynıdır)
+        self._pos_to_idx: Dict[Tuple[float, float], int] = {}
+        for i, pos in enumerate(positions):
+            self._pos_to_idx.setdefault(tuple(pos), i)
+
+        self.distance_matrix: Optional[np.ndarray] = None
+        n = len(self.positions)
+        if n <= DENSE_MATRIX_MAX_LOCATIONS:
+            self.distance_matrix = np.empty((n, n), dtype=float)
+            for start in range(0, n, DISTANCE_ROW_BLOCK):
+                stop = min(start + DISTANCE_ROW_BLOCK, n)
+                _pairwise_distances(self.positions[start:stop], self.positions, out=self.distance_matrix[start:stop])
+
+        # Drone başına metre başına süre (s/m) ve enerji (mAh/m); süre/enerji matrisleri bunlardan türetilir
+        self.drone_row: Dict[int, int] = {d.id: i for i, d in enumerate(drones)}
+        speeds = np.array([d.speed for d in drones], dtype=float)
+        consumption = np.array([d.consumption_rate for d in drones], dtype=float)
+        with np.errstate(divide='ignore'):
+            self.seconds_per_meter = np.where(speeds > 0, 1.0 / speeds, np.inf)
+        self.mah_per_meter = consumption * self.seconds_per_meter
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def index_of(self, pos: Tuple[float, float]) -> Optional[int]:
+        # Konum tabloda yoksa (ör. yolun ortasında kalan drone) None döner.
+        return self._pos_to_idx.get(tuple(pos))
+
+    def distance(self, i: int, j: int) -> float:
+        if self.distance_matrix is None:
+            (x1, y1), (x2, y2) = self.positions[i], self.positions[j]
+            return float(np.hypot(x1 - x2, y1 - y2))
+        return float(self.distance_matrix[i, j])
+
+    def distance_between(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
+        if self.distance_matrix is not None:
+            i = self._pos_to_idx.get(p1)
+            j = self._pos_to_idx.get(p2)
+            if i is not None and j is not None:
+                return float(self.distance_matrix[i, j])
+        return euclidean_distance(p1, p2)
+
+    def distances_from(self, pos: Tuple[float, float]) -> np.ndarray:
+        # Verilen konumdan tüm indekslenmiş konumlara olan mesafeler.
+        i = self._pos_to_idx.get(tuple(pos))
+        if i is not None and self.distance_matrix is not None:
+            return self.distance_matrix[i]
+        return np.hypot(self.positions[:, 0] - pos[0], self.positions[:, 1] - pos[1])
+
+    def travel_time(self, drone_id: int, i: int, j: int) -> float:
+        return self.distance(i, j) * float(self.seconds_per_meter[self.drone_row[drone_id]])
+
+    def energy(self, drone_id: int, i: int, j: int) -> float:
+        return self.distance(i, j) * float(self.mah_per_meter[self.drone_row[drone_id]])
+
+    def travel_time_matrix(self, drone_id: int, indices: Optional[Sequence[int]] = None) -> np.ndarray:
+        # Drone için süre matrisi; indices verilirse yalnızca o konumların alt matrisi.
+        return self.distance_submatrix(indices) * self.seconds_per_meter[self.drone_row[drone_id]]
+
+    def energy_matrix(self, drone_id: int, indices: Optional[Sequence[int]] = None) -> np.ndarray:
+        return self.distance_submatrix(indices) * self.mah_per_meter[self.drone_row[drone_id]]
+
+    def distance_submatrix(self, indices: Optional[Sequence[int]]) -> np.ndarray:
+        # indices konumları arasındaki mesafe alt matrisi (None = tam matris).
+        if indices is None:
+            if self.distance_matrix is None:
+                raise ValueError(f"{len(self.positions)} konum için tam mesafe matrisi tutulmuyor; indeks listesi verilmeli.")
+            return self.distance_matrix
+        idx = np.asarray(indices, dtype=np.intp)
+        if self.distance_matrix is None:
+            return _pairwise_distances(self.positions[idx], self.positions[idx])
+        return self.distance_matrix[np.ix_(idx, idx)]
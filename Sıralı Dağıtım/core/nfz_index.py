@@ -0,0 +1,129 @@
+import math
+from collections import OrderedDict
+from typing import List, Tuple, Optional, Dict
+from core.no_fly_zone import NoFlyZone, SHAPELY_AVAILABLE
+
+if SHAPELY_AVAILABLE:
+    from shapely.geometry import LineString, Point
+    from shapely.strtree import STRtree
+
+NFZ_INDEX_CACHE_SIZE = 32
+
+def _bbox(coordinates: List[Tuple[float, float]]) -> Tuple[float, float, float, float]:
+    xs = [p[0] for p in coordinates]
+    ys = [p[1] for p in coordinates]
+    return min(xs), min(ys), max(xs), max(ys)
+
+class NFZIndex:
+    """
+    NFZ'ler için mekânsal indeks. Bir doğru parçası veya nokta için yalnızca sınırlayıcı kutusu
+    (bounding box) sorguya değen aday bölgeleri döndürür; sorgu maliyeti toplam bölge sayısına değil,
+    yerel bölge yoğunluğuna bağlıdır.
+    Shapely varsa `STRtree`, yoksa saf Python tekdüze ızgara (uniform grid) kullanılır.
+    """
+    def __init__(self, no_fly_zones: List[NoFlyZone], cell_size: Optional[float] = None):
+        self.no_fly_zones = list(no_fly_zones)
+        self.bboxes = [_bbox(nfz.coordinates) for nfz in self.no_fly_zones]
+
+        self._tree = None
+        if SHAPELY_AVAILABLE and self.no_fly_zones and all(nfz.polygon is not None for nfz in self.no_fly_zones):
+            self._geoms = [nfz.polygon for nfz in self.no_fly_zones]
+            self._tree = STRtree(self._geoms)
+            self._geom_pos = {id(g): i for i, g in enumerate(self._geoms)} # Shapely 1.x geometri döndürür
+            return
+
+        # Izgara hücre boyutu verilmezse ortalama bölge boyutu kullanılır
+        if cell_size is None:
+            extents = [max(b[2] - b[0], b[3] - b[1]) for b in self.bboxes]
+            cell_size = (sum(extents) / len(extents)) if extents else 1.0
+        self.cell_size = max(cell_size, 1e-6)
+        # Tüm bölgelerin kapsadığı alan; sorgular bu alanla kırpılır (boş hücrelerde dolaşılmaz)
+        self.extent = (min(b[0] for b in self.bboxes), min(b[1] for b in self.bboxes),
+                       max(b[2] for b in self.bboxes), max(b[3] for b in self.bboxes)) if self.bboxes else None
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        for i, (min_x, min_y, max_x, max_y) in enumerate(self.bboxes):
+            for cx in range(self._cell(min_x), self._cell(max_x) + 1):
+                for cy in range(self._cell(min_y), self._cell(max_y) + 1):
+                    self._grid.setdefault((cx, cy), []).append(i)
+
+    def _cell(self, v: float) -> int:
+        return math.floor(v / self.cell_size)
+
+    def _segment_cells(self, p1: Tuple[float, float], p2: Tuple[float, float]):
+        # Doğru parçasının geçtiği hücreler: her sütunda parçanın kapladığı y aralığı
+        (x0, y0), (x1, y1) = (p1, p2) if p1[0] <= p2[0] else (p2, p1)
+        min_cx, min_cy = self._cell(self.extent[0]), self._cell(self.extent[1])
+        max_cx, max_cy = self._cell(self.extent[2]), self._cell(self.extent[3])
+        for cx in range(max(self._cell(x0), min_cx), min(self._cell(x1), max_cx) + 1):
+            if x1 == x0:
+                ya, yb = y0, y1
+            else:
+                xa = max(x0, cx * self.cell_size)
+                xb = min(x1, (cx + 1) * self.cell_size)
+                slope = (y1 - y0) / (x1 - x0)
+                ya, yb = y0 + (xa - x0) * slope, y0 + (xb - x0) * slope
+            for cy in range(max(self._cell(min(ya, yb)), min_cy), min(self._cell(max(ya, yb)), max_cy) + 1):
+                yield cx, cy
+
+    def _tree_query(self, geom) -> List[int]:
+        hits = self._tree.query(geom)
+        return sorted(int(h) if not hasattr(h, "geom_type") else self._geom_pos[id(h)] for h in hits)
+
+    def candidates_for_segment(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> List[NoFlyZone]:
+        if self._tree is not None:
+            geom = LineString([p1, p2]) if p1 != p2 else Point(p1)
+            return [self.no_fly_zones[i] for i in self._tree_query(geom)]
+
+        seg_min_x, seg_max_x = min(p1[0], p2[0]), max(p1[0], p2[0])
+        seg_min_y, seg_max_y = min(p1[1], p2[1]), max(p1[1], p2[1])
+        if self.extent is None or seg_max_x < self.extent[0] or seg_min_x > self.extent[2] \
+                or seg_max_y < self.extent[1] or seg_min_y > self.extent[3]:
+            return []
+        seen = set()
+        result = []
+        for cell in self._segment_cells(p1, p2):
+            for i in self._grid.get(cell, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                min_x, min_y, max_x, max_y = self.bboxes[i]
+                if min_x <= seg_max_x and seg_min_x <= max_x and min_y <= seg_max_y and seg_min_y <= max_y:
+                    result.append(self.no_fly_zones[i])
+        return result
+
+    def candidates_for_point(self, point: Tuple[float, float]) -> List[NoFlyZone]:
+        if self._tree is not None:
+            return [self.no_fly_zones[i] for i in self._tree_query(Point(point))]
+        result = []
+        for i in self._grid.get((self._cell(point[0]), self._cell(point[1])), ()):
+            min_x, min_y, max_x, max_y = self.bboxes[i]
+            if min_x <= point[0] <= max_x and min_y <= point[1] <= max_y:
+                result.append(self.no_fly_zones[i])
+        return result
+
+    def zone_containing(self, point: Tuple[float, float]) -> Optional[NoFlyZone]:
+        for nfz in self.candidates_for_point(point):
+            if nfz.contains_point(point):
+                return nfz
+        return None
+
+    def segment_intersects_any(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> bool:
+        return any(nfz.intersects_segment(p1, p2) for nfz in self.candidates_for_segment(p1, p2))
+
+
+_nfz_index_cache: "OrderedDict[tuple, NFZIndex]" = OrderedDict()
+
+def get_nfz_index(active_nfzs: List[NoFlyZone]) -> NFZIndex:
+    # Aynı aktif NFZ kümesi için indeks bir kez kurulur. Anahtar nesne kimliğidir;
+    # önbellekteki indeks bölgelere referans tuttuğu için kimlikler yeniden kullanılamaz.
+    key = tuple(id(nfz) for nfz in active_nfzs)
+    index = _nfz_index_cache.get(key)
+    if index is not None:
+        _nfz_index_cache.move_to_end(key)
+        return index
+
+    index = NFZIndex(active_nfzs)
+    _nfz_index_cache[key] = index
+    if len(_nfz_index_cache) > NFZ_INDEX_CACHE_SIZE:
+        _nfz_index_cache.popitem(last=False)
+    return index
@@ -1,5 +1,7 @@
 from typing import List, Tuple, Optional
 from datetime import datetime, time, timedelta
+from utils.geometry_utils import segment_intersects_polygon_edges
+from utils.datetime_utils import parse_time_window, format_time_window, in_time_window
 
 try:
     from shapely.geometry import Polygon, Point
@@ -9,28 +11,29 @@ except ImportError:
     SHAPELY_AVAILABLE = False
 
 class NoFlyZone:
-    def __init__(self, id: int, coordinates: List[Tuple[float, float]], active_time: Optional[Tuple[str, str]] = None):
+    def __init__(self, id: int, coordinates: List[Tuple[float, float]], active_time: Optional[Tuple[str, str]] = None,
+                 active_seconds: Optional[Tuple[int, int]] = None):
         self.id = id
         self.coordinates = coordinates  # Köşe koordinatlarının listesi [(x1, y1), (x2, y2), ...]
-        self.active_time = active_time  # (başlangıç_saati_str, bitiş_saati_str)
 
         if SHAPELY_AVAILABLE:
             self.polygon = Polygon(self.coordinates)
         else:
             self.polygon = None # Shapely yoksa None
 
-    def is_active(self, current_time: datetime.time) -> bool:
+        # Aktif zaman aralığı bir kez tamsayı simülasyon saniyesine (ilk gün 00:00'dan itibaren) çevrilir; None = her zaman aktif
+        self.active_seconds: Optional[Tuple[int, int]] = active_seconds
+        if active_seconds is None and active_time is not None:
+            try:
+                self.active_seconds = parse_time_window(active_time)
+            except ValueError:
+                print(f"HATA: NFZ {self.id} için geçersiz zaman penceresi formatı: {active_time}")
+        if active_time is None and active_seconds is not None:
+            active_time = format_time_window(active_seconds)
+        self.active_time = active_time  # (başlangıç_saati_str, bitiş_saati_str), gösterim için
 
-        if self.active_time is None:
-            return True  
-
-        try:
-            active_start = datetime.strptime(self.active_time[0], "%H:%M").time()
-            active_end = datetime.strptime(self.active_time[1], "%H:%M").time()
-        except ValueError:
-            print(f"HATA: NFZ {self.id} için geçersiz zaman penceresi formatı: {self.active_time}")
-            return True 
-        return active_start <= current_time <= active_end
+    def is_active(self, sim_seconds: float) -> bool:
+        return in_time_window(self.active_seconds, sim_seconds)
 
     def contains_point(self, point: Tuple[float, float]) -> bool:
 
@@ -60,7 +63,8 @@ class NoFlyZone:
         # Bir doğru parçasının uçuşa yasak bölge ile kesişip kesişmediğini kontrol eder.
 
         if not SHAPELY_AVAILABLE or self.polygon is None:
-            return self.contains_point(p1) or self.contains_point(p2)
+            return self.contains_point(p1) or self.contains_point(p2) or \
+                   segment_intersects_polygon_edges(p1, p2, self.coordinates)
         else:
             from shapely.geometry import LineString
             line = LineString([p1, p2])
@@ -0,0 +1,164 @@
+import argparse
+import json
+import math
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+
+DISTRIBUTION_UNIFORM = "uniform"
+DISTRIBUTION_CLUSTERED = "clustered"
+
+CHUNK_SIZE = 10000 # Kayıtlar bu boyutta NumPy parçaları halinde üretilir
+
+# Her kayıt akışının kendi rastgele sayı akışı vardır; biri tüketilmeden diğeri aynı sonucu verir
+_STREAM_DRONES = 0
+_STREAM_DELIVERIES = 1
+_STREAM_NO_FLY_ZONES = 2
+
+@dataclass(frozen=True)
+class ScenarioConfig:
+    """
+    Sentetik senaryo parametreleri. Alan [0, area_size] x [0, area_size] karesidir; zamanlar
+    `load_data_from_dict`'in beklediği gibi simülasyon başlangıcına göre dakika ofsetidir.
+    Oranla verilen uzunluklar (cluster_spread, nfz_radius) alan kenarına göredir.
+    """
+    num_drones: int = 5
+    num_deliveries: int = 20
+    num_no_fly_zones: int = 3
+    area_size: float = 100.0
+    distribution: str = DISTRIBUTION_UNIFORM
+    num_clusters: int = 5
+    cluster_spread: float = 0.05
+    horizon_minutes: int = 120
+    window_width_minutes: Tuple[int, int] = (20, 60) # Küçük değerler = dar zaman pencereleri
+    max_weight_range: Tuple[float, float] = (2.0, 6.0)
+    battery_range: Tuple[int, int] = (8000, 20000)
+    speed_range: Tuple[float, float] = (5.0, 12.0)
+    weight_range: Tuple[float, float] = (0.5, 4.0)
+    nfz_radius: Tuple[float, float] = (0.04, 0.1)
+    nfz_vertices: Tuple[int, int] = (3, 8)
+    nfz_active_minutes: Tuple[int, int] = (30, 90) # NFZ'ler kademeli başlar, her biri bu kadar aktif kalır
+
+
+SCENARIO_PRESETS: Dict[str, ScenarioConfig] = {
+    "small": ScenarioConfig(),
+    "medium": ScenarioConfig(num_drones=50, num_deliveries=1000, num_no_fly_zones=20, area_size=1000.0,
+                             distribution=DISTRIBUTION_CLUSTERED, num_clusters=10),
+    "large": ScenarioConfig(num_drones=1000, num_deliveries=100000, num_no_fly_zones=200, area_size=10000.0,
+                            distribution=DISTRIBUTION_CLUSTERED, num_clusters=100, horizon_minutes=720),
+    "xlarge": ScenarioConfig(num_drones=10000, num_deliveries=1000000, num_no_fly_zones=1000, area_size=50000.0,
+                             distribution=DISTRIBUTION_CLUSTERED, num_clusters=1000, horizon_minutes=1440),
+}
+
+def _rng(seed: int, stream: int) -> np.random.Generator:
+    return np.random.default_rng([seed, stream])
+
+def _chunks(total: int) -> Iterator[Tuple[int, int]]:
+    for start in range(0, total, CHUNK_SIZE):
+        yield start, min(CHUNK_SIZE, total - start)
+
+def iter_drones(config: ScenarioConfig, seed: int = 0) -> Iterator[dict]:
+    rng = _rng(seed, _STREAM_DRONES)
+    for start, n in _chunks(config.num_drones):
+        max_weights = rng.uniform(*config.max_weight_range, n)
+        batteries = rng.integers(config.battery_range[0], config.battery_range[1], n, endpoint=True)
+        speeds = rng.uniform(*config.speed_range, n)
+        positions = rng.uniform(0.0, config.area_size, (n, 2))
+        for i in range(n):
+            yield {"id": start + i + 1, "max_weight": round(float(max_weights[i]), 1), "battery": int(batteries[i]),
+                   "speed": round(float(speeds[i]), 1),
+                   "start_pos": [round(float(positions[i, 0]), 2), round(float(positions[i, 1]), 2)]}
+
+def iter_deliveries(config: ScenarioConfig, seed: int = 0) -> Iterator[dict]:
+    rng = _rng(seed, _STREAM_DELIVERIES)
+    if config.distribution == DISTRIBUTION_CLUSTERED:
+        centers = rng.uniform(0.0, config.area_size, (max(config.num_clusters, 1), 2))
+    elif config.distribution != DISTRIBUTION_UNIFORM:
+        raise ValueError(f"Bilinmeyen dağılım: {config.distribution}")
+
+    min_width, max_width = config.window_width_minutes
+    for start, n in _chunks(config.num_deliveries):
+        if config.distribution == DISTRIBUTION_CLUSTERED:
+            offsets = rng.normal(0.0, config.cluster_spread * config.area_size, (n, 2))
+            positions = np.clip(centers[rng.integers(0, len(centers), n)] + offsets, 0.0, config.area_size)
+        else:
+            positions = rng.uniform(0.0, config.area_size, (n, 2))
+        weights = rng.uniform(*config.weight_range, n)
+        priorities = rng.integers(1, 5, n, endpoint=True)
+        widths = rng.integers(min_width, max_width, n, endpoint=True)
+        window_starts = (rng.random(n) * np.maximum(config.horizon_minutes - widths, 0)).astype(np.int64)
+        for i in range(n):
+            yield {"id": start + i + 1, "pos": [round(float(positions[i, 0]), 2), round(float(positions[i, 1]), 2)],
+                   "weight": round(float(weights[i]), 1), "priority": int(priorities[i]),
+                   "time_window": [int(window_starts[i]), int(window_starts[i] + widths[i])]}
+
+def iter_no_fly_zones(config: ScenarioConfig, seed: int = 0) -> Iterator[dict]:
+    # Rastgele yıldız biçimli (kendini kesmeyen) çokgenler; aktif zamanlar ufuk boyunca kademeli dağıtılır
+    rng = _rng(seed, _STREAM_NO_FLY_ZONES)
+    count = config.num_no_fly_zones
+    stagger = config.horizon_minutes / count if count else 0.0
+    for i in range(count):
+        center = rng.uniform(0.0, config.area_size, 2)
+        num_vertices = int(rng.integers(config.nfz_vertices[0], config.nfz_vertices[1], endpoint=True))
+        angles = np.sort(rng.uniform(0.0, 2 * math.pi, num_vertices))
+        radii = rng.uniform(*config.nfz_radius, num_vertices) * config.area_size
+        coordinates = [[round(float(center[0] + r * math.cos(a)), 2), round(float(center[1] + r * math.sin(a)), 2)]
+                       for a, r in zip(angles, radii)]
+        active_start = int(i * stagger)
+        duration = int(rng.integers(config.nfz_active_minutes[0], config.nfz_active_minutes[1], endpoint=True))
+        yield {"id": i + 1, "coordinates": coordinates, "active_time": [active_start, active_start + duration]}
+
+
+def stream_scenario(config: ScenarioConfig, seed: int = 0) -> dict:
+    """
+    `load_data_from_dict` ile aynı biçimde, ancak listeler yerine tek geçişlik üreteçler içeren senaryo
+    sözlüğü döndürür. Yükleyici kayıtları okudukça nesneleri kurar; ara kayıt listeleri bellekte tutulmaz. Aynı (config, seed) her zaman aynı senaryoyu üretir.
+    """
+    return {"drones": iter_drones(config, seed),
+            "deliveries": iter_deliveries(config, seed),
+            "no_fly_zones": iter_no_fly_zones(config, seed)}
+
+def generate_scenario(seed: int = 0, config: Optional[ScenarioConfig] = None) -> dict:
+    # Listeli (tekrar okunabilir) senaryo; küçük senaryolar ve toplu çalıştırıcı ("data.scenario_generator:generate_scenario") için
+    scenario = stream_scenario(config or SCENARIO_PRESETS["small"], seed)
+    return {key: list(records) for key, records in scenario.items()}
+
+def write_scenario_json(path: str, config: ScenarioConfig, seed: int = 0) -> None:
+    # Senaryoyu kayıt kayıt JSON dosyasına yazar; tüm senaryo hiçbir anda bellekte bulunmaz
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for k, (key, records) in enumerate(stream_scenario(config, seed).items()):
+            f.write(("," if k else "") + f'\n"{key}": [')
+            for i, record in enumerate(records):
+                f.write(("," if i else "") + "\n" + json.dumps(record))
+            f.write("\n]")
+        f.write("\n}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik senaryo üreteci")
+    parser.add_argument("--preset", choices=sorted(SCENARIO_PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=1, help="Ardışık seed'lerle üretilecek senaryo sayısı")
+    parser.add_argument("--output", default="scenario.json",
+                        help="Dosya yolu; --count > 1 ise '{seed}' içermeli (ör. senaryolar/s_{seed}.json)")
+    parser.add_argument("--drones", type=int, default=None)
+    parser.add_argument("--deliveries", type=int, default=None)
+    parser.add_argument("--no-fly-zones", type=int, default=None)
+    parser.add_argument("--distribution", choices=[DISTRIBUTION_UNIFORM, DISTRIBUTION_CLUSTERED], default=None)
+    args = parser.parse_args()
+
+    overrides = {"num_drones": args.drones, "num_deliveries": args.deliveries,
+                 "num_no_fly_zones": args.no_fly_zones, "distribution": args.distribution}
+    config = replace(SCENARIO_PRESETS[args.preset], **{k: v for k, v in overrides.items() if v is not None})
+    if args.count > 1 and "{seed}" not in args.output:
+        print("HATA: Birden çok senaryo için --output '{seed}' içermeli.")
+        return
+    for seed in range(args.seed, args.seed + args.count):
+        path = args.output.format(seed=seed)
+        write_scenario_json(path, config, seed)
+        print(f"Senaryo yazıldı: {path} ({config.num_drones} drone, {config.num_deliveries} teslimat, "
+              f"{config.num_no_fly_zones} NFZ)")
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,6 @@ if __name__ == "__main__":
             sim_manager.drones, # Simülasyon yöneticisindeki drone listesini kullan
             sim_manager.deliveries, # Simülasyon yöneticisindeki teslimat listesini kullan
             sim_manager.no_fly_zones,
-            results_custom["drone_paths_history"],
+            sim_manager.trajectory_sink, # Yollar sink'ten parça parça okunur
             sim_manager.BASE_STATION_POS
         )
\ No newline at end of file
@@ -0,0 +1,260 @@
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import random
+import time as pytime
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Union
+import numpy as np
+from simulation.simulation_manager import SimulationManager
+from simulation.event_simulation import EventDrivenSimulationManager
+from utils.sim_logging import quiet_logging
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+SAMPLE_SOURCE = "data.sample_data:SAMPLE_SIMULATION_DATA"
+PARQUET_BATCH_SIZE = 256 # Parquet'e kaç sonuç biriktirilip bir satır grubu olarak yazılır
+
+@dataclass(frozen=True)
+class ScenarioTask:
+    """
+    Tek bir çalıştırma: senaryo kaynağı ve seed. İşçi sürece yalnızca bu küçük nesne gönderilir;
+    senaryo verisi işçide yüklenir/üretilir (binlerce büyük sözlük ana süreçte tutulmaz).
+    `source` bir JSON dosya yolu ya da "modül:isim" biçimindedir; isim bir sözlükse doğrudan,
+    çağrılabilirse `isim(seed)` sonucu kullanılır.
+    """
+    run_index: int
+    source: str
+    seed: int
+    event_driven: bool = False
+    keep_paths: bool = False
+    tick_check: bool = False # Olay tabanlıda adım sınırlarında kaçırılan atama denetimi
+
+
+def load_scenario(source: str, seed: int) -> dict:
+    if source.endswith(".json"):
+        with open(source, encoding="utf-8") as f:
+            return json.load(f)
+    module_name, _, attr = source.partition(":")
+    obj = getattr(importlib.import_module(module_name), attr)
+    return obj(seed) if callable(obj) else obj
+
+
+def is_seeded_source(source: str) -> bool:
+    # Yalnızca çağrılabilir üreteçlerde seed senaryoyu değiştirir; JSON ve sözlük kaynakları her seed'de aynıdır
+    if source.endswith(".json"):
+        return False
+    module_name, _, attr = source.partition(":")
+    return callable(getattr(importlib.import_module(module_name), attr))
+
+
+def iter_scenario_sources(path: str) -> List[str]:
+    # Dizin verilirse içindeki tüm .json dosyaları (sıralı), dosya ya da "modül:isim" ise kendisi
+    if os.path.isdir(path):
+        return [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".json")]
+    return [path]
+
+
+def iter_tasks(sources: Iterable[str], seeds: Iterable[int], event_driven: bool = False,
+               keep_paths: bool = False, tick_check: bool = False) -> Iterator[ScenarioTask]:
+    # Üreteç kaynakları her seed ile bir kez, sabit kaynaklar (aynı sonucu vereceği için) yalnızca ilk seed ile çalıştırılır
+    seeds = list(seeds)
+    run_index = 0
+    for source in sources:
+        source_seeds = seeds
+        if len(seeds) > 1 and not is_seeded_source(source):
+            print(f"{source}: sabit senaryo, seed sonucu değiştirmez; {len(seeds)} yerine bir kez çalıştırılıyor.")
+            source_seeds = seeds[:1]
+        for seed in source_seeds:
+            yield ScenarioTask(run_index, source, seed, event_driven, keep_paths, tick_check)
+            run_index += 1
+
+
+def run_scenario(task: ScenarioTask) -> dict:
+    """
+    Bir senaryoyu grafik açmadan ve adım günlüğü basmadan çalıştırır, `run_simulation` sonuç sözlüğünü
+    senaryo/seed bilgisiyle döndürür. Hata olursa çalıştırma durmaz; sonuçta "error" alanı bulunur.
+    """
+    record = {"run_index": task.run_index, "scenario": task.source, "seed": task.seed}
+    try:
+        random.seed(task.seed)
+        np.random.seed(task.seed % 2**32)
+        data_dict = load_scenario(task.source, task.seed)
+        sim_manager = EventDrivenSimulationManager() if task.event_driven else SimulationManager()
+        if task.event_driven and task.tick_check:
+            sim_manager.enable_tick_check()
+        # Simülasyon günlükleri kapatılır (biçimlendirme maliyeti de olmaz); kalan print'ler devnull'a gider
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), quiet_logging():
+            sim_manager.load_data_from_dict(data_dict)
+            results = sim_manager.run_simulation()
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    if not task.keep_paths:
+        results.pop("drone_paths_history", None)
+    record.update(results)
+    return record
+
+
+def _jsonable(value):
+    # Sonuçlardaki tuple/NumPy değerleri ve tamsayı anahtarlar JSON'a uygun hale getirilir
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class JsonLinesWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(_jsonable(record), ensure_ascii=False) + "\n")
+        self._file.flush() # Gece boyu süren çalıştırmada yarıda kalsa da yazılanlar okunabilir
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Sonuçları PARQUET_BATCH_SIZE'lık satır grupları halinde yazar. Skaler olmayan alanlar
+    (teslimat durumları, drone durumları, yollar) JSON dizgisi olarak saklanır; şema sabit kalır.
+    """
+    SCALAR_COLUMNS = ("run_index", "scenario", "seed", "error", "completed_deliveries_count",
+                      "completed_deliveries_percent", "total_energy_consumption_mah",
+                      "avg_energy_consumption_per_delivery_mah", "total_flight_distance_m", "execution_time_sec",
+                      "events_processed", "assignment_solves")
+
+    def __init__(self, path: str):
+        self._path = path
+        self._writer = None
+        self._rows: List[dict] = []
+        self._schema = pa.schema([
+            ("run_index", pa.int64()), ("scenario", pa.string()), ("seed", pa.int64()), ("error", pa.string()),
+            ("completed_deliveries_count", pa.int64()), ("completed_deliveries_percent", pa.float64()),
+            ("total_energy_consumption_mah", pa.float64()), ("avg_energy_consumption_per_delivery_mah", pa.float64()),
+            ("total_flight_distance_m", pa.float64()), ("execution_time_sec", pa.float64()),
+            ("events_processed", pa.int64()), ("assignment_solves", pa.int64()), ("details", pa.string()),
+        ])
+
+    def write(self, record: dict):
+        row = {column: record.get(column) for column in self.SCALAR_COLUMNS}
+        details = {k: v for k, v in record.items() if k not in self.SCALAR_COLUMNS}
+        row["details"] = json.dumps(_jsonable(details), ensure_ascii=False)
+        self._rows.append(row)
+        if len(self._rows) >= PARQUET_BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._path, self._schema)
+        self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self._schema))
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        if self._writer is None: # Hiç sonuç yoksa boş tablo yazılır
+            self._writer = pq.ParquetWriter(self._path, self._schema)
+        self._writer.close()
+
+
+def open_results_writer(output_path: str) -> Union[JsonLinesWriter, ParquetWriter]:
+    if output_path.endswith(".parquet"):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet çıktısı için pyarrow kurulu olmalı; .jsonl uzantısı kullanılabilir.")
+        return ParquetWriter(output_path)
+    return JsonLinesWriter(output_path)
+
+
+def run_batch(tasks: Iterable[ScenarioTask], output_path: str, max_workers: Optional[int] = None,
+              max_in_flight: Optional[int] = None) -> dict:
+    """
+    Görevleri bir süreç havuzunda çalıştırır ve sonuçları bittikçe `output_path`'e (.jsonl ya da .parquet) yazar.
+    `tasks` tembel bir üreteç olabilir: aynı anda en fazla `max_in_flight` görev havuza verilir, böylece
+    binlerce çalıştırmalık bir plan bellekte tutulmaz. Sonuçlar bitiş sırasıyla yazılır (`run_index` ile sıralanabilir).
+    Returns: özet (çalıştırma, hata sayısı, süre)
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = 2 * max_workers
+
+    writer = open_results_writer(output_path)
+    start = pytime.perf_counter()
+    completed = 0
+    errors = 0
+    task_iter = iter(tasks)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = set()
+            while True:
+                for task in task_iter:
+                    in_flight.add(executor.submit(run_scenario, task))
+                    if len(in_flight) >= max_in_flight:
+                        break
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record = future.result()
+                    if "error" in record:
+                        errors += 1
+                        print(f"HATA: {record['scenario']} (seed {record['seed']}) çalıştırılamadı: {record['error']}")
+                    writer.write(record)
+                    completed += 1
+                    if completed % 100 == 0:
+                        print(f"{completed} çalıştırma tamamlandı ({pytime.perf_counter() - start:.1f}s)")
+    finally:
+        writer.close()
+
+    elapsed = pytime.perf_counter() - start
+    return {"runs": completed, "errors": errors, "elapsed_sec": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grafiksiz toplu simülasyon (Monte Carlo) çalıştırıcısı")
+    parser.add_argument("--scenarios", action="append", default=None,
+                        help="Senaryo JSON dosyası/dizini ya da 'modül:isim' (isim(seed) bir veri sözlüğü döndürmeli). "
+                             "Birden çok kez verilebilir; verilmezse örnek veri kullanılır.")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="Senaryo başına çalıştırma (seed) sayısı; yalnızca çağrılabilir üreteç kaynaklarında geçerlidir")
+    parser.add_argument("--base-seed", type=int, default=0)
+    parser.add_argument("--output", default="results.jsonl", help=".jsonl ya da .parquet")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--event-driven", action="store_true", help="Olay tabanlı simülasyonu kullan")
+    parser.add_argument("--keep-paths", action="store_true", help="drone_paths_history'yi sonuçlara dahil et")
+    parser.add_argument("--tick-check", action="store_true",
+                        help="Olay tabanlı simülasyonda her adım sınırında tick motorunun yapabileceği atamaları denetle "
+                             "(sonuçta tick_check_misses)")
+    args = parser.parse_args()
+    if args.output.endswith(".parquet") and not PYARROW_AVAILABLE:
+        print("HATA: Parquet çıktısı için pyarrow kurulu olmalı; .jsonl uzantısı kullanılabilir.")
+        return
+
+    sources = []
+    for path in args.scenarios or [SAMPLE_SOURCE]:
+        sources.extend(iter_scenario_sources(path))
+    seeds = range(args.base_seed, args.base_seed + args.runs)
+    tasks = iter_tasks(sources, seeds, args.event_driven or args.tick_check, args.keep_paths, args.tick_check)
+
+    summary = run_batch(tasks, args.output, args.workers)
+    print(f"{summary['runs']} çalıştırma ({summary['errors']} hata) {summary['elapsed_sec']:.1f}s içinde "
+          f"{args.output} dosyasına yazıldı.")
+
+if __name__ == "__main__":
+    main()
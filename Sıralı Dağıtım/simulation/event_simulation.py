@@ -0,0 +1,287 @@
+import heapq
+import math
+import time as pytime
+from typing import List, Dict, Tuple, Optional, Set
+import numpy as np
+from core.drone import Drone
+from core.delivery_point import DeliveryPoint
+from algorithms.csp import PathInfo, solve_assignment_csp
+from algorithms.candidate_generation import DEFAULT_MAX_CANDIDATES
+from simulation.simulation_manager import SimulationManager
+from utils.datetime_utils import format_sim_time
+from utils.sim_logging import get_logger
+
+# Olay türleri
+EVENT_ARRIVAL = "arrival"                    # Drone bir yol noktasına / teslimat noktasına ulaştı
+EVENT_CHARGE_COMPLETE = "charge_complete"    # Baz istasyonunda şarj bitti
+EVENT_TIME_WINDOW_OPEN = "time_window_open"  # Bekleyen bir teslimat bir drone için uygun hale geldi
+EVENT_NFZ_CHANGE = "nfz_change"              # Bir NFZ aktif/pasif oldu
+
+logger = get_logger("simulation")
+
+class EventDrivenSimulationManager(SimulationManager):
+    """
+    Sabit 60 saniyelik adım yerine ayrık olay (discrete-event) tabanlı simülasyon.
+    Olaylar bir heapq'da tutulur ve zaman doğrudan bir sonraki olaya atlar. Atama (CSP) yalnızca
+    bir drone boşa çıktığında ya da yeni bir teslimat/yol uygun hale geldiğinde yeniden çözülür;
+    varış zamanları adım aralığına yuvarlanmadan tam olarak hesaplanır. `enable_tick_check` ile olay motorunun
+    tick motorunun atama yapabileceği hiçbir anı kaçırmadığı denetlenir.
+    """
+    def __init__(self):
+        super().__init__()
+        self.events_processed = 0
+        self.assignment_solves = 0
+        self.tick_check_misses = 0
+        self._event_queue: List[Tuple[float, int, str, Optional[int]]] = []
+        self._event_seq = 0
+        self._charging_drones: Set[int] = set()
+        self._pending_legs: Dict[int, Tuple[Tuple[float, float], float, float]] = {}
+        self.tick_check = False
+        self.tick_check_misses = 0
+
+    def enable_tick_check(self):
+        # Olaylar arasında kalan her sabit adım sınırında (tick motorunun atama yaptığı anlar) CSP yeniden
+        # çözülür; o anda başlatılabilecek bir atama varsa olay kaçırılmış demektir ve HATA olarak kaydedilir.
+        self.tick_check = True
+
+    def _push_event(self, at_seconds: float, kind: str, drone_id: Optional[int] = None):
+        self._event_seq += 1
+        heapq.heappush(self._event_queue, (at_seconds, self._event_seq, kind, drone_id))
+
+    def _finish_task(self, drone: Drone, now: float):
+        # Görev bitti (başarılı ya da değil): yol kaydını kapat, drone'u serbest bırak, gerekirse şarja al.
+        self._extend_segment(drone)
+        self._close_segment(drone)
+        drone.complete_delivery(drone.current_pos)
+        self._pending_legs.pop(drone.id, None)
+
+        if drone.current_battery < drone.battery_capacity * self.DRONE_CHARGE_THRESHOLD_PERCENT \
+                and drone.current_pos == self.BASE_STATION_POS:
+            with self.profiler.phase("charging"):
+                charge_duration_seconds = drone.charge()
+            self._charging_drones.add(drone.id)
+            self._push_event(now + charge_duration_seconds, EVENT_CHARGE_COMPLETE, drone.id)
+
+    def _start_next_leg(self, drone: Drone, delivery: DeliveryPoint, now: float):
+        # Drone'un yolundaki bir sonraki noktaya varış olayını planlar.
+        target = drone.path[1] if len(drone.path) > 1 and drone.path[0] == drone.current_pos else drone.path[0]
+        distance = self.location_index.distance_between(drone.current_pos, target)
+        flight_time = drone.calculate_flight_time(distance)
+        energy = drone.calculate_battery_consumption(flight_time)
+
+        if drone.current_battery < energy:
+            delivery.status = "failed_battery_midway"; self.failed_deliveries_battery_midway += 1
+            self._finish_task(drone, now)
+            return
+
+        self._pending_legs[drone.id] = (target, distance, energy)
+        self._push_event(now + flight_time, EVENT_ARRIVAL, drone.id)
+
+    def _handle_arrival(self, drone: Drone, now: float):
+        delivery = self.deliveries_dict.get(drone.current_delivery_id)
+        target, distance, energy = self._pending_legs.pop(drone.id)
+
+        drone.current_battery -= energy; self.total_energy_consumed_mah += energy
+        self.total_flight_distance_meters += distance
+        drone.current_pos = target
+        self._extend_segment(drone)
+
+        if target == delivery.pos:
+            if delivery.is_within_time_window(now):
+                delivery.status = "completed"; self.total_deliveries_made += 1
+            else:
+                delivery.status = "failed_time_window"; self.failed_deliveries_time_window += 1
+            self._finish_task(drone, now)
+            return
+
+        while drone.path and drone.path[0] != target:
+            drone.path.pop(0)
+        if len(drone.path) < 2:
+            delivery.status = "failed_path_incomplete"; self.failed_deliveries_path_incomplete += 1
+            self._finish_task(drone, now)
+            return
+        self._start_next_leg(drone, delivery, now)
+
+    def _assign(self, now: float) -> int:
+        # Boş dronlar ve bekleyen teslimatlar için CSP'yi çözer, atanan görevleri başlatır.
+        assignable_drones = [d for d in self.drones if not d.is_busy and d.id not in self._charging_drones]
+        pending = [t for t in self.deliveries if t.status == "pending"]
+        if not assignable_drones or not pending:
+            return 0
+
+        self.assignment_solves += 1
+        early_arrivals: Dict[Tuple[int, int], float] = {}
+        assignments = self._solve_assignments(assignable_drones, pending, now, early_arrivals)
+        drones_by_id = {d.id: d for d in assignable_drones}
+        started = 0
+        for assignment in assignments:
+            drone = drones_by_id.get(assignment['drone_id'])
+            delivery = self.deliveries_dict.get(assignment['delivery_id'])
+            path_info: PathInfo = assignment['path_info']
+            if drone is None or delivery is None or drone.is_busy or delivery.status != "pending":
+                continue
+            min_required_battery = drone.battery_capacity * self.DRONE_MIN_CHARGE_FOR_NEW_TASK_PERCENT
+            if drone.current_battery < min_required_battery and drone.current_pos != self.BASE_STATION_POS:
+                continue
+
+            drone.assign_delivery(delivery.id, path_info.points)
+            self.profiler.count("assignments")
+            delivery.status = "assigned"
+            delivery.is_assigned = True
+            delivery.assigned_drone_id = drone.id
+            self._open_segment(drone)
+            self._start_next_leg(drone, delivery, now)
+            started += 1
+
+        self._schedule_next_eligibility(now, early_arrivals,
+                                        [d for d in assignable_drones if not d.is_busy],
+                                        [t for t in pending if t.status == "pending"])
+        return started
+
+    def _schedule_next_eligibility(self, now: float, early_arrivals: Dict[Tuple[int, int], float],
+                                   idle_drones: List[Drone], pending: List[DeliveryPoint]):
+        # Boşta kalan dronlar için atama sonucunu zamanla değiştirebilecek en erken an için tek bir olay kurar:
+        # - Erken varacağı için reddedilen aday çiftin pencereye yetiştiği kalkış saniyesi (yol bilgisinden, kesin).
+        # - k-en yakın ön elemede bir çiftin düz mesafeyle pencere bitişine yetişemez hale geldiği an: aday
+        #   kümesinden çıkan çiftin yerine daha uzak bir çift aday olur, onun erken varış saniyesi o çözümde bulunur.
+        # Boştaki dronların konumu ve bataryası olay dışında değişmez (şarj bitişi ayrı bir olaydır).
+        earliest = None
+        for (drone_id, delivery_id), eligible_at in early_arrivals.items():
+            if self.drones_dict[drone_id].is_busy or self.deliveries_dict[delivery_id].status != "pending":
+                continue
+            eligible_at = math.ceil(eligible_at)
+            if eligible_at > now and (earliest is None or eligible_at < earliest):
+                earliest = eligible_at
+        change_at = self._next_candidate_change(now, idle_drones, pending)
+        if change_at is not None and (earliest is None or change_at < earliest):
+            earliest = change_at
+        if earliest is not None:
+            self._push_event(float(earliest), EVENT_TIME_WINDOW_OPEN)
+
+    def _next_candidate_change(self, now: float, drones: List[Drone], deliveries: List[DeliveryPoint]) -> Optional[int]:
+        # generate_candidate_pairs'in düz mesafe elemesinin aynısı; ön eleme hiçbir çifti kesmiyorsa aday kümesi
+        # zamanla yalnızca daralır ve yeni bir çift açılmaz.
+        if not drones or (len(drones) <= DEFAULT_MAX_CANDIDATES and len(deliveries) <= DEFAULT_MAX_CANDIDATES):
+            return None
+        windowed = [t for t in deliveries if t.window_seconds is not None]
+        if not windowed:
+            return None
+        drone_pos = np.array([d.current_pos for d in drones], dtype=float).reshape(-1, 2)
+        delivery_pos = np.array([t.pos for t in windowed], dtype=float).reshape(-1, 2)
+        distances = np.hypot(np.subtract.outer(drone_pos[:, 0], delivery_pos[:, 0]),
+                             np.subtract.outer(drone_pos[:, 1], delivery_pos[:, 1]))
+        speeds = np.array([d.speed for d in drones], dtype=float)
+        with np.errstate(divide='ignore'):
+            travel_time = distances / speeds[:, None]
+        reachable = travel_time * np.array([d.consumption_rate for d in drones], dtype=float)[:, None] \
+            <= np.array([d.current_battery for d in drones], dtype=float)[:, None]
+        drop_at = np.array([t.window_seconds[1] for t in windowed], dtype=float)[None, :] - travel_time
+        drop_at = drop_at[reachable & (drop_at >= now)]
+        return math.floor(drop_at.min()) + 1 if drop_at.size else None
+
+    def _check_tick_boundaries(self, after: float, before: float):
+        # (after, before) aralığındaki adım sınırlarında, olaylar arasında değişmeyen boştaki dronlar ve bekleyen
+        # teslimatlarla atama yeniden çözülür. Tick motoru bu anlarda atama yapabiliyorsa olay motoru bir uygunluk
+        # değişikliğini kaçırmıştır.
+        step = self.SIMULATION_STEP_SECONDS
+        boundary = self._tick_origin + (math.floor((after - self._tick_origin) / step) + 1) * step
+        while boundary < before and boundary < self.simulation_end_seconds:
+            idle = [d for d in self.drones if not d.is_busy and d.id not in self._charging_drones]
+            pending = [t for t in self.deliveries if t.status == "pending"]
+            if not idle or not pending:
+                return
+            startable = 0
+            for assignment in solve_assignment_csp(idle, pending, self.no_fly_zones, boundary, self.BASE_STATION_POS,
+                                                   self.location_index, self.nfz_cache):
+                drone = self.drones_dict[assignment['drone_id']]
+                if drone.current_battery >= drone.battery_capacity * self.DRONE_MIN_CHARGE_FOR_NEW_TASK_PERCENT \
+                        or drone.current_pos == self.BASE_STATION_POS:
+                    startable += 1
+            if startable:
+                self.tick_check_misses += 1
+                logger.error("HATA: %s adım sınırında %d atama başlatılabilirdi; olay motoru bu anı kaçırdı.",
+                             format_sim_time(boundary), startable, extra={"event": "tick_check_miss"})
+            boundary += step
+
+    def _schedule_nfz_events(self):
+        # NFZ aktif/pasif geçişleri: aktif küme değişince mevcut yollar geçersiz/uygun hale gelebilir.
+        for nfz in self.no_fly_zones:
+            if nfz.active_seconds is None:
+                continue
+            active_start, active_end = nfz.active_seconds
+            self._push_event(active_start, EVENT_NFZ_CHANGE)
+            self._push_event(math.nextafter(active_end, math.inf), EVENT_NFZ_CHANGE) # Bitiş anı dahil aktiftir
+
+    def run_simulation(self):
+
+        start_sim_pytime = pytime.time()
+        self._reset_run_state()
+
+        self._event_queue = []
+        self._event_seq = 0
+        self._charging_drones = set()
+        self._pending_legs = {}
+        self.events_processed = 0
+        self.assignment_solves = 0
+        self.tick_check_misses = 0
+
+        logger.info("--- Olay Tabanlı Simülasyon Başlıyor (%s - %s) ---", self.SIMULATION_START_TIME_STR,
+                    self.SIMULATION_END_TIME_STR, extra={"event": "sim_start"})
+
+        self._schedule_nfz_events()
+        now = self.clock.now # Olay zamanları mutlak simülasyon saniyesidir
+        self.profiler.begin_tick(now)
+        with self.profiler.phase("assignment"):
+            self._assign(now)
+        self.profiler.end_tick()
+        self._tick_origin = now
+        last_time = now
+        all_processed = False
+
+        while self._event_queue:
+            if self._event_queue[0][0] > self.simulation_end_seconds:
+                break
+            now = self._event_queue[0][0]
+            if self.tick_check:
+                self._check_tick_boundaries(last_time, now)
+            last_time = now
+            self.clock.set(now) # Örnek zamanları ve günlük kayıtları olay zamanını kullanır
+            needs_assignment = False
+            self.profiler.begin_tick(now) # Olay tabanlı simülasyonda her tick aynı andaki olay grubudur
+
+            # Aynı andaki tüm olaylar işlenir, atama en fazla bir kez çözülür
+            while self._event_queue and self._event_queue[0][0] == now:
+                _, _, kind, drone_id = heapq.heappop(self._event_queue)
+                self.events_processed += 1
+                if kind == EVENT_ARRIVAL:
+                    drone = self.drones_dict[drone_id]
+                    with self.profiler.phase("movement"):
+                        self._handle_arrival(drone, now)
+                    if not drone.is_busy:
+                        needs_assignment = True
+                elif kind == EVENT_CHARGE_COMPLETE:
+                    self._charging_drones.discard(drone_id)
+                    needs_assignment = True
+                else: # EVENT_TIME_WINDOW_OPEN, EVENT_NFZ_CHANGE
+                    needs_assignment = True
+
+            if needs_assignment:
+                with self.profiler.phase("assignment"):
+                    self._assign(now)
+
+            with self.profiler.phase("bookkeeping"):
+                all_processed = all(d.status not in ["pending", "assigned"] for d in self.deliveries)
+            self.profiler.end_tick()
+            if all_processed:
+                logger.info("Tüm teslimatlar işlendi (tamamlandı veya başarısız oldu).")
+                break
+
+        if self.tick_check and not all_processed:
+            self._check_tick_boundaries(last_time, self.simulation_end_seconds)
+        logger.info("İşlenen olay sayısı: %d, Atama çözüm sayısı: %d", self.events_processed, self.assignment_solves)
+        results = self._build_results(start_sim_pytime)
+        results["events_processed"] = self.events_processed
+        results["assignment_solves"] = self.assignment_solves
+        if self.tick_check:
+            results["tick_check_misses"] = self.tick_check_misses
+        return results
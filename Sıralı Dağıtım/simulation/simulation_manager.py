@@ -1,12 +1,20 @@
 import time as pytime
-from datetime import datetime, time, timedelta
 from typing import List, Dict, Tuple, Optional
 from core.drone import Drone
 from core.delivery_point import DeliveryPoint
 from core.no_fly_zone import NoFlyZone
+from core.location_index import LocationIndex
 from algorithms.csp import solve_assignment_csp, PathInfo
+from algorithms.nfz_cache import NFZSegmentCache
+from algorithms.incremental_assignment import IncrementalAssignmentService
 from utils.geometry_utils import euclidean_distance
-from utils.datetime_utils import add_seconds_to_time, time_to_seconds, parse_time, seconds_to_time
+from utils.datetime_utils import parse_clock
+from utils.sim_clock import SimClock
+from utils.profiling import Profiler, BACKEND_CPROFILE
+from utils.sim_logging import get_logger, bind_sim_clock, DEBUG, INFO
+from simulation.trajectory_sink import TrajectorySink, InMemoryTrajectorySink, paths_history_from_sink
+
+logger = get_logger("simulation")
 
 class SimulationManager:
     """
@@ -14,7 +22,7 @@ class SimulationManager:
     """
     # --- Sabitler ---
     SIMULATION_START_TIME_STR = "00:00:00"
-    SIMULATION_END_TIME_STR = "23:59:59"
+    SIMULATION_END_TIME_STR = "23:59:59" # Saat 24'ü aşabilir (ör. "47:59:59" = iki günlük simülasyon)
     SIMULATION_STEP_SECONDS = 60  # saniye
     BASE_STATION_POS = (0.0, 0.0)
     DRONE_CHARGE_THRESHOLD_PERCENT = 0.20
@@ -26,6 +34,13 @@ class SimulationManager:
         self.deliveries: List[DeliveryPoint] = []
         self.no_fly_zones: List[NoFlyZone] = []
         self.deliveries_dict: Dict[int, DeliveryPoint] = {} # Hızlı erişim için
+        self.drones_dict: Dict[int, Drone] = {}
+        self.location_index: Optional[LocationIndex] = None # Önceden hesaplanmış mesafe matrisi
+        self.nfz_cache: Optional[NFZSegmentCache] = None # Aktivite dönemine göre NFZ yol önbelleği
+        # Verilirse her adımda sıfırdan CSP yerine artımlı (sıcak başlangıçlı) atama servisi kullanılır
+        self.assignment_service: Optional[IncrementalAssignmentService] = None
+        # Aşama süreleri / sayaçlar; varsayılan olarak kapalı (bkz. enable_profiling)
+        self.profiler = Profiler()
 
         # --- Performans Metrikleri ---
         self.total_deliveries_made = 0
@@ -40,10 +55,12 @@ class SimulationManager:
         self.failed_deliveries_path_incomplete = 0
 
         # --- Simülasyon Durumu ---
-        self.current_sim_time_obj: Optional[time] = None
-        self.simulation_end_time_obj: Optional[time] = None
-        self.drone_paths_history: Dict[int, List[List[Tuple[float, float]]]] = {}
-        self.active_drone_segments: Dict[int, List[Tuple[float, float]]] = {}
+        self.clock = SimClock(parse_clock(self.SIMULATION_START_TIME_STR)) # Float saniye; gece yarısında sarılmaz
+        self.simulation_end_seconds = parse_clock(self.SIMULATION_END_TIME_STR)
+        # Konum örnekleri sink'e akıtılır; bellekte yalnızca açık segmentlerin (numara, son nokta) bilgisi tutulur
+        self.trajectory_sink: TrajectorySink = InMemoryTrajectorySink()
+        self.active_drone_segments: Dict[int, Tuple[int, Tuple[float, float]]] = {}
+        self._next_segment_id = 0
 
     def load_data_from_dict(self, data_dict: dict):
         # verilerini yükler ve Drone, DeliveryPoint, NoFlyZone nesneleri oluşturur.
@@ -51,7 +68,8 @@ class SimulationManager:
         loaded_deliveries = []
         loaded_nfzs = []
 
-        sim_start_datetime_obj = datetime.strptime(self.SIMULATION_START_TIME_STR, "%H:%M:%S")
+        # Dakika ofsetleri doğrudan tamsayı simülasyon saniyesine çevrilir (gece yarısını aşabilir)
+        sim_start_seconds = int(parse_clock(self.SIMULATION_START_TIME_STR))
 
         default_consumption_rate = 1.0
         default_charge_time_per_mah = 0.03
@@ -72,18 +90,15 @@ class SimulationManager:
         for delivery_data in data_dict.get("deliveries", []):
             pos_list = delivery_data.get("pos", [0.0, 0.0])
             time_window_list = delivery_data.get("time_window")
+            window_seconds = None
             if time_window_list:
-                tw_start = sim_start_datetime_obj + timedelta(minutes=time_window_list[0])
-                tw_end = sim_start_datetime_obj + timedelta(minutes=time_window_list[1])
-                time_window = (tw_start.strftime("%H:%M"), tw_end.strftime("%H:%M"))
-            else:
-                time_window = None
+                window_seconds = (sim_start_seconds + time_window_list[0] * 60, sim_start_seconds + time_window_list[1] * 60)
             delivery = DeliveryPoint(
                 id=delivery_data["id"],
                 pos=tuple(pos_list),
                 weight=delivery_data["weight"],
                 priority=delivery_data["priority"],
-                time_window=time_window
+                window_seconds=window_seconds
             )
             loaded_deliveries.append(delivery)
 
@@ -92,17 +107,17 @@ class SimulationManager:
             coordinates_tuples = [tuple(coord) for coord in coordinates_list_of_lists]
             active_time_input = nfz_data.get("active_time")
             nfz_active_time_str_tuple = None
+            nfz_active_seconds = None
             if active_time_input and isinstance(active_time_input[0], int):
                 start_offset_minutes, end_offset_minutes = active_time_input
-                nfz_start_dt = sim_start_datetime_obj + timedelta(minutes=start_offset_minutes)
-                nfz_end_dt = sim_start_datetime_obj + timedelta(minutes=end_offset_minutes)
-                nfz_active_time_str_tuple = (nfz_start_dt.strftime("%H:%M"), nfz_end_dt.strftime("%H:%M"))
+                nfz_active_seconds = (sim_start_seconds + start_offset_minutes * 60, sim_start_seconds + end_offset_minutes * 60)
             elif active_time_input and isinstance(active_time_input[0], str):
                 nfz_active_time_str_tuple = tuple(active_time_input)
             nfz = NoFlyZone(
                 id=nfz_data["id"],
                 coordinates=coordinates_tuples,
-                active_time=nfz_active_time_str_tuple
+                active_time=nfz_active_time_str_tuple,
+                active_seconds=nfz_active_seconds
             )
             loaded_nfzs.append(nfz)
         
@@ -110,11 +125,56 @@ class SimulationManager:
         self.deliveries = loaded_deliveries
         self.no_fly_zones = loaded_nfzs
         self.deliveries_dict = {d.id: d for d in self.deliveries} 
+        self.drones_dict = {d.id: d for d in self.drones}
         for dr in self.drones:
             dr.current_battery = dr.battery_capacity
-
-    def run_simulation(self):
-
+        self.location_index = LocationIndex(self.BASE_STATION_POS, self.drones, self.deliveries)
+        self.nfz_cache = NFZSegmentCache(self.no_fly_zones)
+
+    def enable_incremental_assignment(self, max_time_in_seconds: Optional[float] = None, num_workers: int = 0):
+        # Yüklenen veriler için artımlı atama servisini oluşturur (load_data_from_dict sonrasında çağrılmalı).
+        self.assignment_service = IncrementalAssignmentService(
+            self.BASE_STATION_POS, max_time_in_seconds, num_workers,
+            location_index=self.location_index, nfz_cache=self.nfz_cache, profiler=self.profiler
+        )
+
+    def enable_profiling(self, trace: bool = True, profile_every: int = 0, profile_backend: str = BACKEND_CPROFILE,
+                         profile_dir: str = "profiles"):
+        # Aşama zamanlayıcılarını açar; profile_every > 0 ise her N. tick'in tam profili profile_dir'e yazılır.
+        self.profiler = Profiler(True, trace, profile_every, profile_backend, profile_dir)
+        if self.assignment_service is not None:
+            self.assignment_service.profiler = self.profiler
+
+    def _solve_assignments(self, drones: List[Drone], deliveries: List[DeliveryPoint], current_time: float,
+                           early_arrivals: Optional[Dict[Tuple[int, int], float]] = None) -> List[Dict]:
+        if self.assignment_service is not None:
+            return self.assignment_service.solve(drones, deliveries, self.no_fly_zones, current_time, early_arrivals)
+        return solve_assignment_csp(drones, deliveries, self.no_fly_zones, current_time, self.BASE_STATION_POS, self.location_index, self.nfz_cache,
+                                    profiler=self.profiler, early_arrivals=early_arrivals)
+
+    def set_trajectory_sink(self, sink: TrajectorySink):
+        # Yörünge örneklerinin yazılacağı hedef (ör. open_trajectory_sink("yollar.traj")). Bellek içi sink dışında
+        # sonuçlarda drone_paths_history yerine trajectory_path bulunur.
+        self.trajectory_sink = sink
+
+    def _open_segment(self, drone: Drone):
+        # Yeni görev yolu: drone'un mevcut konumu ilk örnek olarak yazılır
+        self._next_segment_id += 1
+        self.active_drone_segments[drone.id] = (self._next_segment_id, drone.current_pos)
+        self.trajectory_sink.append(drone.id, self._next_segment_id, self.clock.now, *drone.current_pos)
+
+    def _extend_segment(self, drone: Drone):
+        # Konum segmentin son noktasından farklıysa yeni örnek yazılır
+        segment = self.active_drone_segments.get(drone.id)
+        if segment is not None and segment[1] != drone.current_pos:
+            self.active_drone_segments[drone.id] = (segment[0], drone.current_pos)
+            self.trajectory_sink.append(drone.id, segment[0], self.clock.now, *drone.current_pos)
+
+    def _close_segment(self, drone: Drone):
+        self.active_drone_segments.pop(drone.id, None)
+
+    def _reset_run_state(self):
+        # Metrikleri, teslimat durumlarını ve yol geçmişini yeni bir çalıştırma için sıfırlar.
         self.total_deliveries_made = 0
         self.total_energy_consumed_mah = 0.0
         self.total_flight_distance_meters = 0.0
@@ -126,208 +186,213 @@ class SimulationManager:
         self.failed_deliveries_battery_mid_step = 0
         self.failed_deliveries_path_incomplete = 0
 
-        start_sim_pytime = pytime.time()
-        self.current_sim_time_obj = parse_time(self.SIMULATION_START_TIME_STR[:-3])
-        self.simulation_end_time_obj = parse_time(self.SIMULATION_END_TIME_STR[:-3])
+        self.clock = SimClock(parse_clock(self.SIMULATION_START_TIME_STR))
+        self.simulation_end_seconds = parse_clock(self.SIMULATION_END_TIME_STR)
+        bind_sim_clock(self.clock)
 
         for d_obj in self.deliveries:
             d_obj.status = "pending"
             d_obj.is_assigned = False
             d_obj.assigned_drone_id = None
 
-        self.drone_paths_history = {d.id: [] for d in self.drones}
+        self.trajectory_sink.reset()
         self.active_drone_segments = {}
+        self._next_segment_id = 0
+        self.profiler.reset()
 
-        simulation_running = True
-        print(f"\n--- Simülasyon Başlıyor ({self.SIMULATION_START_TIME_STR} - {self.SIMULATION_END_TIME_STR}) ---")
+    def run_simulation(self):
 
-        while simulation_running and time_to_seconds(self.current_sim_time_obj) < time_to_seconds(self.simulation_end_time_obj):
-            print(f"\n--- Simülasyon Zamanı: {self.current_sim_time_obj.strftime('%H:%M:%S')} ---")
+        start_sim_pytime = pytime.time()
+        self._reset_run_state()
 
-            # 1. Dinamik Atama (CSP)
-            assignable_drones = [d for d in self.drones if not d.is_busy]
-            current_pending_deliveries_for_csp = [d for d_id, d in self.deliveries_dict.items() if d.status == "pending"]
-
-            if assignable_drones and current_pending_deliveries_for_csp:
-                # CSP çözümüne base_station_pos'u ilet
-                assignments = solve_assignment_csp(assignable_drones, current_pending_deliveries_for_csp, self.no_fly_zones, self.current_sim_time_obj, self.BASE_STATION_POS)
-
-                if assignments:
-                    for assignment in assignments:
-                        drone = next((d for d in self.drones if d.id == assignment['drone_id']), None)
-                        delivery = self.deliveries_dict.get(assignment['delivery_id'])
-                        path_info: PathInfo = assignment['path_info'] # Tip ipucu ekle
-
-                        if drone and delivery and not drone.is_busy and delivery.status == "pending":
-                            min_required_battery = drone.battery_capacity * self.DRONE_MIN_CHARGE_FOR_NEW_TASK_PERCENT
-                            if drone.current_battery < min_required_battery and drone.current_pos != self.BASE_STATION_POS:
-                                print(f"Drone {drone.id} ({drone.current_battery:.2f}mAh) yeterli şarjı olmadığı için görev atlayabilir.")
-                                continue
+        simulation_running = True
+        logger.info("--- Simülasyon Başlıyor (%s - %s) ---", self.SIMULATION_START_TIME_STR, self.SIMULATION_END_TIME_STR,
+                    extra={"event": "sim_start"})
 
-                            print(f"Atama: Drone {drone.id} -> Teslimat {delivery.id} (Yol uzunluğu: {path_info.length:.2f}m)")
-                            drone.assign_delivery(delivery.id, path_info.points)
-                            delivery.status = "assigned"
-                            delivery.is_assigned = True
-                            delivery.assigned_drone_id = drone.id
+        while simulation_running and self.clock.now < self.simulation_end_seconds:
+            if logger.isEnabledFor(DEBUG):
+                logger.debug("--- Simülasyon Zamanı: %s ---", self.clock.format(), extra={"event": "tick"})
+            self.profiler.begin_tick(self.clock.now)
 
-                            self.active_drone_segments[drone.id] = [drone.current_pos]
+            # 1. Dinamik Atama (CSP)
+            with self.profiler.phase("assignment"):
+                assignable_drones = [d for d in self.drones if not d.is_busy]
+                current_pending_deliveries_for_csp = [d for d_id, d in self.deliveries_dict.items() if d.status == "pending"]
+
+                if assignable_drones and current_pending_deliveries_for_csp:
+                    # CSP çözümüne base_station_pos'u ilet
+                    assignments = self._solve_assignments(assignable_drones, current_pending_deliveries_for_csp, self.clock.now)
+
+                    if assignments:
+                        for assignment in assignments:
+                            drone = self.drones_dict.get(assignment['drone_id'])
+                            delivery = self.deliveries_dict.get(assignment['delivery_id'])
+                            path_info: PathInfo = assignment['path_info'] # Tip ipucu ekle
+
+                            if drone and delivery and not drone.is_busy and delivery.status == "pending":
+                                min_required_battery = drone.battery_capacity * self.DRONE_MIN_CHARGE_FOR_NEW_TASK_PERCENT
+                                if drone.current_battery < min_required_battery and drone.current_pos != self.BASE_STATION_POS:
+                                    logger.debug("Drone %d (%.2fmAh) yeterli şarjı olmadığı için görev atlayabilir.", drone.id, drone.current_battery)
+                                    continue
+
+                                if logger.isEnabledFor(INFO):
+                                    logger.info("Atama: Drone %d -> Teslimat %d (Yol uzunluğu: %.2fm)", drone.id, delivery.id, path_info.length,
+                                                extra={"event": "assignment", "drone_id": drone.id, "delivery_id": delivery.id})
+                                drone.assign_delivery(delivery.id, path_info.points)
+                                self.profiler.count("assignments")
+                                delivery.status = "assigned"
+                                delivery.is_assigned = True
+                                delivery.assigned_drone_id = drone.id
+
+                                self._open_segment(drone)
 
             # 2. Drone Hareketleri ve Teslimat Simülasyonu
-            for drone in self.drones:
-                if not drone.is_busy:
-                    if drone.id in self.active_drone_segments:
-                        if len(self.active_drone_segments[drone.id]) > 1:
-                            self.drone_paths_history.setdefault(drone.id, []).append(list(self.active_drone_segments[drone.id]))
-                        del self.active_drone_segments[drone.id]
-
-                    # Şarj mantığı
-                    if drone.current_battery < drone.battery_capacity * self.DRONE_CHARGE_THRESHOLD_PERCENT:
-                        if drone.current_pos != self.BASE_STATION_POS:
-                            pass
-                        else:
-                            charge_duration_seconds = drone.charge()
-                    continue
-
-                delivery = self.deliveries_dict.get(drone.current_delivery_id)
-                if not delivery:
-                    print(f"HATA: Drone {drone.id} için atanan teslimat ID {drone.current_delivery_id} bulunamadı. Görev iptal ediliyor.")
-                    if drone.id in self.active_drone_segments:
-                        if len(self.active_drone_segments[drone.id]) > 1: self.drone_paths_history.setdefault(drone.id, []).append(list(self.active_drone_segments[drone.id]))
-                        del self.active_drone_segments[drone.id]
-                    drone.complete_delivery(drone.current_pos)
-                    continue
-
-                target_waypoint = delivery.pos
-                if drone.path and drone.path[0] == drone.current_pos and len(drone.path) > 1: target_waypoint = drone.path[1]
-                elif drone.path and drone.path[0] != drone.current_pos : target_waypoint = drone.path[0]
-                elif not drone.path :
-                    print(f"HATA: Drone {drone.id} için path boş, görev {delivery.id}. Mevcut konumda bitiriliyor.")
-                    delivery.status = "failed_path_issue"; self.failed_deliveries_path_issue +=1
-                    if drone.id in self.active_drone_segments:
-                        if len(self.active_drone_segments[drone.id]) > 1: self.drone_paths_history.setdefault(drone.id, []).append(list(self.active_drone_segments[drone.id]))
-                        del self.active_drone_segments[drone.id]
-                    drone.complete_delivery(drone.current_pos)
-                    continue
-
-                distance_to_waypoint = euclidean_distance(drone.current_pos, target_waypoint)
-                if distance_to_waypoint < 0.01 : # Yol noktasından yeterince yakınsa
-                     if target_waypoint == delivery.pos: # Teslimat noktasına ulaşıldı
-                        actual_arrival_time = self.current_sim_time_obj # Mevcut simülasyon zamanı
-                        if not delivery.is_within_time_window(actual_arrival_time) and delivery.status not in ["failed_time_window", "completed"]:
-                             delivery.status = "failed_time_window"; self.failed_deliveries_time_window += 1
-
-                        delivery.status = "completed" if delivery.status not in ["failed_time_window"] else delivery.status
-                        if delivery.status == "completed": self.total_deliveries_made += 1
-
-                        if drone.id in self.active_drone_segments:
-                            if drone.current_pos not in self.active_drone_segments[drone.id]: self.active_drone_segments[drone.id].append(drone.current_pos)
-                            if len(self.active_drone_segments[drone.id]) > 1: self.drone_paths_history.setdefault(drone.id, []).append(list(self.active_drone_segments[drone.id]))
-                            del self.active_drone_segments[drone.id]
-                        drone.complete_delivery(delivery.pos)
-                        continue
-                     else: 
-                        if drone.path: drone.path.pop(0)
-                        if not drone.path and drone.current_pos != delivery.pos:
-                           
-                            delivery.status = "failed_path_incomplete"; self.failed_deliveries_path_incomplete += 1
-                            if drone.id in self.active_drone_segments:
-                                if drone.current_pos not in self.active_drone_segments[drone.id]: self.active_drone_segments[drone.id].append(drone.current_pos)
-                                if len(self.active_drone_segments[drone.id]) > 1: self.drone_paths_history.setdefault(drone.id, []).append(list(self.active_drone_segments[drone.id]))
-                                del self.active_drone_segments[drone.id]
-                            drone.complete_delivery(drone.current_pos)
-                            continue
-                        if drone.id in self.active_drone_segments and drone.current_pos not in self.active_drone_segments[drone.id]:
-                            self.active_drone_segments[drone.id].append(drone.current_pos)
+            with self.profiler.phase("movement"):
+                for drone in self.drones:
+                    if not drone.is_busy:
+                        self._close_segment(drone)
+
+                        # Şarj mantığı
+                        if drone.current_battery < drone.battery_capacity * self.DRONE_CHARGE_THRESHOLD_PERCENT:
+                            if drone.current_pos != self.BASE_STATION_POS:
+                                pass
+                            else:
+                                with self.profiler.phase("charging"):
+                                    charge_duration_seconds = drone.charge()
                         continue
 
+                    delivery = self.deliveries_dict.get(drone.current_delivery_id)
+                    if not delivery:
+                        logger.error("HATA: Drone %d için atanan teslimat ID %s bulunamadı. Görev iptal ediliyor.", drone.id, drone.current_delivery_id)
+                        self._close_segment(drone)
+                        drone.complete_delivery(drone.current_pos)
+                        continue
 
-                travel_distance_this_step = drone.speed * self.SIMULATION_STEP_SECONDS
-                moved_this_step = False
-                delivery_finalized_this_step = False
+                    target_waypoint = delivery.pos
+                    if drone.path and drone.path[0] == drone.current_pos and len(drone.path) > 1: target_waypoint = drone.path[1]
+                    elif drone.path and drone.path[0] != drone.current_pos : target_waypoint = drone.path[0]
+                    elif not drone.path :
+                        logger.error("HATA: Drone %d için path boş, görev %d. Mevcut konumda bitiriliyor.", drone.id, delivery.id)
+                        delivery.status = "failed_path_issue"; self.failed_deliveries_path_issue +=1
+                        self._close_segment(drone)
+                        drone.complete_delivery(drone.current_pos)
+                        continue
 
-                if travel_distance_this_step >= distance_to_waypoint:
-                    flight_time_to_waypoint = drone.calculate_flight_time(distance_to_waypoint)
-                    energy_consumed = drone.calculate_battery_consumption(flight_time_to_waypoint)
-                    if drone.current_battery >= energy_consumed:
-                        drone.current_battery -= energy_consumed; self.total_energy_consumed_mah += energy_consumed
-                        self.total_flight_distance_meters += distance_to_waypoint
-                        drone.current_pos = target_waypoint; moved_this_step = True
-                        if target_waypoint == delivery.pos: # Teslimat noktasına ulaşıldı
-                            actual_arrival_time = add_seconds_to_time(self.current_sim_time_obj, flight_time_to_waypoint)
+                    distance_to_waypoint = self.location_index.distance_between(drone.current_pos, target_waypoint)
+                    if distance_to_waypoint < 0.01 : # Yol noktasından yeterince yakınsa
+                         if target_waypoint == delivery.pos: # Teslimat noktasına ulaşıldı
+                            actual_arrival_time = self.clock.now # Mevcut simülasyon zamanı
                             if not delivery.is_within_time_window(actual_arrival_time) and delivery.status not in ["failed_time_window", "completed"]:
-                                delivery.status = "failed_time_window"; self.failed_deliveries_time_window += 1
+                                 delivery.status = "failed_time_window"; self.failed_deliveries_time_window += 1
 
-                            if delivery.status in ["assigned", "pending"]: # Sadece zaten tamamlanmamışsa tamamla
-                                delivery.status = "completed" if delivery.status not in ["failed_time_window"] else delivery.status
+                            delivery.status = "completed" if delivery.status not in ["failed_time_window"] else delivery.status
                             if delivery.status == "completed": self.total_deliveries_made += 1
 
-                            drone.complete_delivery(delivery.pos); delivery_finalized_this_step = True
-                        else: 
+                            self._extend_segment(drone)
+                            self._close_segment(drone)
+                            drone.complete_delivery(delivery.pos)
+                            continue
+                         else: 
                             if drone.path: drone.path.pop(0)
                             if not drone.path and drone.current_pos != delivery.pos:
+                           
                                 delivery.status = "failed_path_incomplete"; self.failed_deliveries_path_incomplete += 1
-                                drone.complete_delivery(drone.current_pos); delivery_finalized_this_step = True
-                    else: 
-                        delivery.status = "failed_battery_midway"; self.failed_deliveries_battery_midway +=1
-                        drone.complete_delivery(drone.current_pos); delivery_finalized_this_step = True
-                else:
-                    energy_consumed_this_step = drone.calculate_battery_consumption(self.SIMULATION_STEP_SECONDS)
-                    if drone.current_battery >= energy_consumed_this_step:
-                        drone.current_battery -= energy_consumed_this_step; self.total_energy_consumed_mah += energy_consumed_this_step
-                        self.total_flight_distance_meters += travel_distance_this_step
-                        dir_x = target_waypoint[0] - drone.current_pos[0]; dir_y = target_waypoint[1] - drone.current_pos[1]
-                        norm_x = dir_x / distance_to_waypoint if distance_to_waypoint > 0 else 0
-                        norm_y = dir_y / distance_to_waypoint if distance_to_waypoint > 0 else 0
-                        drone.current_pos = (drone.current_pos[0] + norm_x * travel_distance_this_step, drone.current_pos[1] + norm_y * travel_distance_this_step)
-                        moved_this_step = True
-                    else:
-                        delivery.status = "failed_battery_mid_step"; self.failed_deliveries_battery_mid_step +=1
-                        drone.complete_delivery(drone.current_pos); delivery_finalized_this_step = True
+                                self._extend_segment(drone)
+                                self._close_segment(drone)
+                                drone.complete_delivery(drone.current_pos)
+                                continue
+                            self._extend_segment(drone)
+                            continue
 
-                if moved_this_step and drone.id in self.active_drone_segments:
-                     self.active_drone_segments[drone.id].append(drone.current_pos)
 
-                if delivery_finalized_this_step and drone.id in self.active_drone_segments:
-                    if drone.current_pos not in self.active_drone_segments[drone.id]:
-                        self.active_drone_segments[drone.id].append(drone.current_pos)
+                    travel_distance_this_step = drone.speed * self.SIMULATION_STEP_SECONDS
+                    moved_this_step = False
+                    delivery_finalized_this_step = False
+
+                    if travel_distance_this_step >= distance_to_waypoint:
+                        flight_time_to_waypoint = drone.calculate_flight_time(distance_to_waypoint)
+                        energy_consumed = drone.calculate_battery_consumption(flight_time_to_waypoint)
+                        if drone.current_battery >= energy_consumed:
+                            drone.current_battery -= energy_consumed; self.total_energy_consumed_mah += energy_consumed
+                            self.total_flight_distance_meters += distance_to_waypoint
+                            drone.current_pos = target_waypoint; moved_this_step = True
+                            if target_waypoint == delivery.pos: # Teslimat noktasına ulaşıldı
+                                actual_arrival_time = self.clock.now + flight_time_to_waypoint
+                                if not delivery.is_within_time_window(actual_arrival_time) and delivery.status not in ["failed_time_window", "completed"]:
+                                    delivery.status = "failed_time_window"; self.failed_deliveries_time_window += 1
+
+                                if delivery.status in ["assigned", "pending"]: # Sadece zaten tamamlanmamışsa tamamla
+                                    delivery.status = "completed" if delivery.status not in ["failed_time_window"] else delivery.status
+                                if delivery.status == "completed": self.total_deliveries_made += 1
+
+                                drone.complete_delivery(delivery.pos); delivery_finalized_this_step = True
+                            else: 
+                                if drone.path: drone.path.pop(0)
+                                if not drone.path and drone.current_pos != delivery.pos:
+                                    delivery.status = "failed_path_incomplete"; self.failed_deliveries_path_incomplete += 1
+                                    drone.complete_delivery(drone.current_pos); delivery_finalized_this_step = True
+                        else: 
+                            delivery.status = "failed_battery_midway"; self.failed_deliveries_battery_midway +=1
+                            drone.complete_delivery(drone.current_pos); delivery_finalized_this_step = True
+                    else:
+                        energy_consumed_this_step = drone.calculate_battery_consumption(self.SIMULATION_STEP_SECONDS)
+                        if drone.current_battery >= energy_consumed_this_step:
+                            drone.current_battery -= energy_consumed_this_step; self.total_energy_consumed_mah += energy_consumed_this_step
+                            self.total_flight_distance_meters += travel_distance_this_step
+                            dir_x = target_waypoint[0] - drone.current_pos[0]; dir_y = target_waypoint[1] - drone.current_pos[1]
+                            norm_x = dir_x / distance_to_waypoint if distance_to_waypoint > 0 else 0
+                            norm_y = dir_y / distance_to_waypoint if distance_to_waypoint > 0 else 0
+                            drone.current_pos = (drone.current_pos[0] + norm_x * travel_distance_this_step, drone.current_pos[1] + norm_y * travel_distance_this_step)
+                            moved_this_step = True
+                        else:
+                            delivery.status = "failed_battery_mid_step"; self.failed_deliveries_battery_mid_step +=1
+                            drone.complete_delivery(drone.current_pos); delivery_finalized_this_step = True
+
+                    if moved_this_step or delivery_finalized_this_step:
+                        self._extend_segment(drone)
 
-                    if len(self.active_drone_segments[drone.id]) > 1:
-                        self.drone_paths_history.setdefault(drone.id, []).append(list(self.active_drone_segments[drone.id]))
-                    del self.active_drone_segments[drone.id]
+                    if delivery_finalized_this_step:
+                        self._close_segment(drone)
 
-            self.current_sim_time_obj = add_seconds_to_time(self.current_sim_time_obj, float(self.SIMULATION_STEP_SECONDS))
-            if all(d.status not in ["pending", "assigned"] for d in self.deliveries_dict.values()):
-                print("Tüm teslimatlar işlendi (tamamlandı veya başarısız oldu).")
-                simulation_running = False
+            with self.profiler.phase("bookkeeping"):
+                self.clock.advance(self.SIMULATION_STEP_SECONDS)
+                if all(d.status not in ["pending", "assigned"] for d in self.deliveries_dict.values()):
+                    logger.info("Tüm teslimatlar işlendi (tamamlandı veya başarısız oldu).")
+                    simulation_running = False
+            self.profiler.end_tick()
 
         # Simülasyon Sonu
+        return self._build_results(start_sim_pytime)
+
+    def _build_results(self, start_sim_pytime: float) -> dict:
+        # Performans metriklerini yazdırır ve sonuç sözlüğünü oluşturur.
         end_sim_pytime = pytime.time()
         execution_time_seconds = end_sim_pytime - start_sim_pytime
 
-        print(f"\n--- Simülasyon Bitti ---")
-        print(f"Simülasyon Süresi (oyun içi): {self.current_sim_time_obj.strftime('%H:%M:%S')}")
-        print(f"Gerçek Çalışma Süresi: {execution_time_seconds:.2f} saniye")
+        logger.info("--- Simülasyon Bitti ---", extra={"event": "sim_end"})
+        logger.info("Simülasyon Süresi (oyun içi): %s", self.clock.format())
+        logger.info("Gerçek Çalışma Süresi: %.2f saniye", execution_time_seconds)
 
         num_total_deliveries = len(self.deliveries)
         completed_percentage = (self.total_deliveries_made / num_total_deliveries) * 100 if num_total_deliveries > 0 else 0
         avg_energy_per_delivery = (self.total_energy_consumed_mah / self.total_deliveries_made) if self.total_deliveries_made > 0 else 0
 
-        print(f"\n--- Performans Metrikleri ---")
-        print(f"Toplam Teslimat Sayısı: {num_total_deliveries}")
-        print(f"Başarıyla Tamamlanan Teslimat: {self.total_deliveries_made}")
-        print(f"Tamamlanan Teslimat Yüzdesi: {completed_percentage:.2f}%")
-        print(f"Toplam Enerji Tüketimi: {self.total_energy_consumed_mah:.2f} mAh")
-        if self.total_deliveries_made > 0 : print(f"Teslimat Başına Ortalama Enerji: {avg_energy_per_delivery:.2f} mAh")
-        print(f"Toplam Uçuş Mesafesi: {self.total_flight_distance_meters:.2f} m")
+        logger.info("--- Performans Metrikleri ---")
+        logger.info("Toplam Teslimat Sayısı: %d", num_total_deliveries)
+        logger.info("Başarıyla Tamamlanan Teslimat: %d", self.total_deliveries_made)
+        logger.info("Tamamlanan Teslimat Yüzdesi: %.2f%%", completed_percentage)
+        logger.info("Toplam Enerji Tüketimi: %.2f mAh", self.total_energy_consumed_mah)
+        if self.total_deliveries_made > 0 : logger.info("Teslimat Başına Ortalama Enerji: %.2f mAh", avg_energy_per_delivery)
+        logger.info("Toplam Uçuş Mesafesi: %.2f m", self.total_flight_distance_meters)
 
         failed_count = num_total_deliveries - self.total_deliveries_made
-        print(f"Başarısız/İptal Edilen Teslimat: {failed_count}")
-        if failed_count > 0:
-            print(f"  - Zaman Penceresi İhlaliyle Başarısız: {self.failed_deliveries_time_window}")
+        logger.info("Başarısız/İptal Edilen Teslimat: %d", failed_count)
+        if failed_count > 0 and logger.isEnabledFor(INFO):
+            logger.info("  - Zaman Penceresi İhlaliyle Başarısız: %d", self.failed_deliveries_time_window)
             status_counts = {}
             for d_obj in self.deliveries_dict.values():
                 status_counts[d_obj.status] = status_counts.get(d_obj.status, 0) + 1
-            print(f"  - Teslimat Durumları Dağılımı: {status_counts}")
+            logger.info("  - Teslimat Durumları Dağılımı: %s", status_counts)
 
 
         results = {
@@ -339,6 +404,13 @@ class SimulationManager:
             "execution_time_sec": execution_time_seconds,
             "final_drone_states": [str(d) for d in self.drones],
             "delivery_statuses": {d.id: d.status for d in self.deliveries_dict.values()},
-            "drone_paths_history": self.drone_paths_history
         }
+        self.trajectory_sink.flush()
+        if isinstance(self.trajectory_sink, InMemoryTrajectorySink):
+            results["drone_paths_history"] = paths_history_from_sink(self.trajectory_sink)
+        else:
+            results["trajectory_path"] = self.trajectory_sink.path
+        if self.profiler.enabled:
+            self.profiler.log_summary()
+            results["profile"] = self.profiler.summary()
         return results
\ No newline at end of file
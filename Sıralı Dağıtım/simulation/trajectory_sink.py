@@ -0,0 +1,286 @@
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Tek bir konum örneği. `segment` simülasyon boyunca artan görev yolu numarasıdır; aynı segmentin
+# örnekleri sırayla birleştirildiğinde drone'un o görevdeki yolu elde edilir.
+SAMPLE_DTYPE = np.dtype([("drone_id", "<i4"), ("segment", "<i4"), ("sim_time", "<f8"), ("x", "<f8"), ("y", "<f8")])
+
+CHUNK_SIZE = 65536 # Okuma/yazma parça boyutu (örnek sayısı)
+
+
+class TrajectorySink:
+    """
+    Simülasyonun konum örneklerini yazdığı hedef. Simülasyon `append` ile örnekleri akıtır, çalıştırma sonunda
+    `flush` çağırır; `iter_samples` yazılanları SAMPLE_DTYPE'lı NumPy parçaları halinde tekrar okur.
+    """
+    def append(self, drone_id: int, segment: int, sim_time: float, x: float, y: float) -> None:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        # Yeni bir çalıştırma için önceki örnekleri siler
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def iter_samples(self, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+        raise NotImplementedError
+
+
+class InMemoryTrajectorySink(TrajectorySink):
+    # Örnekler tuple listeleri yerine sıkışık `array` sütunlarında tutulur (örnek başına 28 bayt)
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._drone_ids = array("i")
+        self._segments = array("i")
+        self._times = array("d")
+        self._xs = array("d")
+        self._ys = array("d")
+
+    def __len__(self):
+        return len(self._times)
+
+    def append(self, drone_id: int, segment: int, sim_time: float, x: float, y: float) -> None:
+        self._drone_ids.append(drone_id)
+        self._segments.append(segment)
+        self._times.append(sim_time)
+        self._xs.append(x)
+        self._ys.append(y)
+
+    def iter_samples(self, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+        columns = (self._drone_ids, self._segments, self._times, self._xs, self._ys)
+        for start in range(0, len(self), chunk_size):
+            chunk = np.empty(min(chunk_size, len(self) - start), dtype=SAMPLE_DTYPE)
+            for name, column in zip(SAMPLE_DTYPE.names, columns):
+                chunk[name] = np.frombuffer(column, dtype=SAMPLE_DTYPE[name])[start:start + len(chunk)]
+            yield chunk
+
+
+class BinaryTrajectorySink(TrajectorySink):
+    """
+    Örnekleri başlıksız, yalnızca sona eklenen ham SAMPLE_DTYPE kayıtları olarak dosyaya yazar.
+    Örnekler `buffer_size`'lık bir NumPy tamponunda biriktirilip tek `write` ile diske aktarılır.
+    """
+    def __init__(self, path: str, buffer_size: int = CHUNK_SIZE):
+        self.path = path
+        self._buffer = np.empty(buffer_size, dtype=SAMPLE_DTYPE)
+        self._buffered = 0
+        self._file = open(path, "wb")
+
+    def reset(self) -> None:
+        self._buffered = 0
+        if self._file.closed:
+            self._file = open(self.path, "wb")
+        self._file.seek(0)
+        self._file.truncate()
+
+    def append(self, drone_id: int, segment: int, sim_time: float, x: float, y: float) -> None:
+        if self._file.closed:
+            raise ValueError(f"Kapatılmış yörünge dosyasına yazılamaz: {self.path}")
+        self._buffer[self._buffered] = (drone_id, segment, sim_time, x, y)
+        self._buffered += 1
+        if self._buffered == len(self._buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file.closed:
+            return
+        if self._buffered:
+            self._file.write(self._buffer[:self._buffered].tobytes())
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def iter_samples(self, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+        self.flush()
+        return read_trajectory(self.path, chunk_size)
+
+
+class MemmapTrajectorySink(TrajectorySink):
+    """
+    Örnekleri bellek eşlemeli (np.memmap) bir diziye yazar; dizi doldukça dosya iki katına büyütülür.
+    Çalıştırma sürerken `samples` üzerinden kopyalamadan okunabilir. `close` dosyayı dolu kısma kırpar;
+    kapatılmış dosyanın biçimi BinaryTrajectorySink ile aynıdır.
+    """
+    def __init__(self, path: str, initial_capacity: int = CHUNK_SIZE):
+        self.path = path
+        self.initial_capacity = initial_capacity
+        self._array: Optional[np.memmap] = None
+        self.reset()
+
+    def _map(self, capacity: int) -> None:
+        if self._array is not None:
+            self._array.flush()
+            self._array = None # Eski eşleme bırakılmadan dosya boyutu değiştirilmez
+        with open(self.path, "ab") as f:
+            f.truncate(capacity * SAMPLE_DTYPE.itemsize)
+        self._array = np.memmap(self.path, dtype=SAMPLE_DTYPE, mode="r+", shape=(capacity,))
+
+    def reset(self) -> None:
+        self._count = 0
+        self._array = None
+        open(self.path, "wb").close()
+        self._map(self.initial_capacity)
+
+    @property
+    def samples(self) -> np.ndarray:
+        return self._array[:self._count]
+
+    def append(self, drone_id: int, segment: int, sim_time: float, x: float, y: float) -> None:
+        if self._array is None:
+            raise ValueError(f"Kapatılmış yörünge dosyasına yazılamaz: {self.path}")
+        if self._count == len(self._array):
+            self._map(2 * len(self._array))
+        self._array[self._count] = (drone_id, segment, sim_time, x, y)
+        self._count += 1
+
+    def flush(self) -> None:
+        if self._array is not None:
+            self._array.flush()
+
+    def close(self) -> None:
+        if self._array is None:
+            return
+        self._array.flush()
+        self._array = None
+        with open(self.path, "ab") as f:
+            f.truncate(self._count * SAMPLE_DTYPE.itemsize)
+
+    def iter_samples(self, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+        if self._array is None:
+            yield from read_trajectory(self.path, chunk_size)
+            return
+        for start in range(0, self._count, chunk_size):
+            yield np.array(self._array[start:min(start + chunk_size, self._count)])
+
+
+class ParquetTrajectorySink(TrajectorySink):
+    # Örnekler `batch_size`'lık satır grupları halinde yazılır. Parquet alt bilgisi kapanışta yazıldığından dosya
+    # yalnızca kapatıldıktan sonra okunabilir: iter_samples sink'i kapatır, sonraki append hata verir (reset yeniden açar)
+    def __init__(self, path: str, batch_size: int = CHUNK_SIZE):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet yörünge çıktısı için pyarrow gerekli.")
+        self.path = path
+        self._schema = pa.schema([(name, pa.from_numpy_dtype(SAMPLE_DTYPE[name])) for name in SAMPLE_DTYPE.names])
+        self._buffer = np.empty(batch_size, dtype=SAMPLE_DTYPE)
+        self._buffered = 0
+        self._writer = None
+        self.reset()
+
+    def reset(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._buffered = 0
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+
+    def append(self, drone_id: int, segment: int, sim_time: float, x: float, y: float) -> None:
+        if self._writer is None:
+            raise ValueError(f"Kapatılmış yörünge dosyasına yazılamaz: {self.path}")
+        self._buffer[self._buffered] = (drone_id, segment, sim_time, x, y)
+        self._buffered += 1
+        if self._buffered == len(self._buffer):
+            self._write_batch()
+
+    def _write_batch(self) -> None:
+        if self._buffered and self._writer is not None:
+            chunk = self._buffer[:self._buffered]
+            self._writer.write_table(pa.table({name: chunk[name] for name in SAMPLE_DTYPE.names}, schema=self._schema))
+            self._buffered = 0
+
+    def flush(self) -> None:
+        self._write_batch()
+
+    def close(self) -> None:
+        self._write_batch()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def iter_samples(self, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+        self.close()
+        return read_trajectory(self.path, chunk_size)
+
+
+def open_trajectory_sink(path: Optional[str] = None, memmap: bool = False) -> TrajectorySink:
+    # Yol verilmezse bellekte; .parquet uzantısı Parquet, diğerleri ham ikili (memmap=True ise bellek eşlemeli)
+    if path is None:
+        return InMemoryTrajectorySink()
+    if path.endswith(".parquet"):
+        return ParquetTrajectorySink(path)
+    return MemmapTrajectorySink(path) if memmap else BinaryTrajectorySink(path)
+
+def read_trajectory(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+    # Yazılmış bir yörünge dosyasını tamamını belleğe almadan SAMPLE_DTYPE parçaları halinde okur
+    if path.endswith(".parquet"):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet yörünge dosyasını okumak için pyarrow gerekli.")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            chunk = np.empty(batch.num_rows, dtype=SAMPLE_DTYPE)
+            for name in SAMPLE_DTYPE.names:
+                chunk[name] = batch.column(name).to_numpy()
+            yield chunk
+        return
+    if os.path.getsize(path) == 0:
+        return
+    samples = np.memmap(path, dtype=SAMPLE_DTYPE, mode="r")
+    for start in range(0, len(samples), chunk_size):
+        yield np.array(samples[start:start + chunk_size])
+
+def iter_segment_pieces(chunks: Iterable[np.ndarray]) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Örnek parçalarından (drone_id, segment, N x 2 nokta) yol parçaları üretir. Bir segment birden çok
+    parçaya bölünebilir; her parça bir öncekinin son noktasıyla başlar, böylece çizimde boşluk kalmaz.
+    Bellekte yalnızca açık segmentlerin son noktaları tutulur.
+    """
+    last_points: Dict[int, Tuple[int, np.ndarray]] = {}
+    open_segments: Dict[int, int] = {} # drone_id -> açık (en son) segmenti
+    for chunk in chunks:
+        if not len(chunk):
+            continue
+        order = np.argsort(chunk["segment"], kind="stable")
+        ordered = chunk[order]
+        boundaries = np.flatnonzero(np.diff(ordered["segment"])) + 1
+        for group in np.split(ordered, boundaries):
+            segment = int(group["segment"][0])
+            drone_id = int(group["drone_id"][0])
+            current = open_segments.get(drone_id)
+            if current is not None and current != segment:
+                last_points.pop(current, None) # Drone yeni görevine geçti: önceki segment bir daha devam etmez
+            open_segments[drone_id] = segment
+            points = np.column_stack((group["x"], group["y"]))
+            previous = last_points.get(segment)
+            if previous is not None:
+                points = np.vstack((previous[1], points))
+            last_points[segment] = (drone_id, points[-1])
+            if len(points) > 1:
+                yield drone_id, segment, points
+
+def paths_history_from_sink(sink: TrajectorySink) -> Dict[int, List[List[Tuple[float, float]]]]:
+    # Eski `drone_paths_history` biçimi: drone_id -> segment listesi (tek noktalı segmentler atlanır)
+    segments: Dict[int, Tuple[int, List[Tuple[float, float]]]] = {}
+    for chunk in sink.iter_samples():
+        for drone_id, segment, _, x, y in chunk.tolist():
+            segments.setdefault(segment, (drone_id, []))[1].append((x, y))
+    history: Dict[int, List[List[Tuple[float, float]]]] = {}
+    for segment in sorted(segments):
+        drone_id, points = segments[segment]
+        if len(points) > 1:
+            history.setdefault(drone_id, []).append(points)
+    return history
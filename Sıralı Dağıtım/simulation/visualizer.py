@@ -1,15 +1,31 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator, Sequence, Union
 from core.drone import Drone
 from core.delivery_point import DeliveryPoint
 from core.no_fly_zone import NoFlyZone
+from simulation.trajectory_sink import TrajectorySink, read_trajectory, iter_segment_pieces
+
+PathSource = Union[Dict[int, List[List[Tuple[float, float]]]], TrajectorySink, str]
+
+def _iter_paths(drone_paths: PathSource) -> Iterator[Tuple[int, Sequence[float], Sequence[float]]]:
+    # (drone_id, xs, ys) yol parçaları. Sink ya da yörünge dosyası parça parça okunur, tamamı belleğe alınmaz.
+    if isinstance(drone_paths, dict):
+        for drone_id, paths in drone_paths.items():
+            for path_segment in paths:
+                if len(path_segment) > 1:
+                    xs, ys = zip(*path_segment)
+                    yield drone_id, xs, ys
+        return
+    chunks = read_trajectory(drone_paths) if isinstance(drone_paths, str) else drone_paths.iter_samples()
+    for drone_id, _, points in iter_segment_pieces(chunks):
+        yield drone_id, points[:, 0], points[:, 1]
 
 def plot_simulation_results(
     drones_initial: List[Drone], 
     deliveries: List[DeliveryPoint],
     no_fly_zones: List[NoFlyZone],
-    drone_paths_history: Dict[int, List[List[Tuple[float, float]]]],
+    drone_paths_history: PathSource, # drone_paths_history sözlüğü, TrajectorySink ya da yörünge dosyası yolu
     base_pos: Tuple[float, float],
 ):
     fig, ax = plt.subplots(figsize=(14, 12))
@@ -60,8 +76,9 @@ def plot_simulation_results(
     # Drone Yolları Renk
     path_colors = ['blue', 'green', 'red', 'cyan', 'magenta', 'yellow', 'orange', 'purple', 'brown', 'pink']
     drone_id_to_label_plotted = {} 
-    for i, drone_id in enumerate(drone_paths_history.keys()):
-        paths = drone_paths_history[drone_id]
+    all_x = [p[0] for d in deliveries for p in [d.pos]] + [base_pos[0]]
+    all_y = [p[1] for d in deliveries for p in [d.pos]] + [base_pos[1]]
+    for drone_id, xs, ys in _iter_paths(drone_paths_history):
         drone_color = path_colors[drone_id % len(path_colors)]
 
         label_for_this_drone = None
@@ -69,21 +86,14 @@ def plot_simulation_results(
             label_for_this_drone = f'Drone {drone_id} Path'
             drone_id_to_label_plotted[drone_id] = True
 
-        for path_segment in paths:
-            if len(path_segment) > 1:
-                xs, ys = zip(*path_segment)
-                ax.plot(xs, ys, linestyle='-', marker='.', markersize=4, color=drone_color, alpha=0.6,
-                        label=label_for_this_drone if path_segment == paths[0] else None, 
-                        linewidth=1.5)
+        ax.plot(xs, ys, linestyle='-', marker='.', markersize=4, color=drone_color, alpha=0.6,
+                label=label_for_this_drone, linewidth=1.5)
+        # Sınırlar için yalnızca parçanın uç değerleri saklanır
+        all_x.extend((min(xs), max(xs))); all_y.extend((min(ys), max(ys)))
 
-    all_x = [p[0] for d in deliveries for p in [d.pos]] + [base_pos[0]]
-    all_y = [p[1] for d in deliveries for p in [d.pos]] + [base_pos[1]]
     for drone_init in drones_initial:
         all_x.append(drone_init.current_pos[0])
         all_y.append(drone_init.current_pos[1]) 
-    for paths in drone_paths_history.values():
-        for segment in paths:
-            for p in segment: all_x.append(p[0]); all_y.append(p[1])
     for nfz in no_fly_zones:
         for p in nfz.coordinates: all_x.append(p[0]); all_y.append(p[1])
 
@@ -1,4 +1,5 @@
 from datetime import datetime, time, timedelta
+from typing import Tuple, Optional
 
 def parse_time(time_str: str) -> time:
     return datetime.strptime(time_str, "%H:%M").time()
@@ -13,7 +14,47 @@ def seconds_to_time(seconds: float) -> time:
     seconds_rem = total_seconds % 60
     return time(hours % 24, minutes, seconds_rem)
 
-def add_seconds_to_time(base_time: time, seconds_to_add: float) -> time:
-    base_datetime = datetime.combine(datetime.min, base_time)
-    new_datetime = base_datetime + timedelta(seconds=seconds_to_add)
-    return new_datetime.time()
\ No newline at end of file
+SECONDS_PER_DAY = 86400
+
+def parse_clock(clock_str: str) -> float:
+    """
+    "HH:MM" ya da "HH:MM:SS" dizgisini simülasyon saatine (ilk gün 00:00'dan itibaren saniye) çevirir.
+    Saat 24'ü aşabilir ("30:00" = ikinci günün 06:00'sı). Geçersiz biçimde ValueError fırlatır.
+    """
+    parts = clock_str.split(":")
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Geçersiz saat biçimi: {clock_str}")
+    hours, minutes = int(parts[0]), int(parts[1])
+    seconds = float(parts[2]) if len(parts) == 3 else 0.0
+    if hours < 0 or not 0 <= minutes < 60 or not 0 <= seconds < 60:
+        raise ValueError(f"Geçersiz saat biçimi: {clock_str}")
+    return hours * 3600 + minutes * 60 + seconds
+
+def format_sim_time(sim_seconds: float) -> str:
+    # Günlük ve görselleştirme için; ilk günden sonraki zamanlara gün eki eklenir ("08:15:00 (+1g)")
+    day, rem = divmod(int(sim_seconds), SECONDS_PER_DAY)
+    clock = f"{rem // 3600:02d}:{(rem % 3600) // 60:02d}:{rem % 60:02d}"
+    return clock if day == 0 else f"{clock} (+{day}g)"
+
+def parse_time_window(window: Tuple[str, str]) -> Tuple[int, int]:
+    """
+    ("HH:MM", "HH:MM") penceresini simülasyonun ilk günü 00:00'dan itibaren tamsayı saniyeye çevirir.
+    Bitiş başlangıçtan önceyse pencere gece yarısını aşar ve bitişe bir gün eklenir.
+    Geçersiz biçimde ValueError fırlatır.
+    """
+    start = parse_time(window[0])
+    end = parse_time(window[1])
+    start_s = start.hour * 3600 + start.minute * 60
+    end_s = end.hour * 3600 + end.minute * 60
+    if end_s < start_s:
+        end_s += SECONDS_PER_DAY
+    return start_s, end_s
+
+def format_time_window(window_seconds: Tuple[int, int]) -> Tuple[str, str]:
+    return tuple(f"{(s % SECONDS_PER_DAY) // 3600:02d}:{(s % 3600) // 60:02d}" for s in window_seconds)
+
+def in_time_window(window_seconds: Optional[Tuple[int, int]], sim_seconds: float) -> bool:
+    # Pencere yoksa her zaman True. Pencere ve zaman aynı mutlak simülasyon saatindedir (günler arası geçerli).
+    if window_seconds is None:
+        return True
+    return window_seconds[0] <= sim_seconds <= window_seconds[1]
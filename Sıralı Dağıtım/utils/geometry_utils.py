@@ -1,7 +1,93 @@
 import math
-from typing import Tuple
+from typing import List, Tuple
 
 def euclidean_distance(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
     # İki nokta arasındaki Öklid mesafesini hesaplar.
-    
-    return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
\ No newline at end of file
+
+    return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
+
+def _orientation(p: Tuple[float, float], q: Tuple[float, float], r: Tuple[float, float]) -> float:
+    # (p, q, r) üçlüsünün yönelimi: >0 saat yönünün tersi, <0 saat yönü, 0 doğrusal
+    return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+
+def _on_segment(p: Tuple[float, float], q: Tuple[float, float], r: Tuple[float, float]) -> bool:
+    # Doğrusal olduğu bilinen r noktası [p, q] parçasının üzerinde mi?
+    return min(p[0], q[0]) <= r[0] <= max(p[0], q[0]) and min(p[1], q[1]) <= r[1] <= max(p[1], q[1])
+
+def segments_intersect(p1: Tuple[float, float], p2: Tuple[float, float],
+                       q1: Tuple[float, float], q2: Tuple[float, float]) -> bool:
+    # İki doğru parçasının kesişip kesişmediğini (uç noktada değme dahil) kontrol eder.
+    o1 = _orientation(p1, p2, q1)
+    o2 = _orientation(p1, p2, q2)
+    o3 = _orientation(q1, q2, p1)
+    o4 = _orientation(q1, q2, p2)
+
+    if ((o1 > 0 and o2 < 0) or (o1 < 0 and o2 > 0)) and ((o3 > 0 and o4 < 0) or (o3 < 0 and o4 > 0)):
+        return True
+
+    if o1 == 0 and _on_segment(p1, p2, q1): return True
+    if o2 == 0 and _on_segment(p1, p2, q2): return True
+    if o3 == 0 and _on_segment(q1, q2, p1): return True
+    if o4 == 0 and _on_segment(q1, q2, p2): return True
+    return False
+
+def segment_intersects_polygon_edges(p1: Tuple[float, float], p2: Tuple[float, float],
+                                     coordinates: List[Tuple[float, float]]) -> bool:
+    # Doğru parçası poligonun herhangi bir kenarıyla kesişiyor mu?
+    n = len(coordinates)
+    for i in range(n):
+        if segments_intersect(p1, p2, coordinates[i], coordinates[(i + 1) % n]):
+            return True
+    return False
+
+def polygon_signed_area(coordinates: List[Tuple[float, float]]) -> float:
+    # Pozitif: saat yönünün tersi (CCW), negatif: saat yönü (CW)
+    area = 0.0
+    n = len(coordinates)
+    for i in range(n):
+        x1, y1 = coordinates[i]
+        x2, y2 = coordinates[(i + 1) % n]
+        area += x1 * y2 - x2 * y1
+    return area / 2.0
+
+def inflate_polygon(coordinates: List[Tuple[float, float]], margin: float, max_miter: float = 4.0) -> List[Tuple[float, float]]:
+    """
+    Poligon köşelerini, komşu kenarların dış normalleri yönünde `margin` kadar dışarı taşır (miter ofseti).
+    Sivri köşelerde ofset `margin * max_miter` ile sınırlandırılır.
+    """
+    n = len(coordinates)
+    if n < 3 or margin <= 0:
+        return list(coordinates)
+
+    ccw = polygon_signed_area(coordinates) > 0
+    inflated = []
+    for i in range(n):
+        prev_pt = coordinates[i - 1]
+        cur_pt = coordinates[i]
+        next_pt = coordinates[(i + 1) % n]
+
+        normals = []
+        for a, b in ((prev_pt, cur_pt), (cur_pt, next_pt)):
+            dx, dy = b[0] - a[0], b[1] - a[1]
+            length = math.hypot(dx, dy)
+            if length == 0:
+                continue
+            # CCW poligonda dış normal (dy, -dx), CW poligonda (-dy, dx)
+            normals.append((dy / length, -dx / length) if ccw else (-dy / length, dx / length))
+
+        if not normals:
+            inflated.append(cur_pt)
+            continue
+
+        mx = sum(nx for nx, _ in normals)
+        my = sum(ny for _, ny in normals)
+        m_len = math.hypot(mx, my)
+        if m_len < 1e-9:
+            mx, my = normals[0]
+            m_len = 1.0
+        mx, my = mx / m_len, my / m_len
+
+        cos_half = max(mx * normals[0][0] + my * normals[0][1], 1.0 / max_miter)
+        offset = margin / cos_half
+        inflated.append((cur_pt[0] + mx * offset, cur_pt[1] + my * offset))
+    return inflated
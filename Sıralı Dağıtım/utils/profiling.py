@@ -0,0 +1,160 @@
+import cProfile
+import json
+import os
+import time
+from typing import Dict, List, Optional
+from utils.sim_logging import get_logger, INFO
+
+try:
+    from pyinstrument import Profiler as _PyinstrumentProfiler
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+logger = get_logger("profiling")
+
+BACKEND_CPROFILE = "cprofile"
+BACKEND_PYINSTRUMENT = "pyinstrument"
+
+class _NullPhase:
+    # Profilleme kapalıyken tüm phase() çağrıları bu tek nesneyi döndürür: ölçüm ve bellek ayırma yapılmaz
+    __slots__ = ()
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    __slots__ = ("_profiler", "_name", "_start")
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.add_time(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Profiler:
+    """
+    Simülasyon için adlandırılmış aşama zamanlayıcıları ve sayaçlar.
+
+        with profiler.phase("solve"):
+            ...
+        profiler.count("assignments", len(assignments))
+
+    Toplamlar çalıştırma boyunca, ayrıca her tick (`begin_tick` / `end_tick` arası) için ayrı tutulur ve
+    tick kayıtları `export_trace` ile JSON Lines olarak yazılabilir. İç içe aşamaların süresi üst aşamaya da
+    dahildir. `profile_every` > 0 ise her N. tick cProfile (ya da kuruluysa pyinstrument) ile yakalanıp
+    `profile_dir`'e yazılır. Kapalıyken (`enabled=False`) phase() paylaşılan boş bir bağlam döndürür.
+    """
+    def __init__(self, enabled: bool = False, trace: bool = True, profile_every: int = 0,
+                 profile_backend: str = BACKEND_CPROFILE, profile_dir: str = "profiles"):
+        self.enabled = enabled
+        self.trace_enabled = trace
+        self.profile_every = profile_every
+        self.profile_backend = profile_backend
+        self.profile_dir = profile_dir
+        if profile_every and profile_backend == BACKEND_PYINSTRUMENT and not PYINSTRUMENT_AVAILABLE:
+            logger.error("HATA: pyinstrument kurulu değil, tick profilleri cProfile ile alınacak.")
+            self.profile_backend = BACKEND_CPROFILE
+        self.reset()
+
+    def reset(self):
+        self.totals: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self.trace: List[dict] = []
+        self._tick_index = -1
+        self._tick_sim_time: Optional[float] = None
+        self._tick_start = 0.0
+        self._tick_totals: Dict[str, float] = {}
+        self._tick_counters: Dict[str, int] = {}
+        self._capture = None
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def add_time(self, name: str, seconds: float):
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self._tick_sim_time is not None:
+            self._tick_totals[name] = self._tick_totals.get(name, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + n
+        if self._tick_sim_time is not None:
+            self._tick_counters[name] = self._tick_counters.get(name, 0) + n
+
+    def begin_tick(self, sim_seconds: float):
+        if not self.enabled:
+            return
+        self._tick_index += 1
+        self._tick_sim_time = sim_seconds
+        self._tick_totals = {}
+        self._tick_counters = {}
+        if self.profile_every and self._tick_index % self.profile_every == 0:
+            if self.profile_backend == BACKEND_PYINSTRUMENT:
+                self._capture = _PyinstrumentProfiler()
+                self._capture.start()
+            else:
+                self._capture = cProfile.Profile()
+                self._capture.enable()
+        self._tick_start = time.perf_counter()
+
+    def end_tick(self):
+        if not self.enabled or self._tick_sim_time is None:
+            return
+        wall = time.perf_counter() - self._tick_start
+        if self._capture is not None:
+            self._save_capture()
+        if self.trace_enabled:
+            self.trace.append({"tick": self._tick_index, "sim_time": self._tick_sim_time, "wall_sec": wall,
+                               "phases": self._tick_totals, "counters": self._tick_counters})
+        self._tick_sim_time = None
+
+    def _save_capture(self):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base = os.path.join(self.profile_dir, f"tick_{self._tick_index:06d}")
+        if self.profile_backend == BACKEND_PYINSTRUMENT:
+            self._capture.stop()
+            with open(base + ".html", "w", encoding="utf-8") as f:
+                f.write(self._capture.output_html())
+        else:
+            self._capture.disable()
+            self._capture.dump_stats(base + ".prof") # python -m pstats / snakeviz ile açılabilir
+        self._capture = None
+
+    def summary(self) -> dict:
+        phases = {name: {"total_sec": total, "calls": self.calls[name], "mean_sec": total / self.calls[name]}
+                  for name, total in sorted(self.totals.items(), key=lambda item: -item[1])}
+        return {"phases": phases, "counters": dict(self.counters), "ticks": self._tick_index + 1}
+
+    def log_summary(self):
+        # Özet "drone_sim.profiling" günlüğüne INFO seviyesinde yazılır (QUIET ile susturulabilir)
+        if not logger.isEnabledFor(INFO):
+            return
+        logger.info("\n--- Aşama Süreleri ---")
+        for name, stats in self.summary()["phases"].items():
+            logger.info("%-16s %9.3fs  (%d çağrı, ort. %.3f ms)", name, stats["total_sec"], stats["calls"], stats["mean_sec"] * 1000,
+                        extra={"event": "profile_phase", "phase": name, "total_sec": stats["total_sec"], "calls": stats["calls"]})
+        for name, value in self.counters.items():
+            logger.info("%-16s %d", name, value, extra={"event": "profile_counter", "counter": name, "value": value})
+
+    def export_trace(self, path: str):
+        # Tick başına bir JSON kaydı (tick, simülasyon saniyesi, duvar süresi, aşama süreleri, sayaçlar)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.trace:
+                f.write(json.dumps(record) + "\n")
+
+
+# Profiler verilmeyen fonksiyonlar için paylaşılan kapalı profiler
+NULL_PROFILER = Profiler(enabled=False)
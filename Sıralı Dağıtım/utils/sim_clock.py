@@ -0,0 +1,42 @@
+from utils.datetime_utils import SECONDS_PER_DAY, parse_clock, format_sim_time
+
+class SimClock:
+    """
+    Simülasyon saati: zaman, ilk gün 00:00'dan itibaren float saniye olarak tutulur ve gece yarısında
+    sarılmaz; böylece çok günlü simülasyonlar desteklenir. Planlayıcı (CSP, GA, A*) doğrudan bu saniyeleri
+    kullanır; datetime/"HH:MM:SS" dönüşümü yalnızca günlük ve görselleştirme için `format` ile yapılır.
+    """
+    def __init__(self, start_seconds: float = 0.0):
+        self.start_seconds = float(start_seconds)
+        self.now = self.start_seconds
+
+    @classmethod
+    def from_string(cls, clock_str: str) -> "SimClock":
+        return cls(parse_clock(clock_str))
+
+    def advance(self, seconds: float) -> float:
+        self.now += seconds
+        return self.now
+
+    def set(self, sim_seconds: float) -> None:
+        self.now = float(sim_seconds)
+
+    def reset(self) -> None:
+        self.now = self.start_seconds
+
+    @property
+    def elapsed(self) -> float:
+        return self.now - self.start_seconds
+
+    @property
+    def day(self) -> int:
+        return int(self.now // SECONDS_PER_DAY)
+
+    def format(self) -> str:
+        return format_sim_time(self.now)
+
+    def __str__(self):
+        return f"SimClock({self.format()})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,202 @@
+import atexit
+import contextlib
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+ROOT_LOGGER_NAME = "drone_sim"
+
+# Seviyeler: DEBUG (adım başlıkları, GA nesilleri, CSP durumu), INFO (atamalar, özetler), WARNING, ERROR ("HATA: ...")
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+QUIET = logging.CRITICAL + 10 # Hiçbir kayıt geçmez
+logging.addLevelName(QUIET, "QUIET")
+
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR, "quiet": QUIET}
+
+# LogRecord'un kendi alanları; bunların dışındakiler (extra=...) JSON kaydına yapısal alan olarak yazılır
+_STANDARD_ATTRS = set(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_sim_clock = None
+
+def get_logger(name: str) -> logging.Logger:
+    # Modül günlükleri "drone_sim" altında toplanır (ör. get_logger("csp") -> "drone_sim.csp")
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+def parse_level(level) -> int:
+    if isinstance(level, int):
+        return level
+    return LEVELS[level.lower()]
+
+def bind_sim_clock(clock) -> None:
+    # Bağlanan SimClock'un zamanı her kayda `sim_time` olarak eklenir
+    global _sim_clock
+    _sim_clock = clock
+
+
+class _StdoutHandler(logging.StreamHandler):
+    # sys.stdout yazma anında çözülür; redirect_stdout ile susturma (toplu çalıştırıcı, benchmark) çalışmaya devam eder
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class SimTimeFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        if _sim_clock is not None:
+            record.sim_time = _sim_clock.now
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Aynı mesaj şablonundan (logger adı + biçimlenmemiş mesaj) `interval` saniyede en fazla `max_records`
+    kayıt geçirir. Atlanan kayıt sayısı, o şablondan geçen bir sonraki kayda `suppressed` alanı olarak
+    eklenir. `exempt_level` ve üstü (varsayılan WARNING) hiç sınırlanmaz.
+    """
+    def __init__(self, max_records: int = 10, interval: float = 1.0, exempt_level: int = WARNING):
+        super().__init__()
+        self.max_records = max_records
+        self.interval = interval
+        self.exempt_level = exempt_level
+        self._windows: Dict[Tuple[str, str], Tuple[float, int, int]] = {} # şablon -> (pencere başı, geçen, atlanan)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        window_start, passed, suppressed = self._windows.get(key, (now, 0, 0))
+        if now - window_start >= self.interval:
+            window_start, passed = now, 0
+        if passed >= self.max_records:
+            self._windows[key] = (window_start, passed, suppressed + 1)
+            return False
+        if suppressed:
+            record.suppressed = suppressed
+        self._windows[key] = (window_start, passed + 1, 0)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    # Kayıt başına bir JSON nesnesi: ts, level, logger, msg, sim_time ve extra= ile verilen alanlar
+    def format(self, record: logging.LogRecord) -> str:
+        data = {"ts": record.created, "level": record.levelname, "logger": record.name, "msg": record.getMessage()}
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _close_handlers(root: logging.Logger) -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    for handler in list(root.handlers):
+        handler.flush()
+        handler.close()
+        root.removeHandler(handler)
+
+def configure_logging(
+    level=INFO,
+    console: bool = True,
+    json_path: Optional[str] = None,
+    buffer_capacity: int = 0,
+    async_mode: bool = False,
+    rate_limit: Optional[int] = None,
+    rate_interval: float = 1.0
+) -> logging.Logger:
+    """
+    "drone_sim" günlüklerini yapılandırır (önceki yapılandırma kapatılır).
+    - console: düz metin mesajlar stdout'a; json_path: JSON Lines kayıtları dosyaya.
+    - buffer_capacity > 0: kayıtlar bu sayıda biriktirilip toplu yazılır (ERROR ve üstü hemen yazılır).
+    - async_mode: kayıtlar kuyruğa alınır, yazma işi ayrı bir iş parçacığında yapılır.
+    - rate_limit: aynı mesaj şablonundan rate_interval saniyede en fazla bu kadar kayıt (WARNING altı).
+    level=QUIET ise hiç handler kurulmaz. Çağrılar %-argümanlı olduğundan, seviyesi kapalı bir kayıt için
+    mesaj biçimlendirilmez; yalnızca isEnabledFor kontrolü yapılır.
+    """
+    global _listener
+    level = parse_level(level)
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    _close_handlers(root)
+    root.setLevel(level)
+    root.propagate = False
+    if level >= QUIET:
+        return root
+
+    handlers = []
+    if console:
+        console_handler = _StdoutHandler()
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(console_handler)
+    if json_path:
+        json_handler = logging.FileHandler(json_path, "w", encoding="utf-8")
+        json_handler.setFormatter(JsonFormatter())
+        handlers.append(json_handler)
+    if buffer_capacity > 0:
+        handlers = [logging.handlers.MemoryHandler(buffer_capacity, flushLevel=ERROR, target=h) for h in handlers]
+
+    if async_mode:
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, *handlers)
+        _listener.start()
+        handlers = [logging.handlers.QueueHandler(log_queue)]
+
+    # Filtreler kaydı üreten iş parçacığında çalışır: sim_time doğru, atlanan kayıtlar kuyruğa girmez
+    for handler in handlers:
+        handler.addFilter(SimTimeFilter())
+        if rate_limit:
+            handler.addFilter(RateLimitFilter(rate_limit, rate_interval))
+        root.addHandler(handler)
+    return root
+
+def flush_logging() -> None:
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in root.handlers:
+        handler.flush()
+    if _listener is not None:
+        _listener.stop() # Kuyruk boşaltılır, ardından dinleyici yeniden başlatılır
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener.start()
+
+@contextlib.contextmanager
+def quiet_logging():
+    # Blok süresince tüm simülasyon günlüklerini kapatır (yapılandırmayı değiştirmeden)
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    previous = root.level
+    root.setLevel(QUIET)
+    try:
+        yield
+    finally:
+        root.setLevel(previous)
+
+@atexit.register
+def _shutdown():
+    # logging'in kendi atexit kapanışından önce çalışır: kuyruktaki kayıtlar hedef handler'lara aktarılır
+    if _listener is not None:
+        _listener.stop()
+
+
+# Varsayılan: INFO seviyesinde, tamponsuz stdout (önceki print çıktısına en yakın davranış)
+if not logging.getLogger(ROOT_LOGGER_NAME).handlers:
+    configure_logging()
@@ -0,0 +1,40 @@
+import argparse
+import random
+import time
+
+from data.sample_data import drones, deliveries, no_fly_zones
+from ga.genetic_algorithm import genetic_algorithm, fitness
+from ga.island_model import island_genetic_algorithm, TOPOLOGY_RING, TOPOLOGY_FULL
+
+def main():
+    # Tek popülasyonlu GA ile ada modelini aynı duvar saati süresinde karşılaştırır
+    parser = argparse.ArgumentParser(description="Ada modeli GA karşılaştırması")
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--population", type=int, default=50)
+    parser.add_argument("--islands", type=int, default=None)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    current_time = 0
+    score = lambda ind: fitness(ind, drones, deliveries, no_fly_zones, current_time)
+
+    for repeat in range(args.repeats):
+        seed = args.seed + repeat # Aynı tekrardaki tüm çalıştırmalar aynı seed ile başlar
+        random.seed(seed)
+        start = time.perf_counter()
+        single = genetic_algorithm(drones, deliveries, no_fly_zones, current_time, args.population, args.generations)
+        budget = time.perf_counter() - start
+        print(f"[{repeat}] Tek popülasyon: fitness {score(single):.2f}, süre {budget:.2f}s")
+
+        for topology in (TOPOLOGY_RING, TOPOLOGY_FULL):
+            # Ada modeli aynı süre bütçesiyle (nesil sınırı yerine süre sınırı) çalışır
+            start = time.perf_counter()
+            best = island_genetic_algorithm(drones, deliveries, no_fly_zones, current_time, num_islands=args.islands,
+                                            population_size=args.population, generations=10**9, topology=topology,
+                                            time_limit=budget, seed=seed)
+            elapsed = time.perf_counter() - start
+            print(f"[{repeat}] Ada modeli ({topology}): fitness {score(best):.2f}, süre {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import importlib.util
+import os
+import sys
+
+# Ölçüm altyapısı (benchmarks.harness) üç ağaçta ortaktır ve tek kopya olarak Sıralı Dağıtım/benchmarks/harness.py'de
+# tutulur. Ağaçların paket adları aynı olduğundan normal içe aktarma yerine dosyadan yüklenir.
+_HARNESS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir,
+                             "Sıralı Dağıtım", "benchmarks", "harness.py")
+if "benchmarks.harness" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location("benchmarks.harness", _HARNESS_PATH)
+    harness = importlib.util.module_from_spec(_spec)
+    sys.modules["benchmarks.harness"] = harness
+    _spec.loader.exec_module(harness)
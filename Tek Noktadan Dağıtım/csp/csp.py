@@ -1,7 +1,13 @@
-from typing import List, Dict, Optional
+import heapq
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
 from models.drone import Drone
 from models.delivery import DeliveryPoint
 from models.noflyzone import NoFlyZone
+from models.registry import EntityRegistry
 
 def is_point_in_no_fly_zones(point: tuple, no_fly_zones: List[NoFlyZone], current_time: float) -> bool:
     for zone in no_fly_zones:
@@ -13,14 +19,15 @@ def is_point_in_no_fly_zones(point: tuple, no_fly_zones: List[NoFlyZone], curren
     return False
 
 def check_constraints(assignment: Dict[int, int], drones: List[Drone], deliveries: List[DeliveryPoint], 
-                      no_fly_zones: List[NoFlyZone], current_time: float) -> bool:
+                      no_fly_zones: List[NoFlyZone], current_time: float, registry: Optional[EntityRegistry] = None) -> bool:
 
+    registry = EntityRegistry.ensure(registry, drones, deliveries)
     # 1. Drone kapasitesi kontrolü ve no-fly zone kontrolü
     drone_carrying = {drone.id: 0 for drone in drones}  # kaç teslimat taşıyor (max 1)
     
     for delivery_id, drone_id in assignment.items():
-        delivery = next((d for d in deliveries if d.id == delivery_id), None)
-        drone = next((dr for dr in drones if dr.id == drone_id), None)
+        delivery = registry.delivery(delivery_id)
+        drone = registry.drone(drone_id)
         if not delivery or not drone:
             return False
         
@@ -43,24 +50,302 @@ def check_constraints(assignment: Dict[int, int], drones: List[Drone], deliverie
 
     return True
 
-def backtracking_search(drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], current_time: float) -> Optional[Dict[int, int]]:
+# Bu boyuta kadar olan çelişki kümeleri nogood olarak saklanır (büyükleri nadiren tekrar eder)
+NOGOOD_MAX_SIZE = 12
 
-    assignment = {}
+@dataclass
+class SearchStats:
+    # Arama sayaçları: denenen atama (düğüm) sayısı, geri dönüşler, atlanan seviyeler, nogood'lar, toplam süre,
+    # yalnızca aramada geçen süre ve atanabilecek en çok teslimat
+    nodes: int = 0
+    backtracks: int = 0
+    backjumps: int = 0
+    nogoods: int = 0
+    nogood_prunes: int = 0
+    elapsed_sec: float = 0.0
+    search_sec: float = 0.0
+    max_matching: int = 0
+    proven_infeasible: bool = False # Eşleştirme sınırı tam atamanın olmadığını aramasız kanıtladı
 
-    def backtrack(index=0) -> bool:
-        if index == len(deliveries):
-            return True
-        
-        delivery = deliveries[index]
-        for drone in drones:
-            assignment[delivery.id] = drone.id
-            if check_constraints(assignment, drones, deliveries, no_fly_zones, current_time):
-                if backtrack(index + 1):
-                    return True
-            assignment.pop(delivery.id)
-        return False
-
-    if backtrack():
-        return assignment
-    else:
+    @property
+    def nodes_per_sec(self) -> float:
+        # Alan hesabı ve eşleştirme hariç, arama çekirdeğinin düğüm hızı
+        return self.nodes / self.search_sec if self.search_sec > 0 else 0.0
+
+def active_zone_boxes(no_fly_zones: List[NoFlyZone], current_time: float) -> List[Tuple[float, float, float, float]]:
+    # current_time'da aktif NFZ'lerin sınır kutuları (min_x, max_x, min_y, max_y), bir kez hesaplanır
+    boxes = []
+    for zone in no_fly_zones:
+        start_time, end_time = zone.active_time
+        if start_time <= current_time <= end_time:
+            xs, ys = zip(*zone.coordinates)
+            boxes.append((min(xs), max(xs), min(ys), max(ys)))
+    return boxes
+
+def compute_domains(drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone],
+                    current_time: float, registry: Optional[EntityRegistry] = None) -> Dict[int, List[int]]:
+    """
+    Tekli kısıtları (ağırlık, NFZ, zaman penceresi) bir kez uygular: teslimat_id -> atanabilecek drone ID'leri.
+    NFZ içindeki ya da penceresi kapalı teslimatın alanı boştur.
+    """
+    registry = EntityRegistry.ensure(registry, drones, deliveries)
+    boxes = active_zone_boxes(no_fly_zones, current_time)
+    domains = {}
+    for i, delivery in enumerate(registry.deliveries):
+        x, y = registry.delivery_x[i], registry.delivery_y[i]
+        blocked = any(min_x <= x <= max_x and min_y <= y <= max_y for min_x, max_x, min_y, max_y in boxes)
+        if blocked or not (registry.window_start[i] <= current_time <= registry.window_end[i]):
+            domains[delivery.id] = []
+            continue
+        weight = registry.delivery_weight[i]
+        domains[delivery.id] = [drone.id for j, drone in enumerate(registry.drones) if weight <= registry.drone_max_weight[j]]
+    return domains
+
+def maximum_matching(domains: Dict[int, List[int]], order: List[int]) -> Dict[int, int]:
+    """
+    Teslimat -> drone en büyük iki parçalı eşleştirmesi (artıran yollar, BFS). Teslimatlar `order` sırasıyla
+    eklenir ve eşleşmiş teslimat sonradan eşleşmesiz kalmaz; bu yüzden sıra önceliğe göre azalan verilirse sonuç
+    hem en çok teslimatı hem de bu sayıdaki en yüksek toplam önceliği verir (transversal matroid üzerinde açgözlü).
+    Eşleştirme boyutu teslimat sayısından küçükse Hall koşulu bozulmuştur: tam atama yoktur.
+    """
+    delivery_drone: Dict[int, int] = {}
+    drone_delivery: Dict[int, int] = {}
+    for root in order:
+        came_from: Dict[int, int] = {} # drone -> bu drone'a ulaşılan teslimat
+        queue = deque([root])
+        while queue:
+            delivery_id = queue.popleft()
+            free_drone = None
+            for drone_id in domains[delivery_id]:
+                if drone_id in came_from:
+                    continue
+                came_from[drone_id] = delivery_id
+                owner = drone_delivery.get(drone_id)
+                if owner is None:
+                    free_drone = drone_id
+                    break
+                queue.append(owner)
+            if free_drone is not None:
+                # Yol boyunca eşleşmeler kaydırılır: her teslimat bir sonraki drone'a geçer
+                drone_id = free_drone
+                while drone_id is not None:
+                    delivery_id = came_from[drone_id]
+                    previous = delivery_drone.get(delivery_id)
+                    delivery_drone[delivery_id] = drone_id
+                    drone_delivery[drone_id] = delivery_id
+                    drone_id = previous
+                break
+    return delivery_drone
+
+def backtracking_search(drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], current_time: float,
+                        stats: Optional[SearchStats] = None, maximize: bool = False) -> Optional[Dict[int, int]]:
+    """
+    Teslimat -> drone ataması; her drone en fazla bir teslimat alır. Tekli kısıtlar (ağırlık, NFZ, zaman penceresi)
+    alanlara bir kez uygulanır, ardından arama _bitset_search çekirdeğinde (değer sırası önerisi olarak ön çözüm
+    eşleştirmesiyle) yapılır. Dönen atama check_constraints'i sağlar; verilirse `stats` arama sayaçlarıyla doldurulur.
+
+    Aramadan önce en büyük eşleştirme hesaplanır; tüm teslimatları kapsamıyorsa arama yapılmadan None döner.
+    maximize=True ise bu durumda None yerine en çok teslimatı (eşitlikte en yüksek toplam önceliği) atayan
+    kısmi atama döner.
+    """
+    stats = stats if stats is not None else SearchStats()
+    start = time.perf_counter()
+    registry = EntityRegistry(drones, deliveries)
+    unary_domains = compute_domains(drones, deliveries, no_fly_zones, current_time, registry)
+
+    # Ön çözüm sınırı: öncelik sırasıyla en büyük eşleştirme
+    by_priority = sorted(unary_domains, key=lambda d_id: (-registry.delivery(d_id).priority, registry.delivery_index[d_id]))
+    matching = maximum_matching(unary_domains, by_priority)
+    stats.max_matching = len(matching)
+    if len(matching) < len(deliveries):
+        stats.proven_infeasible = True
+        stats.elapsed_sec = time.perf_counter() - start
+        return matching if maximize else None
+
+    # Alanlar bit kümesi: j. bit registry sırasındaki j. drone
+    masks = []
+    for delivery in registry.deliveries:
+        mask = 0
+        for drone_id in unary_domains[delivery.id]:
+            mask |= 1 << registry.drone_index[drone_id]
+        masks.append(mask)
+
+    # Eşleştirme zaten geçerli bir tam atamadır; çekirdek bunu O(n) doğrulayıp döndürür, doğrulama tutmazsa
+    # (ör. ileride eklenecek ikili kısıtlar) öneriyi değer sırası olarak kullanıp aramaya düşer
+    hint = [registry.drone_index[matching[delivery.id]] for delivery in registry.deliveries]
+
+    # Arama seviye başına bir çerçeve kullanır; büyük örnekler için sınır geçici olarak yükseltilir
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, len(masks) + 100))
+    search_start = time.perf_counter()
+    try:
+        chosen = _bitset_search(masks, stats, hint)
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+    stats.search_sec = time.perf_counter() - search_start
+    stats.elapsed_sec = time.perf_counter() - start
+    if chosen is None:
+        return None
+    return {registry.deliveries[i].id: registry.drones[j].id for i, j in enumerate(chosen)}
+
+def _bits(mask: int):
+    # Küme bitlerinin indeksleri (küçükten büyüğe)
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def _bitset_search(masks: List[int], stats: SearchStats, hint: Optional[List[int]] = None) -> Optional[List[int]]:
+    """
+    Bit kümesi alanlı arama çekirdeği: masks[i], i. teslimatın alabileceği drone'lar. Dönüş: teslimat sırasıyla
+    drone indeksleri ya da çözüm yoksa None.
+
+    - İleri kontrol ve AC-3: atanan drone diğer atanmamış teslimatların alanlarından çıkarılır; tek değeri kalan
+      alan kendi drone'unu da diğerlerinden çıkarır (!= kısıtları için yay tutarlılığı), zincir boşalan bir alana
+      ulaşırsa değer hemen reddedilir. `holders[j]` (alanında j. drone bulunan atanmamış teslimatların bit kümesi)
+      sayesinde budama yalnızca ilgili teslimatlara dokunur. Değişiklikler `trail` üzerinden geri alınır.
+    - MRV (en küçük güncel alan; alan değiştikçe yeni kayıt eklenen tembel yığın) ve LCV (en az atanmamış
+      teslimatın alanında bulunan drone). `hint` verilirse her teslimat için önce önerilen drone denenir;
+      öneri kendi başına geçerli bir tam atamaysa arama yapılmadan döner.
+    - Çelişkiye yönelik geri atlama (CBJ): her alan için onu daraltan seviyeler `reasons`'da tutulur; başarısızlık
+      bu seviyelerin bit kümesini döndürür. Bir alt ağacın çelişkisi mevcut seviyeyi içermiyorsa bu seviyenin
+      diğer değerleri denenmeden yukarı atlanır.
+    - Nogood kaydı: başarısız alt ağacın çelişki kümesindeki (teslimat, drone) atamaları saklanır; aynı atamalar
+      başka bir dalda yeniden bir araya gelirse o değer aramasız reddedilir.
+
+    İkili != tutarlılığı Hall kümelerini görmez: öneri verilmezse seyrek rastgele alanlarda arama üstel sürebilir.
+    """
+    n, m = len(masks), max((mask.bit_length() for mask in masks), default=0)
+    if hint is not None and len(set(hint)) == n and all(j >= 0 and (mask >> j) & 1 for mask, j in zip(masks, hint)):
+        # Öneri zaten alanlar içinde, farklı drone'lardan oluşan tam bir atama: arama her seviyede ilk değeri
+        # kabul ederek aynı sonuca geri dönmeden ulaşırdı, budama maliyetine girmeden döndürülür
+        stats.nodes += n
+        return list(hint)
+    domains = list(masks)
+    reasons = [0] * n             # teslimat -> alanını daraltan seviyelerin bit kümesi
+    free = [True] * n             # teslimat henüz atanmamış mı
+    remaining = n
+    chosen = [-1] * n
+    holders = [0] * m             # drone -> alanında bu drone bulunan atanmamış teslimatların bit kümesi
+    for i, mask in enumerate(masks):
+        for j in _bits(mask):
+            holders[j] |= 1 << i
+    versions = [0] * n            # MRV yığınındaki eski kayıtları ayırt etmek için alan sürümü
+    heap = [(mask.bit_count(), i, 0) for i, mask in enumerate(masks)]
+    heapq.heapify(heap)
+    heappush = heapq.heappush
+    level_key = [0] * n           # seviye -> (teslimat * m + drone) atama anahtarı
+    key_level: Dict[int, int] = {} # atanmış anahtar -> seviye
+    nogoods: Dict[int, List[Tuple[int, ...]]] = {} # anahtar -> onu içeren nogood'lar
+    trail: List[Tuple[int, int, int]] = []         # (teslimat, çıkarılan drone, önceki sebep)
+
+    def touch(i: int):
+        versions[i] += 1
+        heapq.heappush(heap, (domains[i].bit_count(), i, versions[i]))
+
+    def prune(j: int, cause: int, owner: int) -> Optional[int]:
+        # j. drone'u `owner` dışındaki atanmamış alanlardan çıkarır; boşalan alanın sebep kümesini döndürür
+        queue = [(j, cause, owner)]
+        while queue:
+            j, cause, owner = queue.pop()
+            bit = 1 << j
+            targets = holders[j] & ~(1 << owner) if owner >= 0 else holders[j]
+            holders[j] ^= targets
+            while targets:
+                low = targets & -targets
+                targets ^= low
+                i = low.bit_length() - 1
+                trail.append((i, j, reasons[i]))
+                domain = domains[i] ^ bit
+                domains[i] = domain
+                reasons[i] |= cause
+                versions[i] += 1
+                heappush(heap, (domain.bit_count(), i, versions[i]))
+                if not domain:
+                    holders[j] |= targets # işlenmemiş teslimatlar alanlarını korur
+                    return reasons[i]
+                if not domain & (domain - 1):
+                    queue.append((domain.bit_length() - 1, reasons[i], i))
+        return None
+
+    def undo(mark: int):
+        while len(trail) > mark:
+            i, j, reason = trail.pop()
+            domains[i] |= 1 << j
+            holders[j] |= 1 << i
+            reasons[i] = reason
+            touch(i)
+
+    def value_order(var: int):
+        domain = domains[var]
+        preferred = hint[var] if hint is not None else -1
+        if preferred >= 0 and (domain >> preferred) & 1:
+            yield preferred
+            domain ^= 1 << preferred
+        yield from sorted(_bits(domain), key=lambda j: holders[j].bit_count()) # LCV
+
+    def search(level: int) -> Tuple[bool, int]:
+        nonlocal remaining
+        if not remaining:
+            return True, 0
+        while True: # MRV: yığının başındaki güncel kayıt
+            _, var, version = heapq.heappop(heap)
+            if free[var] and version == versions[var]:
+                break
+        free[var] = False
+        remaining -= 1
+        for j in _bits(domains[var]):
+            holders[j] ^= 1 << var
+
+        conflict = reasons[var] # Bu teslimatın alanını daraltmış önceki seviyeler
+        result = None
+        for j in value_order(var):
+            stats.nodes += 1
+            key = var * m + j
+            violated = next((ng for ng in nogoods.get(key, ()) if all(k == key or k in key_level for k in ng)), None)
+            if violated is not None:
+                stats.nogood_prunes += 1
+                for k in violated:
+                    if k != key:
+                        conflict |= 1 << key_level[k]
+                continue
+            chosen[var] = j
+            level_key[level] = key
+            key_level[key] = level
+            mark = len(trail)
+            child_conflict = prune(j, 1 << level, -1)
+            if child_conflict is None:
+                ok, child_conflict = search(level + 1)
+                if ok:
+                    return True, 0
+            undo(mark)
+            del key_level[key]
+            stats.backtracks += 1
+            if child_conflict.bit_count() <= NOGOOD_MAX_SIZE:
+                nogood = tuple(level_key[lv] for lv in _bits(child_conflict))
+                for k in nogood:
+                    nogoods.setdefault(k, []).append(nogood)
+                stats.nogoods += 1
+            if not (child_conflict >> level) & 1:
+                # Bu seviyenin seçimi çelişkide yok: kalan değerler de aynı sebeple başarısız olur
+                stats.backjumps += 1
+                result = child_conflict
+                break
+            conflict |= child_conflict & ~(1 << level)
+
+        chosen[var] = -1
+        for j in _bits(domains[var]):
+            holders[j] |= 1 << var
+        free[var] = True
+        remaining += 1
+        touch(var)
+        return False, conflict if result is None else result
+
+    # Kök: boş alan varsa çözüm yok; tek değerli alanlar baştan yayılır
+    if not all(domains):
         return None
+    for i in range(n):
+        domain = domains[i]
+        if domain and not domain & (domain - 1) and prune(domain.bit_length() - 1, 0, i) is not None:
+            return None
+    return chosen if search(0)[0] else None
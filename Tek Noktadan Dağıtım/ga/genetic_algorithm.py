@@ -1,10 +1,48 @@
 import random
-from typing import List, Dict, Tuple, Optional
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Optional, Callable, Hashable
 from models.drone import Drone
 from models.delivery import DeliveryPoint
 from models.noflyzone import NoFlyZone
+from models.registry import EntityRegistry
 from graph.utils import euclidean_distance
 
+class FitnessCache:
+    """
+    Kromozomun kanonik anahtarıyla (sıralı (teslimat, drone) çiftleri) fitness değerlerini tutan sınırlı LRU önbellek.
+    Elitler ve tekrar eden bireyler her nesilde yeniden hesaplanmaz.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], float]) -> float:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        value = compute()
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+def assignment_key(assignment: Dict[int, int]) -> Tuple[Tuple[int, int], ...]:
+    return tuple(sorted(assignment.items()))
+
 def generate_random_population(drones: List[Drone], deliveries: List[DeliveryPoint], population_size: int) -> List[Dict[int, int]]:
     population = []
     for _ in range(population_size):
@@ -15,27 +53,31 @@ def generate_random_population(drones: List[Drone], deliveries: List[DeliveryPoi
         population.append(assignment)
     return population
 
-def compute_total_energy(assignment: Dict[int, int], drones: List[Drone], deliveries: List[DeliveryPoint]) -> float:
+def compute_total_energy(assignment: Dict[int, int], drones: List[Drone], deliveries: List[DeliveryPoint],
+                         registry: Optional[EntityRegistry] = None) -> float:
+    registry = EntityRegistry.ensure(registry, drones, deliveries)
     total_energy = 0
     drone_positions = {drone.id: drone.start_pos for drone in drones}
     for delivery_id, drone_id in assignment.items():
-        delivery = next(d for d in deliveries if d.id == delivery_id)
+        i = registry.delivery_index[delivery_id]
+        delivery_pos = (registry.delivery_x[i], registry.delivery_y[i])
         start_pos = drone_positions[drone_id]
-        dist = euclidean_distance(start_pos, delivery.pos)
+        dist = euclidean_distance(start_pos, delivery_pos)
         # enerji = mesafe * ağırlık 
-        energy = dist * delivery.weight
+        energy = dist * registry.delivery_weight[i]
         total_energy += energy
         # drone pozisyonunu güncelle
-        drone_positions[drone_id] = delivery.pos
+        drone_positions[drone_id] = delivery_pos
     return total_energy
 
 def count_constraint_violations(assignment: Dict[int, int], drones: List[Drone], deliveries: List[DeliveryPoint], 
-                                no_fly_zones: List[NoFlyZone], current_time: float) -> int:
+                                no_fly_zones: List[NoFlyZone], current_time: float, registry: Optional[EntityRegistry] = None) -> int:
+    registry = EntityRegistry.ensure(registry, drones, deliveries)
     violations = 0
     drone_carrying = {drone.id: 0 for drone in drones}
     for delivery_id, drone_id in assignment.items():
-        delivery = next(d for d in deliveries if d.id == delivery_id)
-        drone = next(dr for dr in drones if dr.id == drone_id)
+        delivery = registry.delivery(delivery_id)
+        drone = registry.drone(drone_id)
         drone_carrying[drone_id] += 1
         if drone_carrying[drone_id] > 1:
             violations += 1
@@ -54,10 +96,12 @@ def count_constraint_violations(assignment: Dict[int, int], drones: List[Drone],
             violations += 1
     return violations
 
-def fitness(assignment: Dict[int, int], drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], current_time: float) -> float:
+def fitness(assignment: Dict[int, int], drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], current_time: float,
+            registry: Optional[EntityRegistry] = None) -> float:
+    registry = EntityRegistry.ensure(registry, drones, deliveries)
     delivered_count = len(assignment)
-    total_energy = compute_total_energy(assignment, drones, deliveries)
-    violations = count_constraint_violations(assignment, drones, deliveries, no_fly_zones, current_time)
+    total_energy = compute_total_energy(assignment, drones, deliveries, registry)
+    violations = count_constraint_violations(assignment, drones, deliveries, no_fly_zones, current_time, registry)
     return (delivered_count * 50) - (total_energy * 0.1) - (violations * 1000)
 
 def crossover(parent1: Dict[int, int], parent2: Dict[int, int]) -> Dict[int, int]:
@@ -79,16 +123,32 @@ def mutate(assignment: Dict[int, int], drones: List[Drone], mutation_rate: float
             mutated[delivery_id] = random.choice(drones).id
     return mutated
 
-def genetic_algorithm(drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], current_time: float, population_size=50, generations=100) -> Dict[int, int]:
+def cached_fitness(assignment: Dict[int, int], drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], current_time: float, fitness_cache: Optional[FitnessCache] = None,
+                   registry: Optional[EntityRegistry] = None) -> float:
+    if fitness_cache is None:
+        return fitness(assignment, drones, deliveries, no_fly_zones, current_time, registry)
+    return fitness_cache.get_or_compute(assignment_key(assignment), lambda: fitness(assignment, drones, deliveries, no_fly_zones, current_time, registry))
+
+def evolve_population(population: List[Dict[int, int]], drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], current_time: float, population_size=50, fitness_cache: Optional[FitnessCache] = None,
+                      registry: Optional[EntityRegistry] = None) -> List[Dict[int, int]]:
+    # Bir nesil: sırala, elitleri koru, en iyi 20 arasından çaprazla ve mutasyona uğrat
+    registry = EntityRegistry.ensure(registry, drones, deliveries)
+    population = sorted(population, key=lambda ind: cached_fitness(ind, drones, deliveries, no_fly_zones, current_time, fitness_cache, registry), reverse=True)
+    next_generation = population[:10]  # elitizm: en iyiler direkt
+    while len(next_generation) < population_size:
+        parent1, parent2 = random.sample(population[:20], 2)
+        child = crossover(parent1, parent2)
+        child = mutate(child, drones)
+        next_generation.append(child)
+    return next_generation
+
+def genetic_algorithm(drones: List[Drone], deliveries: List[DeliveryPoint], no_fly_zones: List[NoFlyZone], current_time: float, population_size=50, generations=100, fitness_cache: Optional[FitnessCache] = None) -> Dict[int, int]:
+    # fitness_cache verilirse çağıran taraf çalıştırma sonrası isabet oranını okuyabilir
+    if fitness_cache is None:
+        fitness_cache = FitnessCache()
+    registry = EntityRegistry(drones, deliveries)
     population = generate_random_population(drones, deliveries, population_size)
     for _ in range(generations):
-        population = sorted(population, key=lambda ind: fitness(ind, drones, deliveries, no_fly_zones, current_time), reverse=True)
-        next_generation = population[:10]  # elitizm: en iyiler direkt
-        while len(next_generation) < population_size:
-            parent1, parent2 = random.sample(population[:20], 2)
-            child = crossover(parent1, parent2)
-            child = mutate(child, drones)
-            next_generation.append(child)
-        population = next_generation
-    best = max(population, key=lambda ind: fitness(ind, drones, deliveries, no_fly_zones, current_time))
+        population = evolve_population(population, drones, deliveries, no_fly_zones, current_time, population_size, fitness_cache, registry)
+    best = max(population, key=lambda ind: cached_fitness(ind, drones, deliveries, no_fly_zones, current_time, fitness_cache, registry))
     return best
@@ -7,6 +7,7 @@ from graph.graph_builder import build_graph
 from astar.astar import a_star
 from csp.csp import backtracking_search
 from ga.genetic_algorithm import genetic_algorithm
+from models.registry import EntityRegistry
 
 def get_priority_queue(deliveries):
     # (-priority, delivery_id, delivery_obj) ile heap oluştur (min-heap)
@@ -42,6 +43,7 @@ def visualize(drones, deliveries, no_fly_zones, assignment):
     # Teslimat noktaları ve atamalar
     colors = ['green', 'purple', 'orange', 'brown', 'cyan']  # Drone'lar için renkler
     drone_color_map = {d.id: colors[i % len(colors)] for i, d in enumerate(drones)}
+    registry = EntityRegistry(drones, deliveries)
 
     for delivery in deliveries:
         assigned_drone_id = assignment.get(delivery.id)
@@ -51,7 +53,7 @@ def visualize(drones, deliveries, no_fly_zones, assignment):
 
         # Dronenin start_pos ile teslimat arasında çizgi (rota)
         if assigned_drone_id:
-            drone_start = next(d.start_pos for d in drones if d.id == assigned_drone_id)
+            drone_start = registry.drone(assigned_drone_id).start_pos
             ax.plot([drone_start[0], delivery.pos[0]], [drone_start[1], delivery.pos[1]], c=c, linestyle='--', alpha=0.7)
 
     ax.set_xlim(0, 110)
@@ -69,8 +71,8 @@ def main():
 
     current_time = 0
 
-    # CSP çözüm (delivery_id -> drone_id)
-    csp_solution = backtracking_search(drones, deliveries, no_fly_zones, current_time)
+    # CSP çözüm (delivery_id -> drone_id); tam atama yoksa en çok teslimatı kapsayan kısmi atama
+    csp_solution = backtracking_search(drones, deliveries, no_fly_zones, current_time, maximize=True)
     print(f"CSP solution (delivery_id -> drone_id): {csp_solution}")
 
     # GA çözüm (delivery_id -> drone_id)